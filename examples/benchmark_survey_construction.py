@@ -0,0 +1,74 @@
+import timeit
+import numpy as np
+import welleng as we
+
+"""
+Benchmark the time to construct a long Survey object and use some of its
+attributes, against the eager baseline. Derived attributes are calculated
+lazily, so constructing a Survey is almost free and only the attributes that
+are accessed are paid for. The baseline accesses every derived attribute
+that the previous (eager) Survey construction calculated in __init__.
+"""
+
+N = 10_000  # number of survey stations
+REPEAT = 5
+
+sh = we.survey.SurveyHeader(
+    b_total=50000.,
+    dip=70.,
+    declination=0.,
+)
+
+md = np.linspace(0, 10_000, N)
+inc = np.clip(np.linspace(-30, 120, N), 0, 90)
+azi = np.linspace(0, 90, N)
+
+DERIVED = [
+    'inc_rad', 'azi_true_rad', 'survey_deg', 'survey_rad', 'radius',
+    'dogleg', 'x', 'n', 'vec_nev', 'toolface', 'cov_nev', 'cov_hla'
+]
+
+
+def construct(error_model):
+    return we.survey.Survey(
+        md=md, inc=inc, azi=azi, header=sh, error_model=error_model
+    )
+
+
+def positions(error_model):
+    s = construct(error_model)
+    return (s.n, s.e, s.tvd)
+
+
+def covariances(error_model):
+    s = construct(error_model)
+    return (s.n, s.e, s.tvd, s.cov_nev)
+
+
+def eager(error_model):
+    """
+    The eager baseline, which calculated every derived attribute on
+    construction regardless of what was used.
+    """
+    s = construct(error_model)
+    return [getattr(s, attr) for attr in DERIVED]
+
+
+def benchmark(func, error_model):
+    return min(timeit.repeat(
+        lambda: func(error_model), number=1, repeat=REPEAT
+    ))
+
+
+if __name__ == '__main__':
+    print(f"Survey with {N} stations (best of {REPEAT}):")
+    for error_model in [None, "iscwsa_mwd_rev4"]:
+        t_eager = benchmark(eager, error_model)
+        print(f"\nerror_model={error_model}")
+        print(f"  {'':<12} {'lazy':>11} {'eager':>11} {'speedup':>8}")
+        for func in [construct, positions, covariances]:
+            t = benchmark(func, error_model)
+            print(
+                f"  {func.__name__:<12} {t * 1000:8.2f} ms"
+                f" {t_eager * 1000:8.2f} ms {t_eager / t:7.1f}x"
+            )
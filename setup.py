@@ -48,6 +48,7 @@ setup(
     author_email='jonnycorcutt@gmail.com',
     license='Apache 2.0',
     packages=find_packages(exclude=["tests"]),
+    package_data={'welleng': ['data/*.COF', 'errors/*.yaml']},
     install_requires=[
         'magnetic_field_calculator',
         'matplotlib',
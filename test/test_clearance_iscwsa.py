@@ -1,7 +1,16 @@
-from welleng.survey import Survey, make_survey_header
-from welleng.clearance import Clearance, ISCWSA
+from welleng.cache import ClearanceCache
+from welleng.mesh import WellMesh
+from welleng.survey import (
+    Survey, get_station_arrays, interpolate_md, make_survey_header,
+    slice_survey
+)
+from welleng.clearance import (
+    Clearance, ClearanceSession, FieldClearance, ISCWSA, MeshClearance,
+    MultiClearance, SpatialIndex, TravellingCylinder
+)
 import numpy as np
 import json
+import tempfile
 
 """
 Test that the ISCWSA clearance model is working within a defined tolerance
@@ -85,6 +94,303 @@ def test_clearance_iscwsa(data=data, tolerance=TOLERANCE):
             assert np.all(normalized < tolerance)
 
 
-# make above test runnanble separately
+def test_spatial_index(data=data):
+    surveys = generate_surveys(data)
+    reference = surveys["Reference well"]
+    index = SpatialIndex(list(surveys.values()), names=list(surveys))
+
+    candidates = index.query(reference)
+    assert "Reference well" not in candidates
+
+    # the offset wells that fail the clearance check must be candidates
+    for well in surveys:
+        if well == "Reference well":
+            continue
+        if np.min(data["wells"][well]["SF"]) < 1:
+            assert well in candidates
+    for well, md_ranges in candidates.items():
+        assert np.all(md_ranges[:, 0] >= surveys[well].md[0])
+        assert np.all(md_ranges[:, 1] <= surveys[well].md[-1])
+
+    candidates = index.query(reference, distance=500.)
+    assert len(candidates) == len(surveys) - 1
+
+
+def test_multi_clearance(data=data):
+    surveys = generate_surveys(data)
+    reference = surveys.pop("Reference well")
+
+    for kop_depth in (-np.inf, 1000.):
+        mc = MultiClearance(
+            reference, list(surveys.values()), names=list(surveys),
+            kop_depth=kop_depth
+        )
+        assert mc.SF.shape == (len(mc.ref_md), len(surveys))
+
+        for well, offset in surveys.items():
+            result = ISCWSA(Clearance(reference, offset, kop_depth=kop_depth))
+            assert np.allclose(result.SF, mc.get_SF(well))
+
+
+def test_field_clearance(data=data):
+    surveys = generate_surveys(data)
+    names = list(surveys)
+    surveys = list(surveys.values())
+
+    fc = FieldClearance(surveys, names=names, workers=1)
+    fc_pool = FieldClearance(surveys, names=names, workers=2)
+    assert np.allclose(fc.SF, fc_pool.SF)
+    assert fc.matrix.shape == (len(surveys), len(surveys))
+
+    for (i, j), sf, ref_md, off_md in zip(
+        fc.pairs, fc.SF, fc.ref_md, fc.off_md
+    ):
+        result = ISCWSA(Clearance(surveys[i], surveys[j]))
+        idx = np.argmin(result.SF)
+        assert np.isclose(result.SF[idx], sf)
+        assert np.isclose(fc.matrix[j, i], sf)
+        assert fc.get_pair(names[j], names[i]) == (sf, off_md, ref_md)
+
+
+def test_clearance_threshold(data=data):
+    surveys = generate_surveys(data)
+    reference = surveys.pop("Reference well")
+
+    for well, offset in surveys.items():
+        c = Clearance(reference, offset)
+        result = ISCWSA(c)
+        for threshold in (1.0, 1.5):
+            result_threshold = ISCWSA(c, threshold=threshold)
+            assert np.all(result_threshold.SF_lower <= result.SF + 1e-9)
+            assert result_threshold.safe == (result.SF.min() >= threshold)
+
+    c = Clearance(reference, surveys["08 - well"])
+    SF = np.array(MeshClearance(c).SF)
+    for threshold in (1.0, 1.5):
+        result_threshold = MeshClearance(c, threshold=threshold)
+        # the SF is rounded to two decimals
+        assert np.all(result_threshold.SF_lower <= SF + 0.005)
+        assert result_threshold.safe == (SF.min() >= threshold)
+
+
+def test_mesh_sigma_pa(data=data):
+    surveys = generate_surveys(data)
+    reference = surveys.pop("Reference well")
+    offset = surveys["08 - well"]
+
+    # the meshes are inflated by the sigma_pa of the clearance
+    volumes = []
+    for sigma_pa in (0.5, 1.0):
+        c = Clearance(reference, offset, sigma_pa=sigma_pa)
+        result = MeshClearance(c)
+        assert result.ref_mesh.sigma_pa == sigma_pa
+        volumes.append(result.ref_mesh.mesh.volume)
+
+        SF = np.array(result.SF)
+        result_threshold = MeshClearance(c, threshold=1.5)
+        assert np.all(result_threshold.SF_lower <= SF + 0.005)
+    assert volumes[1] > volumes[0]
+
+
+def test_clearance_session(data=data):
+    surveys = generate_surveys(data)
+    r = surveys.pop("Reference well")
+
+    def make_reference(stop=None):
+        return Survey(
+            md=r.md[:stop], inc=r.inc[:stop], azi=r.azi[:stop],
+            header=r.header, radius=r.radius[:stop],
+            error_model=r.error_model, start_xyz=r.start_xyz,
+            start_nev=r.start_nev, deg=r.deg
+        )
+
+    offsets = list(surveys.values())
+    for kop_depth in (-np.inf, 1000.):
+        session = ClearanceSession(
+            make_reference(60), offsets, kop_depth=kop_depth
+        )
+        for i in range(60, len(r.md), 7):
+            session.append(r.md[i:i+7], r.inc[i:i+7], r.azi[i:i+7])
+
+        mc = MultiClearance(make_reference(), offsets, kop_depth=kop_depth)
+        assert np.allclose(session.ref_md, mc.ref_md)
+        assert np.allclose(session.SF, mc.SF)
+        assert np.allclose(session.off_md, mc.off_md)
+
+    # a near vertical reference, whose previous last station covariance
+    # changes when several stations are appended at a time
+    md = np.arange(0., 1800., 30.)
+    inc = np.full(len(md), 0.05)
+    inc[::4] = 0.
+    azi = np.linspace(0., 270., len(md))
+
+    def make_vertical(stop=None):
+        return Survey(
+            md=md[:stop], inc=inc[:stop], azi=azi[:stop], header=r.header,
+            error_model="iscwsa_mwd_rev5", start_xyz=r.start_xyz,
+            start_nev=r.start_nev
+        )
+
+    session = ClearanceSession(make_vertical(20), offsets)
+    for i in range(20, len(md), 3):
+        session.append(md[i:i+3], inc[i:i+3], azi[i:i+3])
+
+    mc = MultiClearance(make_vertical(), offsets)
+    assert np.allclose(session.SF, mc.SF)
+
+
+def test_section_meshes(data=data):
+    survey = generate_surveys(data)["Reference well"]
+    mesh = WellMesh(survey, sigma=2.445)
+
+    for i in range(0, len(survey.md) - 1, 10):
+        section = mesh.get_section(i)
+        expected = WellMesh(
+            slice_survey(survey, i, view=True), sigma=2.445
+        ).mesh
+        assert section.is_winding_consistent
+        assert np.isclose(section.volume, expected.volume)
+
+
+def test_mesh_clearance_workers(data=data):
+    surveys = generate_surveys(data)
+    c = Clearance(surveys["Reference well"], surveys["03 - well"])
+
+    result = MeshClearance(c)
+    result_pool = MeshClearance(c, workers=2)
+    # only the workers mesh the well bores
+    assert result_pool.ref_mesh is None
+    assert np.allclose(result.SF, result_pool.SF)
+    assert np.allclose(result.ref_md, result_pool.ref_md)
+    assert np.allclose(result.off_md, result_pool.off_md)
+
+
+def test_mesh_clearance_culling(data=data):
+    surveys = generate_surveys(data)
+    c = Clearance(surveys["Reference well"], surveys["03 - well"])
+
+    full = MeshClearance(c)
+    SF = np.array(full.SF)
+    result = MeshClearance(c, cull_distance=0.)
+    assert result.culled.any()
+    assert np.allclose(np.array(result.SF)[~result.culled], SF[~result.culled])
+    assert np.all(SF[result.culled] >= 1)
+
+    # a culled section is reported from the start of the section, with
+    # lower bounds of its evaluated distance_CC and SF
+    md = c.ref.md
+    for i in np.where(result.culled)[0]:
+        assert result.ref_md[i] == md[i]
+        assert md[i] <= full.ref_md[i] <= md[i + 1]
+        assert result.distance_CC[i] <= full.distance_CC[i]
+        assert 1 <= result.SF[i] <= full.SF[i]
+
+
+def test_clearance_minima(data=data):
+    surveys = generate_surveys(data)
+    reference = surveys.pop("Reference well")
+
+    for well in ("03 - well", "11 - well"):
+        result = ISCWSA(Clearance(reference, surveys[well]))
+        ref_md, SF, off_md = result.get_minima(md_tolerance=0.1)
+        assert SF.min() <= result.SF.min()
+
+        # compare with densely sampling the reference well
+        md = np.arange(result.c.ref.md[0], result.c.ref.md[-1], 0.1)
+        SF_dense = result._get_SF_md(md, get_station_arrays(result.c.ref))[0]
+        assert np.isclose(SF.min(), SF_dense.min(), rtol=0, atol=1e-3)
+
+
+def test_clearance_cache(data=data):
+    surveys = generate_surveys(data)
+    reference = surveys["Reference well"]
+    offset = surveys["03 - well"]
+    result = ISCWSA(Clearance(reference, offset))
+
+    with tempfile.TemporaryDirectory() as path:
+        cache = ClearanceCache(path)
+        miss = cache.clearance(reference, offset)
+        hit = cache.clearance(reference, offset)
+        assert np.allclose(miss.SF, result.SF)
+        assert np.allclose(hit.SF, result.SF)
+        assert np.allclose(hit.off_md, result.off_md)
+
+        key = cache.get_key(reference, offset)
+        assert cache.get_key(reference, offset, k=3.) != key
+        assert cache.get_key(reference, offset, threshold=1.) != key
+
+        # changing the survey data changes the fingerprint
+        fingerprint = offset.get_fingerprint()
+        azi = np.array(offset.azi, dtype=float)
+        azi[-10:] += 20.
+        offset.azi = azi
+        assert offset.get_fingerprint() != fingerprint
+        assert cache.get_key(reference, offset) != key
+
+        # the least recently used results are evicted
+        cache.max_size = cache.get_size() * 1.5
+        miss = cache.clearance(reference, offset)
+        assert cache.get_size() <= cache.max_size
+        assert cache.get(key) is None
+
+        # the new results are calculated from the new survey data
+        result = ISCWSA(Clearance(reference, offset))
+        assert np.allclose(miss.SF, result.SF)
+        assert not np.allclose(miss.SF, hit.SF)
+
+
+def test_travelling_cylinder(data=data):
+    # positions calculated from the survey data, so that they're consistent
+    # with the minimum curvature arcs between them
+    surveys = {
+        name: Survey(
+            md=s.md, inc=s.inc, azi=s.azi, header=s.header,
+            start_xyz=s.start_xyz, start_nev=s.start_nev
+        )
+        for name, s in generate_surveys(data).items()
+    }
+    reference = surveys.pop("Reference well")
+    names = list(surveys.keys())
+    offsets = list(surveys.values())
+    result = TravellingCylinder(reference, offsets, names=names)
+
+    # the offset points are in the normal plane of each reference station
+    ref_nevs = np.array([reference.n, reference.e, reference.tvd]).T
+    delta = result.off_nevs - ref_nevs.reshape(-1, 1, 3)
+    assert np.nanmax(np.absolute(
+        np.einsum('ijk,ik->ij', delta, reference.vec_nev)
+    )) < 1e-6
+    assert np.allclose(
+        result.distance, np.linalg.norm(delta, axis=-1), equal_nan=True
+    )
+
+    # and on the offset well bores
+    for j, offset in enumerate(offsets):
+        found = np.isfinite(result.off_md[:, j])
+        s = interpolate_md(offset, result.off_md[found, j])
+        assert np.allclose(
+            np.array([s.n, s.e, s.tvd]).T, result.off_nevs[found, j]
+        )
+
+    # evaluating the offsets one by one in small chunks is the same
+    for name, offset in surveys.items():
+        single = TravellingCylinder(reference, [offset], max_size=100)
+        for a, b in zip(result.get_offset(name), single.get_offset(0)):
+            assert np.allclose(a, b, equal_nan=True)
+
+
+# make above tests runnanble separately
 if __name__ == '__main__':
     test_clearance_iscwsa(data=data, tolerance=TOLERANCE)
+    test_spatial_index(data=data)
+    test_multi_clearance(data=data)
+    test_field_clearance(data=data)
+    test_clearance_threshold(data=data)
+    test_mesh_sigma_pa(data=data)
+    test_clearance_session(data=data)
+    test_section_meshes(data=data)
+    test_mesh_clearance_workers(data=data)
+    test_mesh_clearance_culling(data=data)
+    test_clearance_minima(data=data)
+    test_clearance_cache(data=data)
+    test_travelling_cylinder(data=data)
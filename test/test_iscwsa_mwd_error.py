@@ -115,6 +115,24 @@ def test_iscwsa_error_models(input_files=input_files):
         # )
 
 
+def test_vertical_last_station():
+    # the singular XCLA terms of vertical survey stations are zeroed, which
+    # includes the last survey station
+    wd = json.load(open(input_files["iscwsa_mwd_rev5"]))
+    full = get_err("iscwsa_mwd_rev5", wd)
+    for k in (2, 10):
+        wd_k = dict(wd, survey={
+            key: value[:k] for key, value in wd['survey'].items()
+        })
+        err = get_err("iscwsa_mwd_rev5", wd_k)
+        cov = err.errors.errors['XCLA'].cov_NEV.T
+        assert np.all(np.isfinite(cov))
+        assert np.allclose(
+            cov[:k - 1], full.errors.errors['XCLA'].cov_NEV.T[:k - 1]
+        )
+
+
 # make above test runnanble separately
 if __name__ == '__main__':
     test_iscwsa_error_models(input_files)
+    test_vertical_last_station()
@@ -0,0 +1,62 @@
+import inspect
+import sys
+import numpy as np
+from welleng.magnetic import get_magnetic_field
+from welleng.survey import SurveyHeader, make_survey_headers
+
+"""
+Test the bundled World Magnetic Model evaluator against the test values
+published with the WMM2020 model.
+"""
+
+# latitude, longitude, altitude (km), date, b_total (nT), inc, dec (deg)
+WMM2020_TEST_VALUES = [
+    [80., 0., 0., 2020.0, 55000.1, 83.14, -1.28],
+    [0., 120., 0., 2020.0, 41104.9, -15.42, 0.16],
+    [-80., 240., 0., 2020.0, 55120.6, -72.20, 69.36],
+]
+
+
+def test_wmm2020():
+    lat, lon, alt, date, b_total, inc, dec = np.array(WMM2020_TEST_VALUES).T
+
+    result = get_magnetic_field(lat, lon, alt, date)
+    assert np.allclose(result[0], b_total, rtol=0, atol=0.1)
+    assert np.allclose(result[1], inc, rtol=0, atol=0.01)
+    assert np.allclose(result[2], dec, rtol=0, atol=0.01)
+
+
+def test_survey_headers():
+    lat, lon = [60., 58.5, -20.], [2., 1.5, 115.]
+    headers = make_survey_headers(lat, lon, survey_date='2022-06-01')
+
+    for i, sh in enumerate(headers):
+        sh_single = SurveyHeader(
+            latitude=lat[i], longitude=lon[i], survey_date='2022-06-01'
+        )
+        assert np.allclose(
+            [sh.b_total, sh.dip, sh.declination],
+            [sh_single.b_total, sh_single.dip, sh_single.declination]
+        )
+
+
+def one_function_to_run_them_all():
+    """
+    Function to gather the test functions so that they can be tested by
+    running this module.
+
+    https://stackoverflow.com/questions/18907712/python-get-list-of-all-
+    functions-in-current-module-inspecting-current-module
+    """
+    test_functions = [
+        obj for name, obj in inspect.getmembers(sys.modules[__name__])
+        if (inspect.isfunction(obj)
+            and name.startswith('test')
+            and name != 'all')
+    ]
+
+    [f() for f in test_functions]
+
+
+if __name__ == '__main__':
+    one_function_to_run_them_all()
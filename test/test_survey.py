@@ -0,0 +1,271 @@
+import inspect
+import sys
+import numpy as np
+from welleng.survey import (
+    Survey,
+    SurveyBatch,
+    SurveyHeader,
+    get_circle_radius,
+    interpolate_md,
+    interpolate_tvd,
+    slice_survey,
+)
+
+"""
+Test the vectorized survey interpolation functions against the scalar
+interpolation path, the lazy Survey attributes, the SurveyView slices,
+appending survey stations and the SurveyBatch of several well bores.
+"""
+
+
+def make_survey():
+    sh = SurveyHeader(
+        b_total=50000.,
+        dip=70.,
+        declination=0.,
+    )
+    md = np.arange(0, 2001, 100.)
+    inc = np.concatenate((np.zeros(5), np.linspace(0, 60, 10), np.full(6, 60)))
+    azi = np.concatenate((np.zeros(5), np.linspace(0, 45, 16)))
+
+    return Survey(
+        md=md,
+        inc=inc,
+        azi=azi,
+        header=sh,
+        error_model="iscwsa_mwd_rev4"
+    )
+
+
+def test_interpolate_md():
+    survey = make_survey()
+    mds = np.linspace(survey.md[0], survey.md[-1], 97)
+
+    s = interpolate_md(survey, mds)
+    assert np.allclose(s.md, mds)
+
+    for i, md in enumerate(mds[1:], start=1):
+        s_scalar = interpolate_md(survey, md)
+        assert np.allclose(
+            [s_scalar.n[1], s_scalar.e[1], s_scalar.tvd[1]],
+            [s.n[i], s.e[i], s.tvd[i]],
+            rtol=0, atol=1e-9
+        )
+
+
+def test_interpolate_tvd():
+    survey = make_survey()
+    tvds = np.linspace(survey.tvd[1], survey.tvd[-1], 53)
+
+    s = interpolate_tvd(survey, tvds)
+    assert np.allclose(s.tvd, tvds)
+
+    for i, tvd in enumerate(tvds):
+        s_scalar = interpolate_tvd(survey, tvd)
+        assert np.allclose(
+            [s_scalar.n[1], s_scalar.e[1], s_scalar.tvd[1]],
+            [s.n[i], s.e[i], s.tvd[i]],
+            rtol=0, atol=1e-9
+        )
+
+
+def test_lazy_attributes():
+    survey = make_survey()
+    assert survey._cache == {}, "Derived attributes computed on init"
+
+    tvd = survey.tvd
+    assert 'cov_nev' not in survey._cache
+
+    cov_nev = survey.cov_nev
+    assert cov_nev.shape == (len(survey.md), 3, 3)
+
+    # changing an input invalidates the derived attributes
+    survey.md = survey.md * 2
+    assert 'tvd' not in survey._cache
+    assert np.isclose(survey.tvd[-1], tvd[-1] * 2)
+    assert not np.allclose(survey.cov_nev, cov_nev)
+
+    survey.error_model = None
+    assert survey.cov_nev is None and survey.err is None
+
+
+def test_survey_view():
+    survey = make_survey()
+
+    for start, stop in [(0, None), (4, 9), (10, len(survey.md))]:
+        s = slice_survey(survey, start, stop)
+        v = slice_survey(survey, start, stop, view=True)
+        for attr in [
+            'md', 'inc_rad', 'azi_grid_rad', 'n', 'e', 'tvd', 'vec_nev',
+            'radius', 'cov_nev', 'cov_hla', 'dogleg', 'delta_md', 'start_nev'
+        ]:
+            assert np.allclose(getattr(s, attr), getattr(v, attr))
+        assert np.allclose(s.geometry.vec1_nev, v.geometry.vec1_nev)
+
+        # the view's curve radii are those of the parent, so its circle
+        # centers are those of the parent's pairs of stations
+        n = len(survey.md) - 1
+        pairs = np.arange(v.start, v.stop - 1)
+        starts, ends = get_circle_radius(survey)
+        starts_v, ends_v = get_circle_radius(v)
+        assert np.allclose(
+            starts_v, np.vstack((starts[pairs], starts[pairs + n])),
+            equal_nan=True
+        )
+        assert np.allclose(
+            ends_v, np.vstack((ends[pairs], ends[pairs + n]))
+        )
+
+    # the view shares the parent's arrays
+    assert np.shares_memory(v.cov_nev, survey.cov_nev)
+
+
+def test_append():
+    survey = make_survey()
+
+    s = Survey(
+        md=survey.md[:3],
+        inc=survey.inc[:3],
+        azi=survey.azi[:3],
+        header=survey.header,
+        error_model="iscwsa_mwd_rev4"
+    )
+    s.cov_nev, s.toolface
+    buffers = {}
+    aliased = 0
+    for i in range(3, len(survey.md), 2):
+        cov_nev = s.cov_nev
+        cov_nev_copy = cov_nev.copy()
+        s.append(survey.md[i:i+2], survey.inc[i:i+2], survey.azi[i:i+2])
+        buffers[id(s.cov_nev.base)] = s.cov_nev.base
+
+        # arrays accessed before an append alias the survey, so the
+        # covariance of the previous last station is updated in them
+        n = len(cov_nev)
+        if np.shares_memory(cov_nev, s.cov_nev):
+            assert np.array_equal(cov_nev, s.cov_nev[:n])
+            aliased += 1
+        assert np.array_equal(cov_nev_copy[:-1], s.cov_nev[:n - 1])
+
+    # the arrays are extended in buffers that double in size
+    assert len(buffers) <= np.log2(len(survey.md))
+    assert aliased
+
+    for attr in [
+        'md', 'n', 'e', 'tvd', 'dogleg', 'dls', 'vec_nev', 'toolface',
+        'cov_nev', 'cov_hla'
+    ]:
+        assert np.allclose(getattr(s, attr), getattr(survey, attr))
+
+    # provided positions are in both the inputs and the cache, each with
+    # its own buffer
+    s = Survey(
+        md=survey.md[:3],
+        inc=survey.inc[:3],
+        azi=survey.azi[:3],
+        n=survey.n[:3],
+        e=survey.e[:3],
+        tvd=survey.tvd[:3],
+        header=survey.header,
+        error_model="iscwsa_mwd_rev4"
+    )
+    s.n
+    buffers = {}
+    for i in range(3, len(survey.md)):
+        s.append(survey.md[i], survey.inc[i], survey.azi[i])
+        buffers[id(s.n.base)] = s.n.base
+    assert len(buffers) <= np.log2(len(survey.md))
+
+    for attr in [
+        'md', 'n', 'e', 'tvd', 'dogleg', 'dls', 'vec_nev', 'toolface',
+        'cov_nev', 'cov_hla'
+    ]:
+        assert np.allclose(getattr(s, attr), getattr(survey, attr))
+
+
+def test_survey_batch():
+    survey = make_survey()
+    sh_grid = SurveyHeader(
+        b_total=50000.,
+        dip=70.,
+        declination=2.,
+        convergence=1.,
+        azi_reference="grid"
+    )
+    surveys = [
+        survey,
+        Survey(
+            md=survey.md[:8],
+            inc=survey.inc[:8],
+            azi=survey.azi[:8],
+            header=sh_grid,
+            start_xyz=[100., 200., 0.],
+            start_nev=[200., 100., 0.],
+            error_model="iscwsa_mwd_rev4"
+        ),
+    ]
+
+    batch = SurveyBatch(
+        md=np.concatenate([s.md for s in surveys]),
+        inc=np.concatenate([s.inc for s in surveys]),
+        azi=np.concatenate([s.azi for s in surveys]),
+        lengths=[len(s.md) for s in surveys],
+        headers=[s.header for s in surveys],
+        start_xyz=[s.start_xyz for s in surveys],
+        start_nev=[s.start_nev for s in surveys],
+        error_model="iscwsa_mwd_rev4"
+    )
+
+    for i, s in enumerate(surveys):
+        s_batch = batch.get_survey(i)
+        for attr in [
+            'md', 'azi_grid_rad', 'dogleg', 'dls', 'x', 'y', 'z', 'n', 'e',
+            'tvd', 'vec_nev', 'cov_nev', 'cov_hla'
+        ]:
+            assert np.allclose(getattr(s, attr), getattr(s_batch, attr))
+
+
+def test_survey_batch_short_well():
+    sh = SurveyHeader(b_total=50000., dip=70., declination=0.)
+    wells = [
+        ([0., 100., 200., 300.], [0., 0., 5., 10.], [0., 0., 45., 45.]),
+        ([0., 100.], [0., 0.], [0., 0.]),
+        ([0., 150., 300.], [0., 0., 5.], [20., 20., 20.]),
+    ]
+
+    for error_model in ["iscwsa_mwd_rev4", "iscwsa_mwd_rev5"]:
+        batch = SurveyBatch(
+            md=np.concatenate([w[0] for w in wells]),
+            inc=np.concatenate([w[1] for w in wells]),
+            azi=np.concatenate([w[2] for w in wells]),
+            lengths=[len(w[0]) for w in wells],
+            headers=[sh] * len(wells),
+            error_model=error_model
+        )
+        for i, (md, inc, azi) in enumerate(wells):
+            s = Survey(
+                md=md, inc=inc, azi=azi, header=sh, error_model=error_model
+            )
+            assert np.allclose(s.cov_nev, batch.get_survey(i).cov_nev)
+
+
+def one_function_to_run_them_all():
+    """
+    Function to gather the test functions so that they can be tested by
+    running this module.
+
+    https://stackoverflow.com/questions/18907712/python-get-list-of-all-
+    functions-in-current-module-inspecting-current-module
+    """
+    test_functions = [
+        obj for name, obj in inspect.getmembers(sys.modules[__name__])
+        if (inspect.isfunction(obj)
+            and name.startswith('test')
+            and name != 'all')
+    ]
+
+    [f() for f in test_functions]
+
+
+if __name__ == '__main__':
+    one_function_to_run_them_all()
@@ -1,6 +1,8 @@
 import welleng.clearance
+import welleng.cache
 import welleng.io
 import welleng.error
+import welleng.magnetic
 import welleng.survey
 import welleng.utils
 import welleng.mesh
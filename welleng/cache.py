@@ -0,0 +1,227 @@
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+from types import SimpleNamespace
+
+from .clearance import Clearance, ISCWSA, MeshClearance
+
+"""
+welleng/cache
+-------------
+A persistent cache of clearance results on disk, so that the clearance
+between well bores whose survey data haven't changed since the last run is
+read back rather than recalculated.
+
+The results are keyed by the fingerprints of the reference and offset
+surveys (see welleng.survey.Survey.get_fingerprint) and the clearance
+parameters, and the total size of the cache is bounded by evicting the
+least recently used results.
+"""
+
+METHODS = {
+    "ISCWSA": ISCWSA,
+    "mesh": MeshClearance,
+}
+
+# the results that are cached for each method, where present
+RESULTS = {
+    "ISCWSA": [
+        'SF', 'off_md', 'dist_CC_Clr', 'hoz_bearing_deg', 'ref_PCR',
+        'off_PCR', 'calc_hole', 'SF_lower', 'violation', 'safe'
+    ],
+    "mesh": [
+        'collision', 'distance_CC', 'off_index', 'SF', 'nev',
+        'hoz_bearing_deg', 'ref_PCR', 'off_PCR', 'calc_hole', 'ref_md',
+        'off_md', 'SF_lower', 'violation', 'safe', 'sections', 'culled'
+    ],
+}
+
+# method arguments that don't change the results
+IGNORED = ['clearance', 'workers', 'return_meshes']
+
+
+class ClearanceCache:
+    def __init__(self, path, max_size=256 * 2 ** 20):
+        """
+        A cache of clearance results, stored as one pickle file per result
+        in a directory.
+
+        Parameters
+        ----------
+            path: str
+                The directory of the cache, which is created if it doesn't
+                exist. Pickle files can execute code when loaded, so only
+                use a directory that you trust.
+            max_size: int (default: 256 MiB)
+                The maximum total size of the cached results in bytes.
+                When it's exceeded, the least recently used results are
+                deleted.
+        """
+        assert max_size > 0, "max_size must be positive"
+        self.path = path
+        self.max_size = max_size
+        os.makedirs(path, exist_ok=True)
+
+    def get_key(
+        self, reference, offset, method="ISCWSA", k=3.5, sigma_pa=0.5,
+        Sm=0.3, Rr=0.4572, Ro=0.3048, kop_depth=-float('inf'), **kwargs
+    ):
+        """
+        Returns the key of the results of a clearance calculation, which is
+        a hash of the survey fingerprints, the Clearance parameters and the
+        arguments of the method with their defaults applied.
+
+        Parameters
+        ----------
+            See clearance.
+
+        Returns
+        -------
+            key: str
+                The hex digest of the hash.
+        """
+        assert method in METHODS, "unrecognized method"
+        args = inspect.signature(METHODS[method]).bind(None, **kwargs)
+        args.apply_defaults()
+        params = [
+            (name, value) for name, value in args.arguments.items()
+            if name not in IGNORED
+        ]
+        h = hashlib.sha1(repr((
+            reference.get_fingerprint(), offset.get_fingerprint(), method,
+            [float(v) for v in (k, sigma_pa, Sm, Rr, Ro, kop_depth)],
+            params
+        )).encode())
+
+        return h.hexdigest()
+
+    def _get_filename(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Returns the cached results for the key, or None if they're not in
+        the cache. Reading results marks them as recently used.
+        """
+        filename = self._get_filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                results = pickle.load(f)
+            os.utime(filename)
+        except FileNotFoundError:
+            # missing, or evicted by another process
+            return None
+
+        return results
+
+    def put(self, key, results):
+        """
+        Add a dict of results to the cache and evict the least recently
+        used results if the cache exceeds max_size. The file is written
+        atomically, so that another process never reads a partial result.
+        """
+        fd, temp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, self._get_filename(key))
+        except BaseException:
+            os.remove(temp)
+            raise
+
+        self._evict()
+
+    def _get_entries(self):
+        """
+        Returns a list of (mtime, size, filename) of the cached results.
+        """
+        entries = []
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith('.pkl'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        return entries
+
+    def get_size(self):
+        """
+        Returns the total size of the cached results in bytes.
+        """
+        return sum(size for _, size, _ in self._get_entries())
+
+    def _evict(self):
+        entries = sorted(self._get_entries())
+        size = sum(size for _, size, _ in entries)
+        for _, s, filename in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            size -= s
+
+    def clear(self):
+        """
+        Delete all the cached results.
+        """
+        for _, _, filename in self._get_entries():
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+
+    def clearance(
+        self, reference, offset, method="ISCWSA", k=3.5, sigma_pa=0.5,
+        Sm=0.3, Rr=0.4572, Ro=0.3048, kop_depth=-float('inf'), **kwargs
+    ):
+        """
+        Returns the clearance results between a pair of well bores from the
+        cache, else calculates and caches them.
+
+        Parameters
+        ----------
+            reference, offset: welleng.survey.Survey objects
+            method: str (default: "ISCWSA")
+                Either "ISCWSA" (welleng.clearance.ISCWSA) or "mesh"
+                (welleng.clearance.MeshClearance).
+            k, sigma_pa, Sm, Rr, Ro, kop_depth:
+                The welleng.clearance.Clearance parameters.
+            kwargs:
+                Any further arguments of the method, e.g. n_verts and sigma
+                for "mesh" or threshold.
+
+        Returns
+        -------
+            results: SimpleNamespace
+                The results of the method listed in RESULTS that it returned,
+                as attributes of the same names, with ref_md the measured
+                depths of the reference survey stations. Calculated data
+                that can't be pickled, such as the FCL distance results and
+                meshes of MeshClearance, aren't included.
+        """
+        key = self.get_key(
+            reference, offset, method, k, sigma_pa, Sm, Rr, Ro, kop_depth,
+            **kwargs
+        )
+        results = self.get(key)
+        if results is None:
+            c = Clearance(
+                reference, offset, k=k, sigma_pa=sigma_pa, Sm=Sm, Rr=Rr,
+                Ro=Ro, kop_depth=kop_depth
+            )
+            result = METHODS[method](c, **kwargs)
+            results = dict(ref_md=c.ref.md)
+            results.update({
+                name: getattr(result, name) for name in RESULTS[method]
+                if hasattr(result, name)
+            })
+            self.put(key, results)
+
+        return SimpleNamespace(**results)
@@ -1,13 +1,31 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
 import numpy as np
 from numpy.linalg import norm
 import trimesh
 
 from scipy import optimize
+from scipy.sparse import csr_matrix
 from scipy.spatial import KDTree
-from scipy.spatial.distance import cdist
 
-from .survey import Survey, interpolate_survey, slice_survey
-from .utils import NEV_to_HLA
+from .survey import (
+    Survey,
+    SurveyBatch,
+    get_station_arrays,
+    interpolate_stations,
+    slice_survey
+)
+from .utils import (
+    Geometry,
+    NEV_to_HLA,
+    get_angles,
+    get_arc_plane_intersections,
+    get_closest_arc_points,
+    get_segment_distances,
+    interpolate_arc
+)
 from .mesh import WellMesh
 
 
@@ -35,6 +53,10 @@ class Clearance:
 
         reference: object
 
+        offset: object
+            If None then only the reference well bore data are prepared,
+            e.g. to be shared by many offset well bores.
+
         """
         self.reference = reference
         self.offset = offset
@@ -48,7 +70,9 @@ class Clearance:
         self._get_radii(Rr, Ro)
 
         self.ref_nevs = self._get_nevs(self.ref)
-        self.offset_nevs = self._get_nevs(self.offset)
+        self.offset_nevs = (
+            None if self.offset is None else self._get_nevs(self.offset)
+        )
 
     def _get_kop_index(self, kop_depth):
         self.kop_depth = kop_depth
@@ -73,7 +97,9 @@ class Clearance:
         else:
             self.Rr = np.full(len(self.ref.md), Rr)
 
-        if self.offset.radius is not None:
+        if self.offset is None:
+            self.Ro = None
+        elif self.offset.radius is not None:
             self.Ro = self.offset.radius
         else:
             self.Ro = np.full(len(self.offset.md), Ro)
@@ -84,8 +110,8 @@ class Clearance:
         else:
             self.ref = Survey(
                 md=self.reference.md[self.kop_index:],
-                inc=self.reference.inc_rad[self.kop_index:],
-                azi=self.reference.azi_grid_rad[self.kop_index:],
+                inc=self.reference.inc[self.kop_index:],
+                azi=self.reference.azi[self.kop_index:],
                 n=self.reference.n[self.kop_index:],
                 e=self.reference.e[self.kop_index:],
                 tvd=self.reference.tvd[self.kop_index:],
@@ -121,29 +147,115 @@ def get_ref_sigma(sigma1, sigma2, sigma3, kop_index):
     return sigma_new
 
 
+def get_closest_arcs(
+    points, idx, nevs, vec_nev, dogleg, delta_md, first=0, last=None
+):
+    """
+    Determine the closest point on an offset well bore to each point. The
+    minimum curvature arcs either side of the closest offset survey station
+    are solved for every point in a single vectorized pass and the closer
+    of the two is kept.
+
+    Parameters
+    ----------
+        points: (n,3) array of floats
+            The (n,e,v) coordinates of the points, e.g. the reference survey
+            stations.
+        idx: (n) array of ints
+            The index of the closest offset survey station to each point.
+        nevs, vec_nev: (k,3) arrays of floats
+            The (n,e,v) coordinates and unit vectors of the offset survey
+            stations.
+        dogleg, delta_md: (k) arrays of floats
+            The doglegs and delta mds of the offset survey stations.
+        first, last: int or (n) array of ints (default: 0, None)
+            The index of the first station and of the start of the last
+            section of the offset well bore of each point, if the offset
+            survey data are the concatenated data of several well bores. If
+            last is None then it's the start of the last section of the
+            survey data.
+
+    Returns
+    -------
+        start: (n) array of ints
+            The index of the offset survey station at the start of the
+            arc of each closest point.
+        x: (n) array of floats
+            The length along each arc to the closest point.
+        pos, vec: (n,3) arrays of floats
+            The (n,e,v) coordinates and unit vectors of the closest points.
+    """
+    if last is None:
+        last = len(nevs) - 2
+
+    solutions = []
+    for start in (idx - 1, idx):
+        valid = (start >= first) & (start <= last)
+        start = np.clip(start, first, last)
+        x, pos, vec = get_closest_arc_points(
+            pos1=nevs[start],
+            vec1=vec_nev[start],
+            vec2=vec_nev[start + 1],
+            dogleg=dogleg[start + 1],
+            delta_md=delta_md[start + 1],
+            points=points
+        )
+        dist = np.where(
+            valid, norm(pos - points, axis=-1), np.inf
+        )
+        solutions.append((start, x, pos, vec, dist))
+
+    (start_1, x_1, pos_1, vec_1, dist_1) = solutions[0]
+    (start_2, x_2, pos_2, vec_2, dist_2) = solutions[1]
+    # if equidistant, use the arc from the closest station
+    closer = dist_1 < dist_2
+    start = np.where(closer, start_1, start_2)
+    x = np.where(closer, x_1, x_2)
+    pos = np.where(closer.reshape(-1, 1), pos_1, pos_2)
+    vec = np.where(closer.reshape(-1, 1), vec_1, vec_2)
+
+    return (start, x, pos, vec)
+
+
 class ISCWSA:
     def __init__(
         self,
         clearance,
+        threshold=None,
     ):
         """
         Class to calculate the clearance between two well bores using the
         standard method documented by ISCWSA.
+
+        Parameters
+        ----------
+            clearance: welleng.clearance.Clearance object
+            threshold: float (default: None)
+                If provided then only a go/no-go decision is made on whether
+                any reference survey station has a separation factor (SF)
+                below the threshold. A cheap lower bound of the SF of each
+                station (SF_lower) is calculated and the stations that
+                can't be proven safe by it are evaluated in ascending order
+                of the bound, stopping at the first confirmed violation. In
+                this mode SF is NaN for stations that weren't evaluated,
+                violation is the index of the violating station (or None)
+                and safe is True if there's no violation.
         """
         Clearance.__init__
         self.c = clearance
+        self.threshold = threshold
         # get closest survey station in offset well for each survey
         # station in the reference well
-        self.idx = np.argmin(
-            cdist(
-                self.c.ref_nevs, self.c.offset_nevs
-            ), axis=-1
-        )
+        self.idx = KDTree(self.c.offset_nevs).query(self.c.ref_nevs)[1]
+
+        if self.threshold is not None:
+            self._get_SF_lower()
+            self._get_violation()
+            return
 
         # iterate to find closest point on offset well between
         # survey stations
         self._get_closest_points()
-        self.off_nevs = self.c._get_nevs(self.off)
 
         # get the unit vectors and horizontal bearing between the wells
         self._get_delta_nev_vectors()
@@ -176,122 +288,54 @@ class ISCWSA:
         """
         Extracts the closest points between wells for each survey section.
         """
-        points = [
-            [
-                c[0],
-                [
-                    c[1].n[1],
-                    c[1].e[1],
-                    c[1].tvd[1]
-                ]
-            ]
-            for c in self.closest
-        ]
-
-        start_points = []
-        end_points = []
-
-        [(start_points.append(p[0]), end_points.append(p[1])) for p in points]
-
         return np.array([
-            np.vstack(start_points).tolist(), np.vstack(end_points).tolist()
+            self.c.ref_nevs.tolist(), self.off_nevs.tolist()
         ])
 
     def _get_closest_points(self):
-        closest = []
-        for j, (i, station) in enumerate(zip(
-            self.idx, self.c.ref_nevs.tolist()
-        )):
-            if i > 0:
-                bnds = [(0, self.c.offset.md[i] - self.c.offset.md[i - 1])]
-                res_1 = optimize.minimize(
-                    self._fun,
-                    bnds[0][1],
-                    method='SLSQP',
-                    bounds=bnds,
-                    args=(self.c.offset, i-1, station)
-                    )
-                mult = res_1.x[0] / (bnds[0][1] - bnds[0][0])
-                sigma_new_1 = self._interpolate_covs(i, mult)
-            else:
-                res_1 = False
-
-            if i < len(self.c.offset_nevs) - 1:
-                bnds = [(0, self.c.offset.md[i + 1] - self.c.offset.md[i])]
-                res_2 = optimize.minimize(
-                    self._fun,
-                    bnds[0][0],
-                    method='SLSQP',
-                    bounds=bnds,
-                    args=(self.c.offset, i, station)
-                    )
-                mult = res_2.x[0] / (bnds[0][1] - bnds[0][0])
-                sigma_new_2 = self._interpolate_covs(i + 1, mult)
-            else:
-                res_2 = False
-
-            if res_1 and res_2 and res_1.fun < res_2.fun or not res_2:
-                closest.append((
-                    station,
-                    interpolate_survey(self.c.offset, res_1.x[0], i - 1),
-                    res_1, sigma_new_1
-                ))
-            else:
-                closest.append((
-                    station,
-                    interpolate_survey(self.c.offset, res_2.x[0], i),
-                    res_2,
-                    sigma_new_2
-                ))
-
-        self.closest = closest
-        md, inc, azi, n, e, tvd, x, y, z,  = np.array([
-            [
-                r[1].md[1],
-                r[1].inc_rad[1],
-                r[1].azi_grid_rad[1],
-                r[1].n[1],
-                r[1].e[1],
-                r[1].tvd[1],
-                r[1].x[1],
-                r[1].y[1],
-                r[1].z[1],
-            ]
-            for r in self.closest
-        ]).T
+        """
+        Determine the closest point on the offset well to each reference
+        survey station. The minimum curvature arcs either side of the closest
+        offset survey station are solved for every reference station in a
+        single vectorized pass and the closer of the two is kept.
+
+        The closest points are kept as arrays (off_md, off_inc, off_azi,
+        off_nevs, off_vec_nev, off_cov_nev and off_cov_hla) rather than as
+        an interpolated Survey, with off grouping them by their Survey
+        attribute names.
+        """
+        offset = self.c.offset
 
-        cov_hla = np.array([
-            [
-                r[3][0],
-            ]
-            for r in self.closest
-        ])
+        start, x, pos, vec = get_closest_arcs(
+            self.c.ref_nevs, self.idx, self.c.offset_nevs, offset.vec_nev,
+            offset.dogleg, offset.delta_md
+        )
 
-        cov_nev = np.array([
-            [
-                r[3][1],
-            ]
-            for r in self.closest
-        ])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mult = np.nan_to_num(x / offset.delta_md[start + 1])
+        self.off_cov_hla, self.off_cov_nev = self._interpolate_covs(
+            start + 1, mult
+        )
 
-        self.off = Survey(
-            md=md,
-            inc=inc,
-            azi=azi,
-            n=n,
-            e=e,
-            tvd=tvd,
-            header=self.c.offset.header,
-            error_model=None,
-            cov_hla=cov_hla,
-            cov_nev=cov_nev,
-            start_xyz=[x[0], y[0], z[0]],
-            start_nev=[n[0], e[0], tvd[0]],
-            deg=False,
-            unit=self.c.offset.unit
+        self.off_md = offset.md[start] + x
+        self.off_inc, self.off_azi = get_angles(vec, nev=True).T
+        self.off_nevs = pos
+        self.off_vec_nev = vec
+
+        self.off = SimpleNamespace(
+            md=self.off_md,
+            inc_rad=self.off_inc,
+            azi_grid_rad=self.off_azi,
+            n=pos[:, 0],
+            e=pos[:, 1],
+            tvd=pos[:, 2],
+            vec_nev=vec,
+            cov_nev=self.off_cov_nev,
+            cov_hla=self.off_cov_hla,
         )
 
     def _interpolate_covs(self, i, mult):
+        mult = np.array(mult).reshape(-1, 1, 1)
         cov_hla_new = (
             self.c.offset.cov_hla[i - 1]
             + mult * (self.c.offset.cov_hla[i] - self.c.offset.cov_hla[i-1])
@@ -304,13 +348,6 @@ class ISCWSA:
 
         return (cov_hla_new, cov_nev_new)
 
-    def _fun(self, x, survey, index, station):
-        s = interpolate_survey(survey, x[0], index)
-        new_pos = np.array([s.n, s.e, s.tvd]).T[1]
-        dist = norm(new_pos - station, axis=-1)
-
-        return dist
-
     def _get_delta_nev_vectors(self):
         temp = self.off_nevs - self.c.ref_nevs
         self.dist_CC_Clr = norm(temp, axis=-1).reshape(-1, 1)
@@ -337,38 +374,738 @@ class ISCWSA:
         self.dist_CC_Clr = self.dist_CC_Clr.reshape(-1)
 
     def _get_delta_hla_vectors(self):
-        self.ref_delta_hlas = np.vstack([
-            NEV_to_HLA(s, nev, cov=False)
-            for s, nev in zip(
-                self.c.ref.survey_rad, self.ref_delta_nevs
-            )
-        ])
-        self.off_delta_hlas = np.vstack([
-            NEV_to_HLA(s, nev, cov=False)
-            for s, nev in zip(
-                self.off.survey_rad, self.off_delta_nevs
-            )
-        ])
+        self.ref_delta_hlas = NEV_to_HLA(
+            self.c.ref.survey_rad, self.ref_delta_nevs, cov=False,
+            trans=self.c.ref.transform
+        )
+        self.off_delta_hlas = NEV_to_HLA(
+            None, self.off_delta_nevs, cov=False,
+            trans=Geometry(self.off_inc, self.off_azi).get_transform()
+        )
 
     def _get_covs(self):
         self.ref_cov_hla = self.c.ref.cov_hla
         self.ref_cov_nev = self.c.ref.cov_nev
-        self.off_cov_hla = self.off.cov_hla
-        self.off_cov_nev = self.off.cov_nev
 
     def _get_PCRs(self):
-        self.ref_PCR = np.hstack([
-            np.sqrt(np.dot(np.dot(vec, cov), vec.T))
-            for vec, cov in zip(self.ref_delta_nevs, self.ref_cov_nev)
-        ])
-        self.off_PCR = np.hstack([
-            np.sqrt(np.dot(np.dot(vec, cov), vec.T))
-            for vec, cov in zip(self.off_delta_nevs, self.off_cov_nev)
-        ])
+        self.ref_PCR = np.sqrt(np.einsum(
+            'ij,ijk,ik->i',
+            self.ref_delta_nevs, self.ref_cov_nev, self.ref_delta_nevs
+        ))
+        self.off_PCR = np.sqrt(np.einsum(
+            'ij,ijk,ik->i',
+            self.off_delta_nevs, self.off_cov_nev, self.off_delta_nevs
+        ))
 
     def _get_calc_hole(self):
         self.calc_hole = self.c.Rr + self.c.Ro[self.idx]
 
+    def _get_SF_lower(self):
+        """
+        A lower bound of the SF of each reference survey station. Each
+        minimum curvature arc of the offset well is within a sphere about
+        its midpoint with a radius of half the arc length, so
+        the distance to the offset well is bounded by the distance to the
+        closest sphere, which is found from the candidate spheres near each
+        station with a KD-tree. The PCRs are bounded by the traces of the
+        covariance matrices (the offset covariances being interpolated
+        between survey stations) and the offset hole by its largest radius.
+        """
+        off = self.c.offset
+        points = self.c.ref_nevs
+        radii = off.delta_md[1:] / 2
+        centers = interpolate_arc(
+            self.c.offset_nevs[:-1], off.vec_nev[:-1], off.vec_nev[1:],
+            off.dogleg[1:], off.delta_md[1:], radii
+        )[0]
+        tree = KDTree(centers)
+
+        # the sphere of the nearest center bounds the closest sphere to
+        # within the largest radius
+        d, j = tree.query(points)
+        dist = d - radii[j]
+        found = tree.query_ball_point(
+            points, dist + radii.max(), return_sorted=False
+        )
+        counts = np.array([len(f) for f in found])
+        i = np.repeat(np.arange(len(points)), counts)
+        j = np.concatenate(found).astype(int)
+        np.minimum.at(
+            dist, i, norm(points[i] - centers[j], axis=-1) - radii[j]
+        )
+
+        sigmaS_sq = (
+            np.trace(self.c.ref.cov_nev, axis1=-2, axis2=-1)
+            + np.max(np.trace(off.cov_nev, axis1=-2, axis2=-1))
+        )
+        numerator = dist - self.c.Rr - np.max(self.c.Ro) - self.c.Sm
+        # a negative numerator is bounded by the smallest denominator
+        denominator = self.c.k * np.where(
+            numerator < 0,
+            self.c.sigma_pa,
+            np.sqrt(sigmaS_sq + self.c.sigma_pa ** 2)
+        )
+        self.SF_lower = numerator / denominator
+
+    def _get_violation(self):
+        """
+        Evaluate the stations that the lower bound can't prove are safe, in
+        ascending order of the bound and in batches that double in size,
+        until a station with an SF below the threshold is found.
+        """
+        self.SF = np.full(len(self.SF_lower), np.nan)
+        self.violation = None
+
+        order = np.argsort(self.SF_lower)
+        order = order[self.SF_lower[order] < self.threshold]
+        i, size = 0, 1
+        while i < len(order):
+            index = order[i:i + size]
+            self.SF[index] = self._get_SF(index)
+            violations = index[self.SF[index] < self.threshold]
+            if len(violations):
+                self.violation = violations[np.argmin(self.SF[violations])]
+                break
+            i, size = i + size, size * 2
+
+        self.safe = self.violation is None
+
+    def _get_SF(self, index):
+        """
+        Calculate the SF of a subset of the reference survey stations
+        without building the interpolated offset survey.
+        """
+        return self._get_SF_at(
+            self.c.ref_nevs[index], self.c.ref.cov_nev[index],
+            self.c.Rr[index], self.idx[index]
+        )[0]
+
+    def _get_SF_at(self, points, ref_cov_nev, Rr, idx=None):
+        """
+        Calculate the SF and the md of the closest point on the offset well
+        at points on the reference well, given their covariances and hole
+        radii.
+        """
+        offset = self.c.offset
+        if idx is None:
+            idx = KDTree(self.c.offset_nevs).query(points)[1]
+
+        start, x, pos, vec = get_closest_arcs(
+            points, idx, self.c.offset_nevs, offset.vec_nev, offset.dogleg,
+            offset.delta_md
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mult = np.nan_to_num(x / offset.delta_md[start + 1])
+        off_cov_nev = self._interpolate_covs(start + 1, mult)[1]
+
+        delta = pos - points
+        dist = norm(delta, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = np.nan_to_num(
+                delta / dist.reshape(-1, 1), posinf=0.0, neginf=0.0
+            )
+        sigmaS_sq = (
+            np.einsum('ij,ijk,ik->i', delta, ref_cov_nev, delta)
+            + np.einsum('ij,ijk,ik->i', delta, off_cov_nev, delta)
+        )
+        calc_hole = Rr + self.c.Ro[idx]
+
+        SF = (
+            (dist - calc_hole - self.c.Sm)
+            / (self.c.k * np.sqrt(sigmaS_sq + self.c.sigma_pa ** 2))
+        )
+
+        return (SF, offset.md[start] + x)
+
+    def _get_SF_md(self, md, stations):
+        """
+        Calculate the SF at measured depths on the reference well, with the
+        positions interpolated with minimum curvature and the covariances
+        interpolated linearly between survey stations.
+        """
+        ref = self.c.ref
+        index = np.clip(
+            np.searchsorted(ref.md, md, side='right') - 1,
+            0, len(ref.md) - 2
+        )
+        x = md - ref.md[index]
+        nevs = interpolate_stations(**stations, index=index, x=x)[3]
+
+        mult = (x / (ref.md[index + 1] - ref.md[index])).reshape(-1, 1, 1)
+        cov_nev = (
+            ref.cov_nev[index]
+            + mult * (ref.cov_nev[index + 1] - ref.cov_nev[index])
+        )
+
+        return self._get_SF_at(nevs, cov_nev, self.c.Rr[index])
+
+    def get_minima(self, md_tolerance=1., max_SF=None, max_change=None):
+        """
+        Refine the local minima of the SF between the reference survey
+        stations, rather than densifying the whole reference survey.
+
+        Each local minimum of the SF at the survey stations is bracketed by
+        its neighbouring stations and the brackets are refined together,
+        halving them each pass by evaluating the SF midway either side of
+        the lowest point, until they are shorter than the md tolerance.
+
+        Parameters
+        ----------
+            md_tolerance: float (default: 1.)
+                The md length of the brackets at which the refinement
+                stops.
+            max_SF: float (default: None)
+                If provided then only the local minima with an SF below this
+                value are refined.
+            max_change: float (default: None)
+                If provided then the survey intervals over which the SF
+                changes by more than this are also checked for a minimum
+                between their survey stations, which is refined if the SF
+                midway along the interval is lower than at both ends.
+
+        Returns
+        -------
+            ref_md: (k) array of floats
+                The md of each refined minimum on the reference well.
+            SF: (k) array of floats
+                The SF of each refined minimum.
+            off_md: (k) array of floats
+                The md of the closest point on the offset well.
+        """
+        assert self.threshold is None, "Not available in threshold mode"
+        md, SF = np.array(self.c.ref.md, dtype=float), self.SF
+        stations = get_station_arrays(self.c.ref)
+
+        # bracket the local minima of the survey stations
+        low = (
+            (SF <= np.concatenate(([np.inf], SF[:-1])))
+            & (SF <= np.concatenate((SF[1:], [np.inf])))
+        )
+        if max_SF is not None:
+            low &= SF < max_SF
+        i = np.where(low)[0]
+        a = md[np.clip(i - 1, 0, None)]
+        m = md[i]
+        b = md[np.clip(i + 1, None, len(md) - 1)]
+        f = SF[i]
+        off_md = self.off_md[i]
+
+        # and the intervals that change quickly with a lower midpoint
+        if max_change is not None:
+            j = np.where(np.absolute(np.diff(SF)) > max_change)[0]
+            j = j[~(low[j] | low[j + 1])]
+            mid = (md[j] + md[j + 1]) / 2
+            f_mid, off_md_mid = self._get_SF_md(mid, stations)
+            j_low = f_mid < np.minimum(SF[j], SF[j + 1])
+            a = np.concatenate((a, md[j][j_low]))
+            m = np.concatenate((m, mid[j_low]))
+            b = np.concatenate((b, md[j + 1][j_low]))
+            f = np.concatenate((f, f_mid[j_low]))
+            off_md = np.concatenate((off_md, off_md_mid[j_low]))
+
+        active = b - a > md_tolerance
+        while np.any(active):
+            x1 = (a[active] + m[active]) / 2
+            x2 = (m[active] + b[active]) / 2
+            f12, off_md_12 = self._get_SF_md(
+                np.concatenate((x1, x2)), stations
+            )
+            f1, f2 = np.split(f12, 2)
+            off_md_1, off_md_2 = np.split(off_md_12, 2)
+
+            left = (f1 < f[active]) & (f1 <= f2)
+            right = (f2 < f[active]) & ~left
+
+            a_new = np.where(left, a[active], np.where(right, m[active], x1))
+            b_new = np.where(left, m[active], np.where(right, b[active], x2))
+            m_new = np.where(left, x1, np.where(right, x2, m[active]))
+            f_new = np.where(left, f1, np.where(right, f2, f[active]))
+            off_md_new = np.where(
+                left, off_md_1, np.where(right, off_md_2, off_md[active])
+            )
+            a[active], b[active], m[active] = a_new, b_new, m_new
+            f[active], off_md[active] = f_new, off_md_new
+
+            active = b - a > md_tolerance
+
+        order = np.argsort(m)
+
+        return (m[order], f[order], off_md[order])
+
+
+class MultiClearance:
+    def __init__(
+        self,
+        reference,
+        offsets,
+        names=None,
+        k=3.5,
+        sigma_pa=0.5,
+        Sm=0.3,
+        Rr=0.4572,
+        Ro=0.3048,
+        kop_depth=-np.inf,
+    ):
+        """
+        Class to calculate the clearance between a reference well bore and
+        many offset well bores with the standard method documented by
+        ISCWSA (see ISCWSA), with the same results.
+
+        The reference well bore data are calculated once and the closest
+        points, covariances and separation factors of all the offset well
+        bores are calculated in single vectorized passes over the
+        concatenated offset survey data.
+
+        Parameters
+        ----------
+            reference: welleng.survey.Survey object
+            offsets: list of welleng.survey.Survey objects or a
+                welleng.survey.SurveyBatch object
+            names: list (default: None)
+                The name of each offset well bore. If None then the index of
+                each offset well bore is used.
+            k, sigma_pa, Sm, Rr, Ro, kop_depth:
+                As for welleng.clearance.Clearance.
+
+        Attributes
+        ----------
+            ref_md: (n) array of floats
+                The measured depths of the reference survey stations.
+            SF: (n,m) array of floats
+                The separation factor at each reference survey station for
+                each of the m offset well bores.
+            distance_CC: (n,m) array of floats
+                The center to center distance to the closest point on each
+                offset well bore.
+            off_md: (n,m) array of floats
+                The measured depth of the closest point on each offset well
+                bore.
+        """
+        if isinstance(offsets, SurveyBatch):
+            offsets = offsets.get_surveys()
+        if names is None:
+            names = list(range(len(offsets)))
+        assert len(names) == len(offsets), "names inconsistent with offsets"
+        self.offsets = offsets
+        self.names = names
+        self.k = k
+        self.sigma_pa = sigma_pa
+        self.Sm = Sm
+        self.Rr = Rr
+
+        self._get_offsets(Ro)
+        self._evaluate(reference, kop_depth)
+
+    def _evaluate(self, reference, kop_depth=-np.inf):
+        """
+        Calculate the clearance of the reference well bore to the
+        concatenated offset well bores, which can be reused for another
+        reference well bore.
+        """
+        # the reference data are shared by all the offsets
+        self.c = Clearance(
+            reference, None, k=self.k, sigma_pa=self.sigma_pa,
+            Sm=self.Sm, Rr=self.Rr, kop_depth=kop_depth
+        )
+        self.ref_md = self.c.ref.md
+
+        self._get_closest_points()
+        self._get_SF()
+
+    def _get_offsets(self, Ro):
+        """
+        Concatenate the survey data of the offset well bores.
+        """
+        self.lengths = np.array([len(o.md) for o in self.offsets])
+        self.offsets_index = np.concatenate(([0], np.cumsum(self.lengths)))
+        self.offsets_nevs = np.vstack([
+            np.array([o.n, o.e, o.tvd]).T for o in self.offsets
+        ])
+        for name in ('md', 'vec_nev', 'dogleg', 'delta_md', 'cov_nev'):
+            setattr(self, f"offsets_{name}", np.concatenate([
+                getattr(o, name) for o in self.offsets
+            ]))
+        self.Ro = np.concatenate([
+            np.full(len(o.md), Ro) if o.radius is None else o.radius
+            for o in self.offsets
+        ])
+        self.offsets_well = np.repeat(
+            np.arange(len(self.offsets)), self.lengths
+        )
+        self._tree = None
+
+    def _get_tree(self, ref_nevs):
+        """
+        Returns a single KDTree of the concatenated offset survey stations,
+        with the index of the offset well bore of each station scaled by a
+        separation as a fourth coordinate. The separation is larger than
+        the distance between any reference and offset survey stations, so
+        the nearest neighbour of a reference survey station given the same
+        fourth coordinate is always on that offset well bore. The tree is
+        rebuilt only if the reference well bore outgrows the separation.
+        """
+        points = np.vstack((ref_nevs, self.offsets_nevs))
+        separation = 2 * norm(points.max(axis=0) - points.min(axis=0)) + 1
+        if self._tree is None or separation > self._separation:
+            self._separation = separation
+            self._tree = KDTree(np.hstack((
+                self.offsets_nevs,
+                self.offsets_well.reshape(-1, 1) * separation
+            )))
+
+        return self._tree
+
+    def _get_closest_points(self):
+        """
+        Determine the closest point on each offset well bore to each
+        reference survey station.
+        """
+        ref_nevs = self.c.ref_nevs
+        n, m = len(ref_nevs), len(self.offsets)
+        first = self.offsets_index[:-1]
+
+        # query every reference survey station against every offset well
+        # bore in one pass
+        tree = self._get_tree(ref_nevs)
+        self.idx = tree.query(np.hstack((
+            np.tile(ref_nevs, (m, 1)),
+            np.repeat(np.arange(m) * self._separation, n).reshape(-1, 1)
+        )))[1]
+
+        self.start, self.x, self.pos, _ = get_closest_arcs(
+            np.tile(ref_nevs, (m, 1)),
+            self.idx,
+            self.offsets_nevs,
+            self.offsets_vec_nev,
+            self.offsets_dogleg,
+            self.offsets_delta_md,
+            first=np.repeat(first, n),
+            last=np.repeat(self.offsets_index[1:] - 2, n)
+        )
+
+    def _get_SF(self):
+        """
+        Calculate the separation factors, with the offset covariances
+        interpolated at the closest points.
+        """
+        n, m = len(self.c.ref_nevs), len(self.offsets)
+        i = self.start + 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mult = np.nan_to_num(self.x / self.offsets_delta_md[i])
+        off_cov_nev = (
+            self.offsets_cov_nev[i - 1]
+            + mult.reshape(-1, 1, 1)
+            * (self.offsets_cov_nev[i] - self.offsets_cov_nev[i - 1])
+        )
+
+        ref_nevs = np.tile(self.c.ref_nevs, (m, 1))
+        temp = self.pos - ref_nevs
+        distance_CC = norm(temp, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta_nevs = np.nan_to_num(
+                temp / distance_CC.reshape(-1, 1),
+                posinf=0.0,
+                neginf=0.0
+            )
+
+        ref_cov_nev = np.tile(self.c.ref.cov_nev, (m, 1, 1))
+        ref_PCR = np.sqrt(
+            np.einsum('ij,ijk,ik->i', delta_nevs, ref_cov_nev, delta_nevs)
+        )
+        off_PCR = np.sqrt(
+            np.einsum('ij,ijk,ik->i', delta_nevs, off_cov_nev, delta_nevs)
+        )
+        sigmaS = np.sqrt(ref_PCR ** 2 + off_PCR ** 2)
+        calc_hole = np.tile(self.c.Rr, m) + self.Ro[self.idx]
+
+        SF = (
+            (distance_CC - calc_hole - self.c.Sm)
+            / (self.c.k * np.sqrt(sigmaS ** 2 + self.c.sigma_pa ** 2))
+        )
+
+        self.SF = SF.reshape(m, n).T
+        self.distance_CC = distance_CC.reshape(m, n).T
+        self.off_md = (
+            self.offsets_md[self.start] + self.x
+        ).reshape(m, n).T
+        self.ref_PCR = ref_PCR.reshape(m, n).T
+        self.off_PCR = off_PCR.reshape(m, n).T
+
+    def get_SF(self, name):
+        """
+        Returns the (n) separation factors of the named offset well bore at
+        each reference survey station.
+        """
+        return self.SF[:, self.names.index(name)]
+
+
+class ClearanceSession:
+    # the per reference survey station results
+    _results = ('ref_md', 'SF', 'distance_CC', 'off_md', 'ref_PCR', 'off_PCR')
+
+    def __init__(
+        self,
+        reference,
+        offsets,
+        names=None,
+        **kwargs
+    ):
+        """
+        A stateful clearance calculation between a reference well bore that
+        is being drilled and many offset well bores, with the standard
+        method documented by ISCWSA (see MultiClearance).
+
+        The results of each reference survey station are kept, so that when
+        survey stations are appended to the reference well bore only the
+        new stations and the stations whose covariances changed (the
+        previous last station) are evaluated. The offset survey data are
+        concatenated once.
+
+        Parameters
+        ----------
+            reference: welleng.survey.Survey object
+                The reference well bore, which is extended by append.
+            offsets: list of welleng.survey.Survey objects or a
+                welleng.survey.SurveyBatch object
+            names: list (default: None)
+                The name of each offset well bore. If None then the index of
+                each offset well bore is used.
+            kwargs:
+                Passed to MultiClearance (k, sigma_pa, Sm, Rr, Ro,
+                kop_depth).
+
+        Attributes
+        ----------
+            ref_md, SF, distance_CC, off_md, ref_PCR, off_PCR:
+                As for MultiClearance, for all the reference survey stations.
+        """
+        self.reference = reference
+        self.mc = MultiClearance(reference, offsets, names=names, **kwargs)
+        self.names = self.mc.names
+
+        # the reference survey below the kick off point, if there is one
+        self.ref = self.mc.c.ref
+        # a copy, since appending overwrites the last station of the
+        # covariance array in place
+        self._cov_nev = self.ref.cov_nev.copy()
+        for name in self._results:
+            setattr(self, name, getattr(self.mc, name))
+
+    def append(self, md, inc, azi):
+        """
+        Append one or more survey stations to the reference well bore (see
+        welleng.survey.Survey.append) and update the clearance results.
+
+        Parameters
+        ----------
+            md, inc, azi: float or (,m) list or array of floats
+                The new survey stations.
+
+        Returns
+        -------
+            first: int
+                The index of the first reference survey station that was
+                evaluated.
+        """
+        n = len(self.ref_md)
+        self.reference.append(md, inc, azi)
+        if self.ref is not self.reference:
+            self.ref.append(md, inc, azi)
+
+        cov_nev = self.ref.cov_nev
+        changed = np.where(np.any(
+            cov_nev[:n] != self._cov_nev, axis=(1, 2)
+        ))[0]
+        first = min(changed[0], n) if len(changed) else n
+        first = min(first, len(cov_nev) - 2)
+        self._cov_nev = cov_nev.copy()
+
+        self.mc._evaluate(
+            slice_survey(self.ref, first, len(self.ref.md), view=True)
+        )
+        for name in self._results:
+            setattr(self, name, np.concatenate(
+                (getattr(self, name)[:first], getattr(self.mc, name))
+            ))
+
+        return first
+
+    def get_SF(self, name):
+        """
+        Returns the (n) separation factors of the named offset well bore at
+        each reference survey station.
+        """
+        return self.SF[:, self.names.index(name)]
+
+
+class TravellingCylinder:
+    def __init__(
+        self,
+        reference,
+        offsets,
+        names=None,
+        max_size=2 ** 22,
+    ):
+        """
+        Class to calculate travelling cylinder data of a reference well
+        bore against many offset well bores with the normal plane method:
+        at each reference survey station the closest point where each
+        offset well bore crosses the plane normal to the reference well
+        bore, and its distance and direction in the plane.
+
+        The offset survey data are concatenated and the survey sections
+        that cross the plane of each reference survey station are found
+        and solved in single vectorized passes, in chunks of reference
+        survey stations.
+
+        Parameters
+        ----------
+            reference: welleng.survey.Survey object
+            offsets: list of welleng.survey.Survey objects or a
+                welleng.survey.SurveyBatch object
+            names: list (default: None)
+                The name of each offset well bore. If None then the index of
+                each offset well bore is used.
+            max_size: int (default: 2 ** 22)
+                The maximum number of (reference station, offset station)
+                pairs that are evaluated in a chunk, which bounds the memory
+                used.
+
+        Attributes
+        ----------
+            ref_md: (n) array of floats
+                The measured depths of the reference survey stations.
+            distance: (n,m) array of floats
+                The center to center distance in the normal plane of each
+                reference survey station to each of the m offset well
+                bores, or NaN if the offset well bore doesn't cross the
+                plane.
+            toolface_deg: (n,m) array of floats
+                The direction of the offset well bore in the normal plane,
+                clockwise from the high side of the reference well bore.
+            bearing_deg: (n,m) array of floats
+                The toolface plus the reference azimuth (grid), the usual
+                travelling cylinder direction, which is the bearing from
+                grid north where the reference well bore is vertical.
+            off_md: (n,m) array of floats
+                The measured depth of the offset well bore in the plane.
+            off_nevs: (n,m,3) array of floats
+                The (n,e,v) coordinates of the offset well bore in the plane.
+        """
+        if isinstance(offsets, SurveyBatch):
+            offsets = offsets.get_surveys()
+        if names is None:
+            names = list(range(len(offsets)))
+        assert len(names) == len(offsets), "names inconsistent with offsets"
+        self.reference = reference
+        self.offsets = offsets
+        self.names = names
+        self.max_size = max_size
+        self.ref_md = reference.md
+
+        self._get_offsets()
+        self._get_crossings()
+
+    def _get_offsets(self):
+        """
+        Concatenate the survey data of the offset well bores.
+        """
+        self.lengths = np.array([len(o.md) for o in self.offsets])
+        self.offsets_index = np.concatenate(([0], np.cumsum(self.lengths)))
+        self.offsets_nevs = np.vstack([
+            np.array([o.n, o.e, o.tvd]).T for o in self.offsets
+        ])
+        for name in ('md', 'vec_nev', 'dogleg', 'delta_md'):
+            setattr(self, f"offsets_{name}", np.concatenate([
+                getattr(o, name) for o in self.offsets
+            ]))
+
+        # the offset well bore of each station and whether each station
+        # starts a section within its well bore
+        self.offsets_well = np.repeat(
+            np.arange(len(self.offsets)), self.lengths
+        )
+        self._section = np.ones(len(self.offsets_md) - 1, dtype=bool)
+        self._section[self.offsets_index[1:-1] - 1] = False
+
+    def _get_crossings(self):
+        """
+        Find the offset survey sections whose stations are either side of
+        the normal plane of each reference survey station, solve where they
+        cross it and keep the closest crossing of each offset well bore.
+        """
+        reference = self.reference
+        ref_nevs = np.array([reference.n, reference.e, reference.tvd]).T
+        ref_vec = reference.vec_nev
+        n, m = len(ref_nevs), len(self.offsets)
+
+        self.distance = np.full((n, m), np.nan)
+        self.off_md = np.full((n, m), np.nan)
+        self.off_nevs = np.full((n, m, 3), np.nan)
+        hlas = np.full((n, m, 3), np.nan)
+
+        chunk = max(1, self.max_size // len(self.offsets_md))
+        for a in range(0, n, chunk):
+            rows = np.arange(a, min(a + chunk, n))
+
+            # signed distance of each offset station from each plane
+            signed = (
+                ref_vec[rows] @ self.offsets_nevs.T
+                - np.sum(ref_vec[rows] * ref_nevs[rows], axis=-1)
+                .reshape(-1, 1)
+            )
+            r, j = np.nonzero(
+                (signed[:, :-1] * signed[:, 1:] <= 0) & self._section
+            )
+            if not len(r):
+                continue
+            i = rows[r]
+
+            x, pos, _ = get_arc_plane_intersections(
+                pos1=self.offsets_nevs[j],
+                vec1=self.offsets_vec_nev[j],
+                vec2=self.offsets_vec_nev[j + 1],
+                dogleg=self.offsets_dogleg[j + 1],
+                delta_md=self.offsets_delta_md[j + 1],
+                points=ref_nevs[i],
+                normals=ref_vec[i]
+            )
+            delta = pos - ref_nevs[i]
+            distance = norm(delta, axis=-1)
+
+            # the closest crossing of each offset well bore to each station
+            well = self.offsets_well[j]
+            key = i * m + well
+            order = np.lexsort((distance, key))
+            order = order[np.unique(key[order], return_index=True)[1]]
+            i, well = i[order], well[order]
+
+            self.distance[i, well] = distance[order]
+            self.off_md[i, well] = self.offsets_md[j[order]] + x[order]
+            self.off_nevs[i, well] = pos[order]
+            hlas[i, well] = np.einsum(
+                'ijk,ik->ij', reference.transform[i], delta[order]
+            )
+
+        self.toolface_deg = np.degrees(
+            np.arctan2(hlas[:, :, 1], hlas[:, :, 0])
+        ) % 360
+        self.bearing_deg = (
+            self.toolface_deg + reference.azi_grid_deg.reshape(-1, 1)
+        ) % 360
+
+    def get_offset(self, name):
+        """
+        Returns the (n) distances, toolfaces and bearings (deg) of the
+        named offset well bore at each reference survey station.
+        """
+        j = self.names.index(name)
+
+        return (
+            self.distance[:, j], self.toolface_deg[:, j],
+            self.bearing_deg[:, j]
+        )
+
 
 class MeshClearance:
     def __init__(
@@ -378,50 +1115,130 @@ class MeshClearance:
         sigma=2.445,
         return_data=True,
         return_meshes=False,
+        threshold=None,
+        workers=1,
+        cull_distance=None,
     ):
         """
         Class to calculate the clearance between two well bores using the
         standard method documented by ISCWSA.
+
+        Parameters
+        ----------
+            clearance: welleng.clearance.Clearance object
+            n_verts: int (default: 12)
+                The number of vertices around each mesh ellipse.
+            sigma: float (default: 2.445)
+                The sigma of the well bore meshes.
+            return_data: bool (default: True)
+                If False then only whether each reference section collides
+                with the offset well bore is determined.
+            return_meshes: bool (default: False)
+                If True then the meshes of the reference sections are kept.
+            threshold: float (default: None)
+                If provided then only a go/no-go decision is made on whether
+                any reference section has a separation factor (SF) below the
+                threshold. A lower bound of the (unrounded) SF of each
+                section (SF_lower) is calculated from capsules that enclose
+                the meshes of the well bores (see get_envelopes) and only
+                the sections that the bound can't prove are safe are
+                evaluated, in ascending order of the bound, stopping at the
+                first confirmed violation. In this
+                mode the data are those of the evaluated sections (listed
+                in sections), violation is the index of the violating
+                section (or None) and safe is True if there's no
+                violation.
+            workers: int (default: 1)
+                The number of processes over which the reference sections
+                are evaluated, in contiguous chunks, with each process
+                meshing the well bores once. The well bores aren't meshed
+                in this process, so off_mesh and ref_mesh are None. If None
+                then the number of CPUs is used. The threshold mode is
+                always evaluated in this process.
+            cull_distance: float (default: None)
+                If provided then the reference sections are first screened
+                against an index of the offset sections with capsules that
+                enclose their meshes (see get_capsule_pairs), and sections
+                that are further than the distance from the offset well
+                bore aren't evaluated with FCL. These are listed in culled
+                and reported as clear, with no collision, the md of the
+                start of the section, lower bounds of distance_CC and SF
+                (from the capsule distances, see _get_SF_lower) and NaN (or
+                None) for the other data.
         """
         Clearance.__init__
+        # the workers mesh the well bores for themselves
+        self._setup(
+            clearance, n_verts, sigma, return_data, return_meshes, threshold,
+            cull_distance, mesh=threshold is not None or workers == 1
+        )
+
+        if self.threshold is not None:
+            self._get_SF_lower()
+            self._get_violation()
+        elif workers == 1:
+            self._process_well()
+        else:
+            self._process_well_parallel(workers)
+
+    # the results that are listed for each evaluated reference section
+    _data = (
+        'distance_CC', 'distance', 'off_index', 'SF', 'nev',
+        'hoz_bearing_deg', 'ref_PCR', 'off_PCR', 'calc_hole', 'ref_md',
+        'off_md'
+    )
+
+    def _setup(
+        self, clearance, n_verts, sigma, return_data, return_meshes, threshold,
+        cull_distance=None, mesh=True
+    ):
+        """
+        Mesh the well bores (unless mesh is False) and initiate the results,
+        before any reference sections are evaluated.
+        """
         self.c = clearance
         self.n_verts = n_verts
         self.sigma = sigma
         self.Rr = self.c.ref.radius
         self.Ro = self.c.offset.radius
+        self.threshold = threshold
 
         # if you're only interesting in a binary "go/no-go" decision
         # then you can forfeit the expensive ISCWSA calculations by
         # setting return_data to False.
-        self.return_data = return_data
+        self.return_data = return_data or threshold is not None
+        self.return_meshes = return_meshes
+        self._init_results()
 
-        if self.return_data:
-            self.distance_CC = []
-            self.distance = []
-            self.collision = []
-            self.off_index = []
-            self.SF = []
-            self.nev = []
-            self.hoz_bearing_deg = []
-            self.ref_PCR = []
-            self.off_PCR = []
-            self.calc_hole = []
-            self.ref_md = []
-            self.off_md = []
+        self.off_mesh = None
+        self.cm = None
+        self.ref_mesh = None
+        if mesh:
+            # generate mesh for offset well
+            self.off_mesh = self._get_mesh(self.c.offset, offset=True).mesh
 
-        self.return_meshes = return_meshes
-        if self.return_meshes:
-            self.meshes = []
+            # make a CollisionManager object and add the offset well mesh
+            self.cm = trimesh.collision.CollisionManager()
 
-        # generate mesh for offset well
-        self.off_mesh = self._get_mesh(self.c.offset, offset=True).mesh
+            self.cm.add_object("offset", self.off_mesh)
 
-        # make a CollisionManager object and add the offset well mesh
-        self.cm = trimesh.collision.CollisionManager()
+            # generate a mesh for the reference well, from which the mesh
+            # of each section is taken
+            self.ref_mesh = self._get_mesh(self.c.ref)
 
-        self.cm.add_object("offset", self.off_mesh)
+        self.cull_distance = cull_distance
+        self.culled = None
+        if cull_distance is not None:
+            self._get_culled(cull_distance)
 
-        self._process_well()
+    def _init_results(self):
+        self._results = ['collision']
+        if self.return_data:
+            self._results.extend(self._data)
+        if self.return_meshes:
+            self._results.append('meshes')
+        for name in self._results:
+            setattr(self, name, [])
 
     def get_lines(self):
         """
@@ -430,6 +1247,7 @@ class MeshClearance:
         points = [
             list(d[2]._points.values())
             for d in self.distance
+            if d is not None
         ]
 
         start_points = []
@@ -455,6 +1273,7 @@ class MeshClearance:
             survey=survey,
             n_verts=self.n_verts,
             sigma=self.sigma,
+            sigma_pa=self.c.sigma_pa,
             Sm=Sm,
         )
 
@@ -466,116 +1285,264 @@ class MeshClearance:
         each section whether a collision has occurred with the offset
         well and optionally calculates separation data.
         """
+        for i in range(len(self.c.ref.md) - 1):
+            self._process_section(i)
+
+    def _process_well_parallel(self, workers):
+        """
+        Evaluate the reference sections in a process pool, in contiguous
+        chunks that are merged back in order.
+        """
+        if workers is None:
+            workers = os.cpu_count()
+        sections = np.arange(len(self.c.ref.md) - 1)
+        chunks = [
+            chunk for chunk in np.array_split(sections, workers * 4)
+            if len(chunk)
+        ]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_mesh_worker,
+            initargs=((
+                self.c, self.n_verts, self.sigma, self.return_data,
+                self.return_meshes, None, self.cull_distance
+            ),)
+        ) as executor:
+            for results in executor.map(_mesh_worker, chunks):
+                for name in self._results:
+                    getattr(self, name).extend(results[name])
+
+    def _get_envelopes(self):
+        """
+        The capsules enclosing the meshes of the sections of the reference
+        and offset well bores.
+        """
+        margin = self.c.sigma_pa / 2
+        p1, q1, r1 = get_envelopes(self.c.ref, self.sigma)
+        p2, q2, r2 = get_envelopes(self.c.offset, self.sigma)
+
+        return (p1, q1, r1 + margin, p2, q2, r2 + margin + self.c.Sm)
+
+    def _get_culled(self, cull_distance):
+        """
+        Flag the reference sections whose capsules are further than the
+        cull distance from the capsules of all the offset sections, and
+        bound the distance between the well paths and the SF of these
+        sections, as in _get_SF_lower.
+        """
+        p1, q1, r1, p2, q2, r2 = self._get_envelopes()
+        i, _, _ = get_capsule_pairs(p1, q1, r1, p2, q2, r2, cull_distance)
+
+        self.culled = np.ones(len(r1), dtype=bool)
+        self.culled[i] = False
+
+        # the distance between the arcs is at least the distance between
+        # the chords less the sagittas
+        s1, s2 = _get_sagittas(self.c.ref), _get_sagittas(self.c.offset)
+        self._culled_distance_CC = (
+            cull_distance + r1 - s1 + (r2 - s2).min()
+        )
+        self._culled_SF = np.maximum(
+            self._culled_distance_CC / (r1 + r2.max()), 1.
+        )
+
+    def _get_SF_lower(self):
+        """
+        A lower bound of the SF of each reference section. The meshes are
+        within the capsules of their sections (see get_envelopes), whose
+        radii are the largest radii of the meshes (sigma standard deviations
+        of the uncertainty plus the hole radius, Sm and half sigma_pa) plus
+        the sagittas of the arcs. Where a section's capsule is clear of the
+        offset capsules the meshes can't collide, and the SF (the distance
+        between the closest points on the well paths over that distance
+        less the distance between the meshes) is at least the distance
+        between the arcs over the sum of the mesh radii, else the bound is
+        0.
+
+        Only the offset sections within the distance that could bring the
+        bound below the threshold are measured (see get_capsule_pairs), and
+        sections without any are bounded by the threshold.
+        """
+        p1, q1, r1, p2, q2, r2 = self._get_envelopes()
+        s1, s2 = _get_sagittas(self.c.ref), _get_sagittas(self.c.offset)
+        r2_max = r2.max()
+        distance = (
+            self.threshold * (r1.max() + r2_max) + s1.max() + s2.max()
+        )
+        i, j, gap = get_capsule_pairs(p1, q1, r1, p2, q2, r2, distance)
+
+        # the distance between the arcs is at least the distance between
+        # the chords less the sagittas
+        arcs = gap + r1[i] + r2[j] - s1[i] - s2[j]
+        bound = np.full(len(r1), np.inf)
+        np.minimum.at(bound, i, arcs / (r1[i] + r2_max))
+        self._gap = np.full(len(r1), np.inf)
+        np.minimum.at(self._gap, i, gap)
+
+        self.SF_lower = np.where(
+            self._gap > 0,
+            np.maximum(np.minimum(bound, max(self.threshold, 1.)), 1.),
+            0.
+        )
+
+    def _get_violation(self):
+        """
+        Process the sections that the lower bound can't prove are safe, in
+        ascending order of the bound, until a section with an SF below the
+        threshold is found.
+        """
+        self.sections = []
+        self.violation = None
+
+        # the sections that could collide first, the closest first
+        order = np.lexsort((self._gap, self.SF_lower))
+        for i in order[self.SF_lower[order] < self.threshold]:
+            self._process_section(i)
+            self.sections.append(i)
+            if self.SF[-1] < self.threshold:
+                self.violation = i
+                break
+
+        self.safe = self.violation is None
+
+    def _process_section(self, i):
+        """
+        Determine whether a section of the reference well survey collides
+        with the offset well and optionally calculate separation data.
+        """
+        if self.culled is not None and self.culled[i]:
+            self._append_culled(i)
+            return
+
         ref = self.c.ref
         off = self.c.offset
         off_nevs = self.c.offset_nevs
 
-        for i in range(len(ref.md) - 1):
-            # slice a well section and create section survey
-            s = slice_survey(ref, i)
+        # slice a well section and create section survey
+        s = slice_survey(ref, i, view=True)
 
-            # generate a mesh for the section slice
-            m = self._get_mesh(s).mesh
+        # take the mesh of the section from the reference well mesh
+        m = self.ref_mesh.get_section(i)
 
-            # see if there's a collision
-            collision = self.cm.in_collision_single(
-                m, return_names=self.return_data, return_data=self.return_data
+        # see if there's a collision
+        collision = self.cm.in_collision_single(
+            m, return_names=self.return_data, return_data=self.return_data
+        )
+        self.collision.append(collision)
+
+        if self.return_data:
+            distance = self.cm.min_distance_single(
+                m, return_name=True, return_data=True
             )
+            closest_point_reference = distance[2].point("__external")
+            name_offset_absolute = distance[1]
+            closest_point_offset = distance[2].point(name_offset_absolute)
+
+            ref_nev = self._get_closest_nev(s, closest_point_reference)
+            ref_md = ref.md[i] + ref_nev[1].x[0]
+
+            # find the closest point on the well trajectory to the closest
+            # points on the mesh surface
+            off_index = KDTree(off_nevs).query(closest_point_offset)[1]
+            if off_index < len(off.md) - 1:
+                s = slice_survey(off, off_index, view=True)
+                off_nev_1 = self._get_closest_nev(s, closest_point_offset)
+            else:
+                off_nev_1 = False
 
-            if self.return_data:
-                distance = self.cm.min_distance_single(
-                    m, return_name=True, return_data=True
-                )
-                closest_point_reference = distance[2].point("__external")
-                name_offset_absolute = distance[1]
-                closest_point_offset = distance[2].point(name_offset_absolute)
-
-                ref_nev = self._get_closest_nev(s, closest_point_reference)
-                ref_md = ref.md[i-1] + ref_nev[1].x[0]
-
-                # find the closest point on the well trajectory to the closest
-                # points on the mesh surface
-                off_index = KDTree(off_nevs).query(closest_point_offset)[1]
-                if off_index < len(off.md) - 1:
-                    s = slice_survey(off, off_index)
-                    off_nev_1 = self._get_closest_nev(s, closest_point_offset)
-                else:
-                    off_nev_1 = False
+            if off_index > 0:
+                s = slice_survey(off, off_index - 1, view=True)
+                off_nev_0 = self._get_closest_nev(s, closest_point_offset)
+            else:
+                off_nev_0 = False
 
-                if off_index > 0:
-                    s = slice_survey(off, off_index - 1)
-                    off_nev_0 = self._get_closest_nev(s, closest_point_offset)
-                else:
-                    off_nev_0 = False
-
-                if off_nev_0 and off_nev_1:
-                    if off_nev_0[1].fun < off_nev_1[1].fun:
-                        off_nev = off_nev_0
-                        off_md = off.md[off_index-1] + off_nev_0[1].x[0]
-                    else:
-                        off_nev = off_nev_1
-                        off_md = off.md[off_index] + off_nev_1[1].x[0]
-                elif off_nev_0:
+            if off_nev_0 and off_nev_1:
+                if off_nev_0[1].fun < off_nev_1[1].fun:
                     off_nev = off_nev_0
                     off_md = off.md[off_index-1] + off_nev_0[1].x[0]
                 else:
                     off_nev = off_nev_1
                     off_md = off.md[off_index] + off_nev_1[1].x[0]
-
-                vec = off_nev[0] - ref_nev[0]
-                distance_CC = norm(vec)
-                hoz_bearing_deg = (
-                    np.degrees(np.arctan2(vec[1], vec[0])) + 360
-                ) % 360
-
-                if collision[0] is True:
-                    depth = norm(
-                        closest_point_offset - closest_point_reference
-                    )
-                    # prevent divide by zero
-                    if distance_CC != 0 and depth != 0:
-                        SF = distance_CC / (distance_CC + depth)
-                    else:
-                        SF = 0
-                else:
-                    SF = distance_CC / (distance_CC - distance[0])
-
-                # data for ISCWSA method comparison
-                self.collision.append(collision)
-                self.off_index.append(off_index)
-                self.distance.append(distance)
-                self.distance_CC.append(distance_CC)
-                self.SF.append(round(SF, 2))
-                self.nev.append((ref_nev, off_nev))
-                self.hoz_bearing_deg.append(hoz_bearing_deg)
-                self.ref_PCR.append(
-                    (ref_nev[1].fun - self.c.sigma_pa / 2 - self.Rr[i])
-                    / self.sigma
-                )
-                self.off_PCR.append(
-                    (
-                        off_nev[1].fun - self.c.sigma_pa / 2
-                        - self.Ro[off_index] - self.c.Sm
-                    ) / self.sigma
+            elif off_nev_0:
+                off_nev = off_nev_0
+                off_md = off.md[off_index-1] + off_nev_0[1].x[0]
+            else:
+                off_nev = off_nev_1
+                off_md = off.md[off_index] + off_nev_1[1].x[0]
+
+            vec = off_nev[0] - ref_nev[0]
+            distance_CC = norm(vec)
+            hoz_bearing_deg = (
+                np.degrees(np.arctan2(vec[1], vec[0])) + 360
+            ) % 360
+
+            if collision[0] is True:
+                depth = norm(
+                    closest_point_offset - closest_point_reference
                 )
-                self.calc_hole.append(ref.radius[i] + off.radius[off_index])
-                self.ref_md.append(ref_md)
-                self.off_md.append(off_md)
+                # prevent divide by zero
+                if distance_CC != 0 and depth != 0:
+                    SF = distance_CC / (distance_CC + depth)
+                else:
+                    SF = 0
+            else:
+                SF = distance_CC / (distance_CC - distance[0])
+
+            # data for ISCWSA method comparison
+            self.off_index.append(off_index)
+            self.distance.append(distance)
+            self.distance_CC.append(distance_CC)
+            self.SF.append(round(SF, 2))
+            self.nev.append((ref_nev, off_nev))
+            self.hoz_bearing_deg.append(hoz_bearing_deg)
+            self.ref_PCR.append(
+                (ref_nev[1].fun - self.c.sigma_pa / 2 - self.Rr[i])
+                / self.sigma
+            )
+            self.off_PCR.append(
+                (
+                    off_nev[1].fun - self.c.sigma_pa / 2
+                    - self.Ro[off_index] - self.c.Sm
+                ) / self.sigma
+            )
+            self.calc_hole.append(ref.radius[i] + off.radius[off_index])
+            self.ref_md.append(ref_md)
+            self.off_md.append(off_md)
 
-            if self.return_meshes:
-                self.meshes.append(m)
+        if self.return_meshes:
+            self.meshes.append(m)
 
-            else:
-                self.collision.append(collision)
+    def _append_culled(self, i):
+        """
+        Report a culled reference section as clear of the offset well bore,
+        with lower bounds of its distance_CC and SF at the start of the
+        section.
+        """
+        if self.return_data:
+            self.collision.append((False, set(), []))
+            for name in self._data:
+                getattr(self, name).append(
+                    None if name in ('distance', 'off_index', 'nev')
+                    else np.nan
+                )
+            self.distance_CC[-1] = self._culled_distance_CC[i]
+            # round down, so that it bounds the rounded SF
+            self.SF[-1] = np.floor(self._culled_SF[i] * 100) / 100
+            self.ref_md[-1] = self.c.ref.md[i]
+        else:
+            self.collision.append(False)
+
+        if self.return_meshes:
+            self.meshes.append(self.ref_mesh.get_section(i))
 
-    def _fun(self, x, survey, pos):
+    def _fun(self, x, stations, pos):
         """
         Interpolates a point on a well trajectory and returns
         the distance between the interpolated point and the
         position provided.
         """
-        s = interpolate_survey(survey, x[0])
-        new_pos = np.array([s.n, s.e, s.tvd]).T[1]
+        new_pos = interpolate_stations(**stations, index=0, x=x[0])[3][0]
         dist = norm(new_pos - pos, axis=-1)
 
         return dist
@@ -585,17 +1552,434 @@ class MeshClearance:
         Using an optimization function to determine the closest
         point along a well trajectory to the position provided.
         """
+        stations = get_station_arrays(survey)
         bnds = [(0, survey.md[1] - survey.md[0])]
         res = optimize.minimize(
             self._fun,
             bnds[0][1] / 2,
             method='SLSQP',
             bounds=bnds,
-            args=(survey, pos)
+            args=(stations, pos)
             )
 
-        s = interpolate_survey(survey, res.x[0])
-
-        nev = np.array([s.n, s.e, s.tvd]).T[-1]
+        nev = interpolate_stations(**stations, index=0, x=res.x[0])[3][0]
 
         return (nev, res)
+
+
+# the MeshClearance of a process pool worker, with the well bores meshed once
+_mesh = {}
+
+
+def _init_mesh_worker(args):
+    mc = MeshClearance.__new__(MeshClearance)
+    mc._setup(*args)
+    _mesh['mc'] = mc
+
+
+def _mesh_worker(sections):
+    """
+    Evaluate a chunk of reference sections, returning the results of each
+    section.
+    """
+    mc = _mesh['mc']
+    mc._init_results()
+    for i in sections:
+        mc._process_section(i)
+
+    return {name: getattr(mc, name) for name in mc._results}
+
+
+def get_envelopes(survey, sigma=3.):
+    """
+    Get a capsule (a line segment with a radius) enclosing each survey
+    section of a well bore, inflated by the well bore radius and the sigma
+    uncertainty along the major axis of the error ellipsoid at the ends of
+    the section, plus the deviation of the minimum curvature arc from the
+    chord between the survey stations.
+
+    Parameters
+    ----------
+        survey: welleng.survey.Survey object
+        sigma: float (default: 3.)
+            The number of standard deviations of the uncertainty. If the
+            survey has no covariances then only the radius is applied.
+
+    Returns
+    -------
+        start: (n-1,3) array of floats
+            The (n,e,v) coordinates of the start of each section.
+        end: (n-1,3) array of floats
+            The (n,e,v) coordinates of the end of each section.
+        radius: (n-1) array of floats
+            The radius of the capsule of each section.
+    """
+    nevs = np.array([survey.n, survey.e, survey.tvd]).T
+    envelope = np.array(survey.radius, dtype=float)
+    if survey.cov_nev is not None:
+        major = np.linalg.eigvalsh(survey.cov_nev)[:, -1]
+        envelope = envelope + sigma * np.sqrt(np.clip(major, 0, None))
+
+    radius = np.maximum(envelope[:-1], envelope[1:]) + _get_sagittas(survey)
+
+    return (nevs[:-1], nevs[1:], radius)
+
+
+def _get_sagittas(survey):
+    """
+    The deviation of the minimum curvature arc of each survey section from
+    the chord between its survey stations.
+    """
+    dogleg = survey.dogleg[1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(
+            dogleg > 0,
+            survey.delta_md[1:] / dogleg * (1 - np.cos(dogleg / 2)),
+            0.
+        )
+
+
+def get_capsule_pairs(
+    p1, q1, r1, p2, q2, r2, distance=0., tree=None, bounds=None
+):
+    """
+    Find the pairs of capsules, one from each of two sets of capsules (see
+    get_envelopes), that are within a distance of each other. The second
+    set is indexed with a KD-tree of the capsule centers so that only the
+    capsules whose bounding spheres are close enough are measured.
+
+    Parameters
+    ----------
+        p1, q1: (n,3) arrays of floats
+            The start and end of the axis of each capsule of the first set.
+        r1: (n) array of floats
+            The radius of each capsule of the first set.
+        p2, q2, r2:
+            The same for the second set of m capsules.
+        distance: float (default: 0.)
+            The distance threshold between the capsules.
+        tree: scipy.spatial.KDTree (default: None)
+            A KD-tree of the centers of the second set of capsules, which is
+            built if it's not provided.
+        bounds: (m) array of floats (default: None)
+            The radii of the bounding spheres of the second set of capsules,
+            which are calculated if not provided.
+
+    Returns
+    -------
+        i, j: (k) arrays of ints
+            The indexes of the capsules of each pair.
+        gap: (k) array of floats
+            The distance between the capsules of each pair, which is
+            negative if they intersect.
+    """
+    if tree is None:
+        tree = KDTree((p2 + q2) / 2)
+    if bounds is None:
+        bounds = norm(q2 - p2, axis=-1) / 2 + r2
+
+    centers = (p1 + q1) / 2
+    bounds_1 = norm(q1 - p1, axis=-1) / 2 + r1
+
+    # candidates whose bounding spheres could be within the distance
+    found = tree.query_ball_point(
+        centers, bounds_1 + bounds.max() + distance, return_sorted=False
+    )
+    counts = np.array([len(f) for f in found])
+    if not counts.sum():
+        return (np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0))
+    i = np.repeat(np.arange(len(centers)), counts)
+    j = np.concatenate(found).astype(int)
+
+    mask = (
+        norm(centers[i] - tree.data[j], axis=-1)
+        <= bounds_1[i] + bounds[j] + distance
+    )
+    i, j = i[mask], j[mask]
+
+    # the exact distances between the capsules
+    gap = get_segment_distances(p1[i], q1[i], p2[j], q2[j]) - r1[i] - r2[j]
+    mask = gap <= distance
+
+    return (i[mask], j[mask], gap[mask])
+
+
+class SpatialIndex:
+    def __init__(
+        self,
+        surveys,
+        names=None,
+        sigma=3.,
+    ):
+        """
+        A field level spatial index of the survey sections of many well
+        bores for screening which offset well bores (and which sections of
+        them) can be within a given distance of a reference well bore,
+        before running the more expensive clearance calculations.
+
+        Each survey section is enclosed by a capsule (see get_envelopes)
+        and the capsules of all the well bores are indexed with a KD-tree of
+        their centers.
+
+        Parameters
+        ----------
+            surveys: list of welleng.survey.Survey objects or a
+                welleng.survey.SurveyBatch object
+                The well bores to index.
+            names: list (default: None)
+                The name of each well bore, by which the results of a query
+                are keyed. If None then the index of each well bore is used.
+            sigma: float (default: 3.)
+                The number of standard deviations of the uncertainty by
+                which the capsules are inflated.
+        """
+        if isinstance(surveys, SurveyBatch):
+            surveys = surveys.get_surveys()
+        if names is None:
+            names = list(range(len(surveys)))
+        assert len(names) == len(surveys), "names inconsistent with surveys"
+
+        self.surveys = surveys
+        self.names = names
+        self.sigma = sigma
+
+        start, end, radius, well, section = [], [], [], [], []
+        for i, survey in enumerate(surveys):
+            p, q, r = get_envelopes(survey, sigma)
+            start.append(p)
+            end.append(q)
+            radius.append(r)
+            well.append(np.full(len(r), i))
+            section.append(np.arange(len(r)))
+
+        self.start, self.end = np.vstack(start), np.vstack(end)
+        self.radius = np.concatenate(radius)
+        self.well = np.concatenate(well)
+        self.section = np.concatenate(section)
+
+        self.centers = (self.start + self.end) / 2
+        self.bounds = norm(self.end - self.start, axis=-1) / 2 + self.radius
+        self.tree = KDTree(self.centers)
+
+    def query(self, reference, distance=0.):
+        """
+        Find the offset well bores with sections whose capsules are within
+        a distance of the capsules of a reference well bore.
+
+        Parameters
+        ----------
+            reference: welleng.survey.Survey object
+                The reference well bore. If it's one of the indexed well
+                bores then it's excluded from the results.
+            distance: float (default: 0.)
+                The distance threshold between the capsules.
+
+        Returns
+        -------
+            candidates: dict
+                The md ranges of the sections of each candidate offset well
+                bore as an (m,2) array of [from, to] measured depths, keyed
+                by the name of the well bore.
+        """
+        p, q, r = get_envelopes(reference, self.sigma)
+        i, j, _ = get_capsule_pairs(
+            p, q, r, self.start, self.end, self.radius, distance,
+            tree=self.tree, bounds=self.bounds
+        )
+        exclude = [
+            k for k, survey in enumerate(self.surveys) if survey is reference
+        ]
+        j = np.unique(j[~np.isin(self.well[j], exclude)])
+        if not len(j):
+            return {}
+
+        candidates = {}
+        for w in np.unique(self.well[j]):
+            sections = self.section[j][self.well[j] == w]
+            md = self.surveys[w].md
+            # merge consecutive sections into md ranges
+            breaks = np.where(np.diff(sections) > 1)[0] + 1
+            first = np.split(sections, breaks)
+            candidates[self.names[w]] = np.array([
+                [md[f[0]], md[f[-1] + 1]] for f in first
+            ])
+
+        return candidates
+
+
+# the surveys and settings of a FieldClearance, shared once with each worker
+_field = {}
+
+
+def _init_field_worker(surveys, kwargs):
+    _field.update(surveys=surveys, kwargs=kwargs)
+
+
+def _field_worker(task):
+    """
+    Calculate the minimum separation factors between a reference well bore
+    and its candidate offset well bores.
+    """
+    i, offsets, mesh, sigma = task
+    surveys, kwargs = _field['surveys'], _field['kwargs']
+    reference = surveys[i]
+
+    mc = MultiClearance(reference, [surveys[j] for j in offsets], **kwargs)
+    idx = np.argmin(mc.SF, axis=0)
+    columns = np.arange(len(offsets))
+    results = [np.array([
+        mc.SF[idx, columns], mc.ref_md[idx], mc.off_md[idx, columns]
+    ]).T]
+
+    if mesh:
+        mesh_results = []
+        for j in offsets:
+            rm = MeshClearance(
+                Clearance(reference, surveys[j], **kwargs), sigma=sigma
+            )
+            k = np.argmin(rm.SF)
+            mesh_results.append([rm.SF[k], rm.ref_md[k], rm.off_md[k]])
+        results.append(np.array(mesh_results))
+
+    return results
+
+
+class FieldClearance:
+    def __init__(
+        self,
+        surveys,
+        names=None,
+        distance=100.,
+        screening_sigma=3.,
+        mesh=False,
+        mesh_sigma=2.445,
+        workers=None,
+        **kwargs
+    ):
+        """
+        Calculate the minimum separation factor (SF) between every pair of
+        well bores on a pad or field, using the ISCWSA method (see
+        MultiClearance) and optionally the mesh method (see MeshClearance).
+
+        Pairs of well bores whose uncertainty envelopes are not within the
+        distance of each other are pruned with a SpatialIndex and the
+        remaining pairs are evaluated across a pool of processes, with the
+        surveys shared once with each process.
+
+        Each pair is evaluated once, with the well bore that is first in the
+        surveys as the reference well bore.
+
+        Parameters
+        ----------
+            surveys: list of welleng.survey.Survey objects or a
+                welleng.survey.SurveyBatch object
+            names: list (default: None)
+                The name of each well bore. If None then the index of each
+                well bore is used.
+            distance: float (default: 100.)
+                The screening distance between the envelopes of the well
+                bores, beyond which a pair isn't evaluated.
+            screening_sigma: float (default: 3.)
+                The number of standard deviations of the envelopes of the
+                well bores (see SpatialIndex).
+            mesh: bool (default: False)
+                If True then the mesh method is also evaluated for each
+                pair.
+            mesh_sigma: float (default: 2.445)
+                The sigma of the meshes (see MeshClearance).
+            workers: int (default: None)
+                The number of processes. If None then the number of CPUs is
+                used and if 1 then the pairs are evaluated in this process.
+            kwargs:
+                Passed to Clearance (k, sigma_pa, Sm, Rr, Ro, kop_depth).
+
+        Attributes
+        ----------
+            pairs: (k,2) array of ints
+                The indexes of the (reference, offset) well bores of each
+                evaluated pair.
+            SF, ref_md, off_md: (k) arrays of floats
+                The minimum ISCWSA separation factor of each pair and the
+                measured depths on the reference and offset well bores where
+                it occurs.
+            mesh_SF, mesh_ref_md, mesh_off_md: (k) arrays of floats
+                The same for the mesh method, if mesh is True.
+            matrix: (n,n) scipy.sparse.csr_matrix
+                The symmetric matrix of the minimum ISCWSA separation
+                factors of the evaluated pairs.
+        """
+        if isinstance(surveys, SurveyBatch):
+            surveys = surveys.get_surveys()
+        if names is None:
+            names = list(range(len(surveys)))
+        assert len(names) == len(surveys), "names inconsistent with surveys"
+        self.surveys = surveys
+        self.names = names
+        self.mesh = mesh
+
+        index = SpatialIndex(surveys, sigma=screening_sigma)
+        tasks = []
+        for i, survey in enumerate(surveys):
+            candidates = index.query(survey, distance=distance)
+            offsets = [j for j in sorted(candidates) if j > i]
+            if offsets:
+                tasks.append((i, offsets, mesh, mesh_sigma))
+
+        if workers is None:
+            workers = os.cpu_count()
+        if workers == 1 or len(tasks) < 2:
+            _init_field_worker(surveys, kwargs)
+            results = [_field_worker(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_field_worker,
+                initargs=(surveys, kwargs)
+            ) as executor:
+                results = list(executor.map(_field_worker, tasks))
+        _field.clear()
+
+        self._get_results(tasks, results)
+
+    def _get_results(self, tasks, results):
+        self.pairs = np.array(
+            [[i, j] for i, offsets, _, _ in tasks for j in offsets],
+            dtype=int
+        ).reshape(-1, 2)
+
+        data = (
+            np.vstack([r[0] for r in results]) if results
+            else np.zeros((0, 3))
+        )
+        self.SF, self.ref_md, self.off_md = data.T
+        if self.mesh:
+            data = (
+                np.vstack([r[1] for r in results]) if results
+                else np.zeros((0, 3))
+            )
+            self.mesh_SF, self.mesh_ref_md, self.mesh_off_md = data.T
+
+        n = len(self.surveys)
+        i, j = self.pairs.T
+        self.matrix = csr_matrix(
+            (np.concatenate((self.SF, self.SF)),
+             (np.concatenate((i, j)), np.concatenate((j, i)))),
+            shape=(n, n)
+        )
+
+    def get_pair(self, name1, name2):
+        """
+        Returns the minimum ISCWSA separation factor of a pair of well bores
+        and the measured depths on each where it occurs, or None if the pair
+        wasn't evaluated.
+        """
+        i, j = self.names.index(name1), self.names.index(name2)
+        idx = np.where(
+            (self.pairs[:, 0] == min(i, j)) & (self.pairs[:, 1] == max(i, j))
+        )[0]
+        if not len(idx):
+            return None
+        k = idx[0]
+        if i < j:
+            return (self.SF[k], self.ref_md[k], self.off_md[k])
+        return (self.SF[k], self.off_md[k], self.ref_md[k])
@@ -1,6 +1,6 @@
 import numpy as np
 # from numpy import sin, cos, tan, pi, sqrt
-# from .utils import MinCurve
+from .utils import Geometry
 from .errors.iscwsa_mwd import iscwsaMwd
 
 # TODO: there's likely an issue with TVD versus TVDSS that
@@ -49,15 +49,35 @@ class ErrorModel():
         self,
         survey,
         error_model="iscwsa_mwd_rev4",
+        lean=False,
+        lengths=None
     ):
         """
-
+        Parameters
+        ----------
+            survey: welleng.survey.Survey object
+            error_model: str (default: "iscwsa_mwd_rev4")
+                The error model, one of ERROR_MODELS.
+            lean: bool (default: False)
+                If True then the covariances of each error source are added
+                to the summed covariances as they are calculated and the
+                error terms of each error source are not retained. The
+                error terms are then calculated on demand, when the errors
+                attribute of the error model (e.g. errors.errors) is first
+                accessed.
+            lengths: (,m) list or array of ints (default: None)
+                The number of survey stations of each well bore if the survey
+                is a batch of m well bores with concatenated survey data (e.g.
+                a welleng.survey.SurveyBatch object), in which case the errors
+                of each well bore are propagated from its first station. If
+                None then the survey is a single well bore.
         """
 
         error_models = ERROR_MODELS
         assert error_model in error_models, "Unrecognized error model"
         self.error_model = error_model
         self.survey = survey
+        self.lean = lean
 
         self.survey_rad = np.stack((
             self.survey.md,
@@ -65,53 +85,68 @@ class ErrorModel():
             self.survey.azi_true_rad
         ), axis=-1)
 
+        if lengths is None:
+            lengths = [len(self.survey_rad)]
+        self.lengths = np.array(lengths, dtype=int).reshape(-1)
+        assert np.sum(self.lengths) == len(self.survey_rad), (
+            "lengths inconsistent with survey"
+        )
+        # the indexes of the first and last station of each well bore
+        self.ends = np.cumsum(self.lengths) - 1
+        self.starts = self.ends - self.lengths + 1
+
+        # share the geometry of the survey if its azimuths are true azimuths
+        geometry = getattr(self.survey, 'geometry', None)
+        if geometry is None or not np.array_equal(
+            geometry.azi, self.survey.azi_true_rad
+        ):
+            geometry = Geometry(
+                self.survey.inc_rad, self.survey.azi_true_rad, self.survey.md
+            )
+        self.geometry = geometry
+        self.sin_azi_mag = np.sin(self.survey.azi_mag_rad)
+        self.cos_azi_mag = np.cos(self.survey.azi_mag_rad)
+
         self.survey_drdp = self.survey_rad
-        self.drdp = self._drdp(self.survey_drdp)
+        self.drdp = self._drdp(self.geometry)
         self.drdp_sing = self._drdp_sing(self.survey_drdp)
 
+        # the (3,3,n) derivatives of the position of each station with
+        # respect to the depth, inc and azi, used by every error source
+        n = len(self.survey_rad)
+        self._drdp_NEV_star = self.drdp[:, :9].T.reshape(3, 3, n)
+        self._drdp_NEV = (self.drdp[:, :9] + self.drdp[:, 9:]).T.reshape(
+            3, 3, n
+        )
+
+        if self.lean:
+            self._cov_NEVs = np.zeros((3, 3, len(self.survey_rad)))
+            self._cov_NEVs_random = np.zeros_like(self._cov_NEVs)
+
         if self.error_model.split("_")[0] == "iscwsa":
             self.errors = iscwsaMwd(
                 error=self,
                 model=self.error_model
             )
 
+        if self.lean:
+            del self._cov_NEVs, self._cov_NEVs_random
+
     def _e_NEV(self, e_DIA):
         D, I, A = e_DIA.T
-        arr = np.array([
-            (self.drdp[:, 0] + self.drdp[:, 9]) * D
-            + (self.drdp[:, 3] + self.drdp[:, 12]) * I
-            + (self.drdp[:, 6] + self.drdp[:, 15]) * A,
-
-            (self.drdp[:, 1] + self.drdp[:, 10]) * D
-            + (self.drdp[:, 4] + self.drdp[:, 13]) * I
-            + (self.drdp[:, 7] + self.drdp[:, 16]) * A,
-
-            (self.drdp[:, 2] + self.drdp[:, 11]) * D
-            + (self.drdp[:, 5] + self.drdp[:, 14]) * I
-            + (self.drdp[:, 8] + self.drdp[:, 17]) * A,
-        ]).T
+        dD, dI, dA = self._drdp_NEV
+        arr = (dD * D + dI * I + dA * A).T
 
-        arr[0] = 0
+        arr[self.starts] = 0
 
         return arr
 
     def _e_NEV_star(self, e_DIA):
         D, I, A = e_DIA.T
-        arr = np.array([
-            self.drdp[:, 0] * D
-            + self.drdp[:, 3] * I
-            + self.drdp[:, 6] * A,
+        dD, dI, dA = self._drdp_NEV_star
+        arr = (dD * D + dI * I + dA * A).T
 
-            self.drdp[:, 1] * D
-            + self.drdp[:, 4] * I
-            + self.drdp[:, 7] * A,
-
-            self.drdp[:, 2] * D
-            + self.drdp[:, 5] * I
-            + self.drdp[:, 8] * A
-        ]).T
-
-        arr[0] = 0
+        arr[self.starts] = 0
 
         return arr
 
@@ -126,13 +161,47 @@ class ErrorModel():
             [z*x, z*y, z*z]
         ])
 
+    def _cumsum(self, arr, axis=0):
+        '''
+        Returns the cumulative sum of arr along the station axis, restarting
+        at the first station of each well bore.
+        '''
+        cumsum = np.cumsum(arr, axis=axis)
+        if len(self.lengths) > 1:
+            arr = np.moveaxis(arr, axis, 0)
+            cumsum = np.moveaxis(cumsum, axis, 0)
+            cumsum = cumsum - np.repeat(
+                cumsum[self.starts] - arr[self.starts], self.lengths, axis=0
+            )
+            cumsum = np.moveaxis(cumsum, 0, axis)
+
+        return cumsum
+
     def _sigma_e_NEV_systematic(self, e_NEV, e_NEV_star):
-        return e_NEV_star + np.vstack(
+        sigma_e_NEV = np.vstack(
             (
                 e_NEV[0],
-                np.cumsum(e_NEV, axis=0)[:-1]
+                self._cumsum(e_NEV, axis=0)[:-1]
             )
         )
+        sigma_e_NEV[self.starts] = e_NEV[self.starts]
+
+        return e_NEV_star + sigma_e_NEV
+
+    def _cumsum_random(self, cov):
+        '''
+        Returns the (3,3,n) sums of the (3,3,n) covariances of the preceding
+        stations of each well bore.
+        '''
+        sigma_cov = np.concatenate(
+            (
+                np.zeros((3, 3, 1)),
+                self._cumsum(cov, axis=-1)[:, :, :-1]
+            ), axis=-1
+        )
+        sigma_cov[:, :, self.starts] = 0
+
+        return sigma_cov
 
     def _generate_error(
         self,
@@ -146,23 +215,22 @@ class ErrorModel():
         if not NEV:
             return e_DIA
         else:
-            cov_DIA = self._cov(e_DIA)
             if e_NEV is None:
                 e_NEV = self._e_NEV(e_DIA)
                 e_NEV_star = self._e_NEV_star(e_DIA)
+            if self.lean:
+                self._add_cov_NEV(propagation, e_NEV, e_NEV_star)
+                return
+            cov_DIA = self._cov(e_DIA)
             if propagation == 'systematic':
                 sigma_e_NEV = self._sigma_e_NEV_systematic(e_NEV, e_NEV_star)
                 cov_NEV = self._cov(sigma_e_NEV)
             elif propagation == 'random':
-                sigma_e_NEV = np.cumsum(self._cov(e_NEV), axis=-1)
+                sigma_e_NEV = self._cumsum(self._cov(e_NEV), axis=-1)
                 cov_NEV = np.add(
                     self._cov(e_NEV_star),
-                    np.concatenate(
-                        (
-                            np.array(np.zeros((3, 3, 1))),
-                            np.array(sigma_e_NEV[:, :, :-1])
-                        ), axis=-1)
-                    )
+                    self._cumsum_random(self._cov(e_NEV))
+                )
             else:
                 return
 
@@ -177,33 +245,49 @@ class ErrorModel():
                 cov_NEV
             )
 
-    def drk_dDepth(self, survey):
+    def _add_cov_NEV(self, propagation, e_NEV, e_NEV_star):
         '''
-        survey1 is previous survey station (with inc and azi in radians)
-        survey2 is current survey station (with inc and azi in radians)
+        Add the covariances of an error source to the summed covariances of
+        a lean ErrorModel. The increments of the random errors are summed
+        over all the error sources and only cumulated once, in
+        _sum_cov_NEVs.
+        '''
+        if propagation == 'systematic':
+            self._cov_NEVs += self._cov(
+                self._sigma_e_NEV_systematic(e_NEV, e_NEV_star)
+            )
+        elif propagation == 'random':
+            self._cov_NEVs += self._cov(e_NEV_star)
+            self._cov_NEVs_random += self._cov(e_NEV)
+
+    def _sum_cov_NEVs(self):
+        '''
+        Returns the (3,3,n) summed covariances of a lean ErrorModel.
         '''
-        # TODO: This is essentially minimum curvature... use function from
-        # utils instead (it's already in self.mc)
-        md1, inc1, azi1 = np.array(survey[:-1]).T
-        md2, inc2, azi2 = np.array(survey[1:]).T
+        return self._cov_NEVs + self._cumsum_random(self._cov_NEVs_random)
 
+    def drk_dDepth(self, g):
+        '''
+        Derivatives with respect to the depth of the current survey station
+        from the previous survey station, from the Geometry g.
+        '''
         N = np.array(
             0.5 * (
-                np.sin(inc1) * np.cos(azi1)
-                + np.sin(inc2) * np.cos(azi2)
+                g.sin_inc[:-1] * g.cos_azi[:-1]
+                + g.sin_inc[1:] * g.cos_azi[1:]
             )
         )
 
         E = np.array(
             0.5 * (
-                np.sin(inc1) * np.sin(azi1)
-                + np.sin(inc2) * np.sin(azi2)
+                g.sin_inc[:-1] * g.sin_azi[:-1]
+                + g.sin_inc[1:] * g.sin_azi[1:]
             )
         )
 
         V = np.array(
             0.5 * (
-                np.cos(inc1) + np.cos(inc2)
+                g.cos_inc[:-1] + g.cos_inc[1:]
             )
         )
 
@@ -214,21 +298,19 @@ class ErrorModel():
             )
         )
 
-    def drk_dInc(self, survey):
+    def drk_dInc(self, g):
         '''
-        survey1 is previous survey station (with inc and azi in radians)
-        survey2 is current survey station (with inc and azi in radians)
+        Derivatives with respect to the inc of the current survey station
+        from the previous survey station, from the Geometry g.
         '''
-        md1, inc1, azi1 = np.array(survey[:-1]).T
-        md2, inc2, azi2 = np.array(survey[1:]).T
-        delta_md = md2 - md1
+        delta_md = g.delta_md
 
-        N = np.array(0.5 * ((delta_md) * np.cos(inc2) * np.cos(azi2)))
-        E = np.array(0.5 * ((delta_md) * np.cos(inc2) * np.sin(azi2)))
-        V = np.array(0.5 * (-delta_md * np.sin(inc2)))
+        N = np.array(0.5 * ((delta_md) * g.cos_inc[1:] * g.cos_azi[1:]))
+        E = np.array(0.5 * ((delta_md) * g.cos_inc[1:] * g.sin_azi[1:]))
+        V = np.array(0.5 * (-delta_md * g.sin_inc[1:]))
 
         if self.error_model.split('_')[-1] == 'rev5':
-            N[0] *= 2
+            N[self.starts] *= 2
 
         return np.vstack(
             (
@@ -237,17 +319,15 @@ class ErrorModel():
             )
         )
 
-    def drk_dAz(self, survey):
+    def drk_dAz(self, g):
         '''
-        survey1 is previous survey station (with inc and azi in radians)
-        survey2 is current survey station (with inc and azi in radians)
+        Derivatives with respect to the azi of the current survey station
+        from the previous survey station, from the Geometry g.
         '''
-        md1, inc1, azi1 = np.array(survey[:-1]).T
-        md2, inc2, azi2 = np.array(survey[1:]).T
-        delta_md = md2 - md1
+        delta_md = g.delta_md
 
-        N = np.array(-0.5 * ((delta_md) * np.sin(inc2) * np.sin(azi2)))
-        E = np.array(0.5 * ((delta_md) * np.sin(inc2) * np.cos(azi2)))
+        N = np.array(-0.5 * ((delta_md) * g.sin_inc[1:] * g.sin_azi[1:]))
+        E = np.array(0.5 * ((delta_md) * g.sin_inc[1:] * g.cos_azi[1:]))
         V = np.zeros_like(N)
 
         return np.vstack(
@@ -257,31 +337,28 @@ class ErrorModel():
             )
         )
 
-    def drkplus1_dDepth(self, survey):
+    def drkplus1_dDepth(self, g):
         '''
-        survey2 is current survey station (with inc and azi in radians)
-        survey3 is next survey station (with inc and azi in radians)
+        Derivatives with respect to the depth of the current survey station
+        to the next survey station, from the Geometry g.
         '''
         return np.vstack(
             (
-                self.drk_dDepth(survey)[1:] * -1,
+                self.drk_dDepth(g)[1:] * -1,
                 np.array(np.zeros((1, 3)))
             )
         )
 
-    def drkplus1_dInc(self, survey):
+    def drkplus1_dInc(self, g):
         '''
-        survey2 is current survey station (with inc and azi in radians)
-        survey3 is next survey station (with inc and azi in radians)
+        Derivatives with respect to the inc of the current survey station
+        to the next survey station, from the Geometry g.
         '''
+        delta_md = g.delta_md
 
-        md2, inc2, azi2 = np.array(survey[:-1]).T
-        md3, inc3, azi3 = np.array(survey[1:]).T
-        delta_md = md3 - md2
-
-        N = np.array(0.5 * ((delta_md) * np.cos(inc2) * np.cos(azi2)))
-        E = np.array(0.5 * ((delta_md) * np.cos(inc2) * np.sin(azi2)))
-        V = np.array(0.5 * (-(delta_md) * np.sin(inc2)))
+        N = np.array(0.5 * ((delta_md) * g.cos_inc[:-1] * g.cos_azi[:-1]))
+        E = np.array(0.5 * ((delta_md) * g.cos_inc[:-1] * g.sin_azi[:-1]))
+        V = np.array(0.5 * (-(delta_md) * g.sin_inc[:-1]))
 
         return np.vstack(
             (
@@ -290,17 +367,15 @@ class ErrorModel():
             )
         )
 
-    def drkplus1_dAz(self, survey):
+    def drkplus1_dAz(self, g):
         '''
-        survey2 is current survey station (with inc and azi in radians)
-        survey3 is next survey station (with inc and azi in radians)
+        Derivatives with respect to the azi of the current survey station
+        to the next survey station, from the Geometry g.
         '''
-        md2, inc2, azi2 = np.array(survey[:-1]).T
-        md3, inc3, azi3 = np.array(survey[1:]).T
-        delta_md = md3 - md2
+        delta_md = g.delta_md
 
-        N = np.array(-0.5 * ((delta_md) * np.sin(inc2) * np.sin(azi2)))
-        E = np.array(0.5 * ((delta_md) * np.sin(inc2) * np.cos(azi2)))
+        N = np.array(-0.5 * ((delta_md) * g.sin_inc[:-1] * g.sin_azi[:-1]))
+        E = np.array(0.5 * ((delta_md) * g.sin_inc[:-1] * g.cos_azi[:-1]))
         V = np.zeros_like(N)
 
         return np.vstack(
@@ -310,28 +385,38 @@ class ErrorModel():
             )
         )
 
-    def _drdp(self, survey):
-
-        return np.hstack((
-            self.drk_dDepth(survey),
-            self.drk_dInc(survey),
-            self.drk_dAz(survey),
-            self.drkplus1_dDepth(survey),
-            self.drkplus1_dInc(survey),
-            self.drkplus1_dAz(survey)
+    def _drdp(self, g):
+        drdp = np.hstack((
+            self.drk_dDepth(g),
+            self.drk_dInc(g),
+            self.drk_dAz(g),
+            self.drkplus1_dDepth(g),
+            self.drkplus1_dInc(g),
+            self.drkplus1_dAz(g)
         ))
+        # there are no intervals between the well bores of a batch
+        drdp[self.starts, :9] = 0
+        drdp[self.ends, 9:] = 0
+
+        return drdp
 
     def _drdp_sing(self, survey):
         '''
         survey1 is previous survey station (with inc and azi in radians)
         survey2 is current survey station
         survey3 is next survey station (with inc and azi in radians)
+
+        Returns (n) arrays, with zeros at the first and last station of each
+        well bore.
         '''
-        md1, inc1, azi1 = np.array(survey[:-2]).T
-        md2, inc2, azi2 = np.array(survey[1:-1]).T
-        md3, inc3, azi3 = np.array(survey[2:]).T
-        double_delta_md = md3 - md1
-        delta_md = md2 - md1
+        md, inc, azi2 = np.array(survey).T
+        double_delta_md = np.zeros_like(md)
+        double_delta_md[1:-1] = md[2:] - md[:-2]
+        delta_md = np.zeros_like(md)
+        delta_md[1:-1] = md[1:-1] - md[:-2]
+        for arr in (double_delta_md, delta_md):
+            arr[self.starts] = 0
+            arr[self.ends] = 0
 
         return dict(
             double_delta_md=double_delta_md,
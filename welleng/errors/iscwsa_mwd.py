@@ -1,11 +1,60 @@
+import os
 import numpy as np
-from numpy import sin, cos, tan, pi, sqrt
+from numpy import cos, tan, pi, sqrt
 import yaml
 
 # import welleng.error
 from ..utils import NEV_to_HLA
 
-FILENAME = 'welleng/errors/error_codes.yaml'
+FILENAME = os.path.join(os.path.dirname(__file__), 'error_codes.yaml')
+
+# the compiled error models, loaded from FILENAME on first use
+_error_models = {}
+
+
+def get_error_model(model):
+    """
+    Get an error model from the registry of compiled error models. The
+    error models are read from FILENAME and compiled on first use, so that
+    the file is only read once per session.
+
+    Parameters
+    ----------
+        model: str
+            The name of the error model, e.g. "iscwsa_mwd_rev4".
+
+    Returns
+    -------
+        em: dict
+            The compiled error model, with the model data as read from the
+            file ('model'), the default tortuosity ('tortuosity') and a list
+            of the error codes ('codes') as (code, function, magnitude,
+            propagation) tuples with the error functions resolved.
+    """
+    if not _error_models:
+        with open(FILENAME, 'r') as file:
+            iscwsa_error_models = yaml.full_load(file)
+        for name, em in iscwsa_error_models.items():
+            _error_models[name] = _compile_error_model(em)
+
+    return _error_models[model]
+
+
+def _compile_error_model(em):
+    codes = []
+    for code, data in em['codes'].items():
+        func = data['function']
+        assert func in ERROR_FUNCTIONS, f"no function for function {func}"
+        codes.append((
+            code, ERROR_FUNCTIONS[func], data['magnitude'],
+            data['propagation']
+        ))
+
+    return dict(
+        model=em,
+        tortuosity=em['header'].get('Default Tortusity (rad/m)'),
+        codes=codes
+    )
 
 
 class iscwsaMwd:
@@ -30,98 +79,65 @@ class iscwsaMwd:
         error.__init__
 
         self.e = error
-        self.errors = {}
+        self._errors = None
 
-        with open(FILENAME, 'r') as file:
-            iscwsa_error_models = yaml.full_load(file)
-        self.em = iscwsa_error_models[model]
-        if 'Default Tortusity (rad/m)' in self.em['header']:
-            self.tortuosity = self.em['header']['Default Tortusity (rad/m)']
-        else:
-            self.tortuosity = None
+        compiled = get_error_model(model)
+        self.em = compiled['model']
+        self.tortuosity = compiled['tortuosity']
 
         if model == "iscwsa_mwd_rev5":
             assert self.tortuosity is not None, (
                 "No default tortuosity defined in model header"
             )
 
-        self._initiate_func_dict()
-
-        for err in self.em['codes']:
-            # func = self._get_the_func_out(err)
-            func = self.em['codes'][err]['function']
-            mag = self.em['codes'][err]['magnitude']
-            propagation = self.em['codes'][err]['propagation']
-            self.errors[err] = (
-                self.call_func(
-                    code=err,
-                    func=func,
-                    error=self.e,
-                    mag=mag,
-                    propagation=propagation,
-                    tortuosity=self.tortuosity,
-                )
-            )
-
-        self.cov_NEVs = np.zeros((3, 3, len(self.e.survey_rad)))
-        for _, value in self.errors.items():
-            self.cov_NEVs += value.cov_NEV
-
-        self.cov_HLAs = NEV_to_HLA(self.e.survey_rad, self.cov_NEVs)
+        self.codes = compiled['codes']
 
-    def _get_the_func_out(self, err):
-        if err in self.exceptional_funcs:
-            func = self.exceptional_funcs[err]
+        if self.e.lean:
+            # the covariances are summed as they're calculated
+            self._get_errors()
+            self.cov_NEVs = self.e._sum_cov_NEVs()
         else:
-            func = self.em['codes'][err]['function']
+            self._errors = self._get_errors()
+            self.cov_NEVs = np.zeros((3, 3, len(self.e.survey_rad)))
+            for _, value in self._errors.items():
+                self.cov_NEVs += value.cov_NEV
 
-        return func
+        self.cov_HLAs = NEV_to_HLA(self.e.survey_rad, self.cov_NEVs)
 
-    def call_func(self, code, func, error, mag, propagation, **kwargs):
+    @property
+    def errors(self):
         """
-        Function for calling functions by mapping function labels to their
-        functions.
+        The error terms of each error source, keyed by error code. If the
+        ErrorModel is lean then these are calculated on first access.
         """
-        assert func in self.func_dict, f"no function for function {func}"
+        if self._errors is None:
+            lean, self.e.lean = self.e.lean, False
+            try:
+                self._errors = self._get_errors()
+            finally:
+                self.e.lean = lean
+
+        return self._errors
+
+    def _get_errors(self):
+        return {
+            err: func(
+                err,
+                self.e,
+                mag,
+                propagation,
+                tortuosity=self.tortuosity,
+            )
+            for err, func, mag, propagation in self.codes
+        }
 
-        return self.func_dict[func](code, error, mag, propagation, **kwargs)
 
-    def _initiate_func_dict(self):
-        """
-        This dictionary will need to be updated if/when additional error
-        functions are added to the model.
-        """
-        self.func_dict = {
-            'ABXY_TI1': ABXY_TI1,
-            'ABXY_TI2': ABXY_TI2,
-            'ABZ': ABZ,
-            'AMIL': AMIL,
-            'ASXY_TI1': ASXY_TI1,
-            'ASXY_TI2': ASXY_TI2,
-            'ASXY_TI3': ASXY_TI3,
-            'ASZ': ASZ,
-            'DBH': DBH,
-            'AZ': AZ,
-            'DREF': DREF,
-            'DSF': DSF,
-            'DST': DST,
-            'MBXY_TI1': MBXY_TI1,
-            'MBXY_TI2': MBXY_TI2,
-            'MBZ': MBZ,
-            'MSXY_TI1': MSXY_TI1,
-            'MSXY_TI2': MSXY_TI2,
-            'MSXY_TI3': MSXY_TI3,
-            'MSZ': MSZ,
-            'SAG': SAG,
-            'XYM1': XYM1,
-            'XYM2': XYM2,
-            'XYM3': XYM3,
-            'XYM4': XYM4,
-            'SAGE': SAGE,
-            'XCL': XCL,  # requires an exception
-            'XYM3L': XYM3L,  # looks like there's a mistake in the ISCWSA model
-            'XYM4L': XYM4L,
-        }
+def _station(value, index):
+    """
+    Returns the header value at the station index, since the header values
+    of a batch of well bores are arrays of the value at each station.
+    """
+    return value[index] if np.ndim(value) else value
 
 
 # error functions #
@@ -157,11 +173,11 @@ def ABXY_TI1(
     code, error, mag=0.0040, propagation='systematic', NEV=True, **kwargs
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = -cos(error.survey_rad[:, 1]) / error.survey.header.G
+    dpde[:, 1] = -error.geometry.cos_inc / error.survey.header.G
     dpde[:, 2] = (
-        cos(error.survey_rad[:, 1])
+        error.geometry.cos_inc
         * tan(error.survey.header.dip)
-        * sin(error.survey.azi_mag_rad)
+        * error.sin_azi_mag
     ) / error.survey.header.G
     e_DIA = dpde * mag
 
@@ -178,7 +194,7 @@ def ABXY_TI2(
                 (
                     tan(-(error.survey_rad[:, 1]) + (pi/2))
                     - tan(error.survey.header.dip)
-                    * cos(error.survey.azi_mag_rad)
+                    * error.cos_azi_mag
                 ) / error.survey.header.G
             ),
             posinf=0.0,
@@ -195,56 +211,49 @@ def ABXY_TI2(
         e_NEV = error._e_NEV(e_DIA)
         n = np.array(
             0.5 * error.drdp_sing['double_delta_md']
-            * -sin(error.drdp_sing['azi2']) * mag
+            * -error.geometry.sin_azi * mag
         ) / error.survey.header.G
         e = np.array(
             0.5 * error.drdp_sing['double_delta_md']
-                * cos(error.drdp_sing['azi2']) * mag
+                * error.geometry.cos_azi * mag
             ) / error.survey.header.G
         v = np.zeros_like(n)
-        e_NEV_sing = np.vstack(
-            (
-                np.zeros((1, 3)),
-                np.stack((n, e, v), axis=-1),
-                np.zeros((1, 3))
-            )
-        )
+        e_NEV_sing = np.stack((n, e, v), axis=-1)
         if error.error_model.split('_')[-1] == 'rev5':
-            e_NEV_sing[1, 1] = (
+            # the second station of each well bore that has a third
+            i = error.starts + 1
+            i = i[i < error.ends]
+            e_NEV_sing[i, 1] = (
                 (
-                    error.survey.md[2]
-                    + error.survey.md[1]
-                    - 2 * error.survey.md[0]
+                    error.survey.md[i + 1]
+                    + error.survey.md[i]
+                    - 2 * error.survey.md[i - 1]
                 ) / 2
-                * mag * cos(error.survey.azi_true_rad[1])
-                / error.survey.header.G
+                * mag * error.geometry.cos_azi[i]
+                / _station(error.survey.header.G, i)
             )
         e_NEV[sing] = e_NEV_sing[sing]
 
         e_NEV_star = error._e_NEV_star(e_DIA)
         n = np.array(
             0.5 * error.drdp_sing['delta_md']
-                * -sin(error.drdp_sing['azi2']) * mag
+                * -error.geometry.sin_azi * mag
             ) / error.survey.header.G
         e = np.array(
             0.5 * error.drdp_sing['delta_md']
-                * cos(error.drdp_sing['azi2']) * mag
+                * error.geometry.cos_azi * mag
             ) / error.survey.header.G
         v = np.zeros_like(n)
-        e_NEV_star_sing = np.vstack(
-            (
-                np.zeros((1, 3)),
-                np.stack((n, e, v), axis=-1),
-                np.zeros((1, 3))
-            )
-        )
+        e_NEV_star_sing = np.stack((n, e, v), axis=-1)
         if error.error_model.split('_')[-1] == 'rev5':
-            e_NEV_star_sing[1, 1] = (
-                (error.survey.md[1] - error.survey.md[0])
+            i = error.starts + 1
+            i = i[i <= error.ends]
+            e_NEV_star_sing[i, 1] = (
+                (error.survey.md[i] - error.survey.md[i - 1])
                 * mag
                 * (
-                    cos(error.survey.azi_true_rad[1])
-                    / error.survey.header.G
+                    error.geometry.cos_azi[i]
+                    / _station(error.survey.header.G, i)
                 )
             )
         e_NEV_star[sing] = e_NEV_star_sing[sing]
@@ -256,10 +265,10 @@ def ABXY_TI2(
 
 def ABZ(code, error, mag=0.004, propagation='systematic', NEV=True, **kwargs):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = -sin(np.array(error.survey_rad)[:, 1]) / error.survey.header.G
+    dpde[:, 1] = -error.geometry.sin_inc / error.survey.header.G
     dpde[:, 2] = (
-        sin(np.array(error.survey_rad)[:, 1])
-        * tan(error.survey.header.dip) * sin(error.survey.azi_mag_rad)
+        error.geometry.sin_inc
+        * tan(error.survey.header.dip) * error.sin_azi_mag
     ) / error.survey.header.G
     e_DIA = dpde * mag
 
@@ -270,13 +279,11 @@ def ASXY_TI1(
     code, error, mag=0.0005, propagation='systematic', NEV=True, **kwargs
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = sin(
-        np.array(error.survey_rad)[:, 1]
-    ) * cos(np.array(error.survey_rad)[:, 1]) / sqrt(2)
+    dpde[:, 1] = error.geometry.sin_inc * error.geometry.cos_inc / sqrt(2)
     dpde[:, 2] = (
-        sin(np.array(error.survey_rad)[:, 1])
-        * -tan(error.survey.header.dip) * cos(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        error.geometry.sin_inc
+        * -tan(error.survey.header.dip) * error.geometry.cos_inc
+        * error.sin_azi_mag
     ) / sqrt(2)
     e_DIA = dpde * mag
 
@@ -287,13 +294,11 @@ def ASXY_TI2(
     code, error, mag=0.0005, propagation='systematic', NEV=True, **kwargs
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = sin(
-        np.array(error.survey_rad)[:, 1]
-    ) * cos(np.array(error.survey_rad)[:, 1]) / 2
+    dpde[:, 1] = error.geometry.sin_inc * error.geometry.cos_inc / 2
     dpde[:, 2] = (
-        sin(np.array(error.survey_rad)[:, 1])
-        * -tan(error.survey.header.dip) * cos(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        error.geometry.sin_inc
+        * -tan(error.survey.header.dip) * error.geometry.cos_inc
+        * error.sin_azi_mag
     ) / 2
     e_DIA = dpde * mag
 
@@ -305,9 +310,9 @@ def ASXY_TI3(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        sin(np.array(error.survey_rad)[:, 1])
-        * tan(error.survey.header.dip) * cos(error.survey.azi_mag_rad)
-        - cos(np.array(error.survey_rad)[:, 1])) / 2
+        error.geometry.sin_inc
+        * tan(error.survey.header.dip) * error.cos_azi_mag
+        - error.geometry.cos_inc) / 2
     e_DIA = dpde * mag
 
     return error._generate_error(code, e_DIA, propagation, NEV)
@@ -316,14 +321,14 @@ def ASXY_TI3(
 def ASZ(code, error, mag=0.0005, propagation='systematic', NEV=True, **kwargs):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 1] = (
-        -sin(np.array(error.survey_rad)[:, 1])
-        * cos(np.array(error.survey_rad)[:, 1])
+        -error.geometry.sin_inc
+        * error.geometry.cos_inc
     )
     dpde[:, 2] = (
-        sin(np.array(error.survey_rad)[:, 1])
+        error.geometry.sin_inc
         * tan(error.survey.header.dip)
-        * cos(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        * error.geometry.cos_inc
+        * error.sin_azi_mag
     )
     e_DIA = dpde * mag
 
@@ -335,8 +340,8 @@ def MBXY_TI1(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        -cos(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        -error.geometry.cos_inc
+        * error.sin_azi_mag
     ) / (error.survey.header.b_total * cos(error.survey.header.dip))
     e_DIA = dpde * mag
 
@@ -348,7 +353,7 @@ def MBXY_TI2(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        cos(error.survey.azi_mag_rad)
+        error.cos_azi_mag
         / (
             error.survey.header.b_total
             * cos(error.survey.header.dip)
@@ -362,8 +367,8 @@ def MBXY_TI2(
 def MBZ(code, error, mag=70.0, propagation='systematic', NEV=True, **kwargs):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        -sin(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        -error.geometry.sin_inc
+        * error.sin_azi_mag
     ) / (error.survey.header.b_total * cos(error.survey.header.dip))
     e_DIA = dpde * mag
 
@@ -375,13 +380,13 @@ def MSXY_TI1(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        sin(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        error.geometry.sin_inc
+        * error.sin_azi_mag
         * (
             tan(error.survey.header.dip)
-            * cos(np.array(error.survey_rad)[:, 1])
-            + sin(np.array(error.survey_rad)[:, 1])
-            * cos(error.survey.azi_mag_rad)
+            * error.geometry.cos_inc
+            + error.geometry.sin_inc
+            * error.cos_azi_mag
         ) / sqrt(2)
     )
     e_DIA = dpde * mag
@@ -394,13 +399,13 @@ def MSXY_TI2(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        sin(error.survey.azi_mag_rad) * (
+        error.sin_azi_mag * (
             tan(error.survey.header.dip)
-            * sin(np.array(error.survey_rad)[:, 1])
-            * cos(np.array(error.survey_rad)[:, 1])
-            - cos(np.array(error.survey_rad)[:, 1])
-            * cos(np.array(error.survey_rad)[:, 1])
-            * cos(error.survey.azi_mag_rad) - cos(error.survey.azi_mag_rad)
+            * error.geometry.sin_inc
+            * error.geometry.cos_inc
+            - error.geometry.cos_inc
+            * error.geometry.cos_inc
+            * error.cos_azi_mag - error.cos_azi_mag
         ) / 2
     )
     e_DIA = dpde * mag
@@ -413,12 +418,12 @@ def MSXY_TI3(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        cos(np.array(error.survey_rad)[:, 1])
-        * cos(error.survey.azi_mag_rad) * cos(error.survey.azi_mag_rad)
-        - cos(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad) * sin(error.survey.azi_mag_rad)
-        - tan(error.survey.header.dip) * sin(np.array(error.survey_rad)[:, 1])
-        * cos(error.survey.azi_mag_rad)
+        error.geometry.cos_inc
+        * error.cos_azi_mag * error.cos_azi_mag
+        - error.geometry.cos_inc
+        * error.sin_azi_mag * error.sin_azi_mag
+        - tan(error.survey.header.dip) * error.geometry.sin_inc
+        * error.cos_azi_mag
     ) / 2
     e_DIA = dpde * mag
 
@@ -430,10 +435,10 @@ def MSZ(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = -(
-        sin(np.array(error.survey_rad)[:, 1])
-        * cos(error.survey.azi_mag_rad)
-        + tan(error.survey.header.dip) * cos(np.array(error.survey_rad)[:, 1])
-    ) * sin(np.array(error.survey_rad)[:, 1]) * sin(error.survey.azi_mag_rad)
+        error.geometry.sin_inc
+        * error.cos_azi_mag
+        + tan(error.survey.header.dip) * error.geometry.cos_inc
+    ) * error.geometry.sin_inc * error.sin_azi_mag
     e_DIA = dpde * mag
 
     return error._generate_error(code, e_DIA, propagation, NEV)
@@ -475,8 +480,8 @@ def DBHR(
 def AMIL(code, error, mag=220.0, propagation='systematic', NEV=True, **kwargs):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 2] = (
-        -sin(np.array(error.survey_rad)[:, 1])
-        * sin(error.survey.azi_mag_rad)
+        -error.geometry.sin_inc
+        * error.sin_azi_mag
         / (error.survey.header.b_total * cos(error.survey.header.dip))
     )
     e_DIA = dpde * mag
@@ -488,7 +493,7 @@ def SAG(
     code, error, mag=0.00349, propagation='systematic', NEV=True, **kwargs
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = sin(np.array(error.survey_rad)[:, 1])
+    dpde[:, 1] = error.geometry.sin_inc
     e_DIA = dpde * mag
 
     return error._generate_error(code, e_DIA, propagation, NEV)
@@ -498,7 +503,7 @@ def SAGE(
     code, error, mag=0.00175, propagation='systematic', NEV=True, **kwargs
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = sin(np.array(error.survey_rad)[:, 1]) ** 0.25
+    dpde[:, 1] = error.geometry.sin_inc ** 0.25
     e_DIA = dpde * mag
 
     return error._generate_error(code, e_DIA, propagation, NEV)
@@ -508,7 +513,7 @@ def XYM1(
     code, error, mag=0.00175, propagation='systematic', NEV=True, **kwargs
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
-    dpde[:, 1] = np.absolute(sin(np.array(error.survey_rad)[:, 1]))
+    dpde[:, 1] = np.absolute(error.geometry.sin_inc)
     e_DIA = dpde * mag
 
     return error._generate_error(code, e_DIA, propagation, NEV)
@@ -530,15 +535,15 @@ def XYM3(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 1] = (
-        np.absolute(cos(np.array(error.survey_rad)[:, 1]))
-        * cos(error.survey.azi_true_rad)
+        np.absolute(error.geometry.cos_inc)
+        * error.geometry.cos_azi
     )
     with np.errstate(divide='ignore', invalid='ignore'):
         dpde[:, 2] = np.nan_to_num(
             -(
-                np.absolute(cos(np.array(error.survey_rad)[:, 1]))
-                * sin(error.survey.azi_true_rad)
-            ) / sin(np.array(error.survey_rad)[:, 1]),
+                np.absolute(error.geometry.cos_inc)
+                * error.geometry.sin_azi
+            ) / error.geometry.sin_inc,
             posinf=0.0,
             neginf=0.0
         )
@@ -552,28 +557,16 @@ def XYM3(
     else:
         e_NEV = error._e_NEV(e_DIA)
         n = np.array(0.5 * error.drdp_sing['double_delta_md'] * mag)
-        e = np.zeros(len(error.drdp_sing['double_delta_md']))
+        e = np.zeros_like(n)
         v = np.zeros_like(n)
-        e_NEV_sing = np.vstack(
-            (
-                np.zeros((1, 3)),
-                np.stack((n, e, v), axis=-1),
-                np.zeros((1, 3))
-            )
-        )
+        e_NEV_sing = np.stack((n, e, v), axis=-1)
         e_NEV[sing] = e_NEV_sing[sing]
 
         e_NEV_star = error._e_NEV_star(e_DIA)
         n = np.array(0.5 * error.drdp_sing['delta_md'] * mag)
-        e = np.zeros(len(error.drdp_sing['delta_md']))
+        e = np.zeros_like(n)
         v = np.zeros_like(n)
-        e_NEV_star_sing = np.vstack(
-            (
-                np.zeros((1, 3)),
-                np.stack((n, e, v), axis=-1),
-                np.zeros((1, 3))
-            )
-        )
+        e_NEV_star_sing = np.stack((n, e, v), axis=-1)
         e_NEV_star[sing] = e_NEV_star_sing[sing]
 
         return error._generate_error(
@@ -586,15 +579,15 @@ def XYM4(
 ):
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[:, 1] = np.absolute(
-        cos(np.array(error.survey_rad)[:, 1])
-    ) * sin(error.survey.azi_true_rad)
+        error.geometry.cos_inc
+    ) * error.geometry.sin_azi
     with np.errstate(divide='ignore', invalid='ignore'):
         dpde[:, 2] = np.nan_to_num(
             (
-                np.absolute(np.cos(np.array(error.survey_rad)[:, 1]))
-                * cos(error.survey.azi_true_rad)
+                np.absolute(error.geometry.cos_inc)
+                * error.geometry.cos_azi
             )
-            / sin(np.array(error.survey_rad)[:, 1]),
+            / error.geometry.sin_inc,
             posinf=0.0,
             neginf=0.0
             )
@@ -607,29 +600,17 @@ def XYM4(
         return error._generate_error(code, e_DIA, propagation, NEV)
     else:
         e_NEV = error._e_NEV(e_DIA)
-        n = np.zeros(len(error.drdp_sing['double_delta_md']))
         e = np.array(0.5 * error.drdp_sing['double_delta_md'] * mag)
+        n = np.zeros_like(e)
         v = np.zeros_like(n)
-        e_NEV_sing = np.vstack(
-            (
-                np.zeros((1, 3)),
-                np.stack((n, e, v), axis=-1),
-                np.zeros((1, 3))
-            )
-        )
+        e_NEV_sing = np.stack((n, e, v), axis=-1)
         e_NEV[sing] = e_NEV_sing[sing]
 
         e_NEV_star = error._e_NEV_star(e_DIA)
-        n = np.zeros(len(error.drdp_sing['delta_md']))
         e = np.array(0.5 * error.drdp_sing['delta_md'] * mag)
+        n = np.zeros_like(e)
         v = np.zeros_like(n)
-        e_NEV_star_sing = np.vstack(
-            (
-                np.zeros((1, 3)),
-                np.stack((n, e, v), axis=-1),
-                np.zeros((1, 3))
-            )
-        )
+        e_NEV_star_sing = np.stack((n, e, v), axis=-1)
         e_NEV_star[sing] = e_NEV_star_sing[sing]
 
         return error._generate_error(
@@ -660,16 +641,18 @@ def XCLA(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
 
     def manage_sing(error, kwargs):
         temp = np.absolute(
-            sin(error.survey.inc_rad[1:])
+            error.geometry.sin_inc[1:]
             * (((
                 error.survey.azi_true_rad[1:]
                 - error.survey.azi_true_rad[:-1]
                 + pi
             ) % (2 * pi)) - pi)
         )
-        temp[np.where(
-            error.survey.inc_rad < error.survey.header.vertical_inc_limit
-        )] = 0
+        # temp has no value for the last station
+        temp[
+            (error.survey.inc_rad < error.survey.header.vertical_inc_limit)
+            [:-1]
+        ] = 0
         return temp
 
     dpde[1:, 0] = (
@@ -681,8 +664,9 @@ def XCLA(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
                 * (error.survey.md[1:] - error.survey.md[0:-1])
             )
         ), axis=-1), axis=-1)
-        * -sin(error.survey.azi_true_rad[1:])
+        * -error.geometry.sin_azi[1:]
     )
+    dpde[error.starts] = 0
 
     dpde[1:, 1] = (
         (error.survey.md[1:] - error.survey.md[0:-1])
@@ -693,8 +677,9 @@ def XCLA(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
                 * (error.survey.md[1:] - error.survey.md[0:-1])
             )
         ), axis=-1), axis=-1)
-        * cos(error.survey.azi_true_rad[1:])
+        * error.geometry.cos_azi[1:]
     )
+    dpde[error.starts] = 0
 
     e_DIA = dpde * mag
 
@@ -716,8 +701,8 @@ def XCLH(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
                 * (error.survey.md[1:] - error.survey.md[0:-1])
             )
         ), axis=-1), axis=-1)
-        * cos(error.survey.inc_rad[1:])
-        * cos(error.survey.azi_true_rad[1:])
+        * error.geometry.cos_inc[1:]
+        * error.geometry.cos_azi[1:]
     )
 
     dpde[1:, 1] = (
@@ -731,8 +716,8 @@ def XCLH(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
                 * (error.survey.md[1:] - error.survey.md[0:-1])
             )
         ), axis=-1), axis=-1)
-        * cos(error.survey.inc_rad[1:])
-        * sin(error.survey.azi_true_rad[1:])
+        * error.geometry.cos_inc[1:]
+        * error.geometry.sin_azi[1:]
     )
 
     dpde[1:, 2] = (
@@ -746,8 +731,9 @@ def XCLH(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
                 * (error.survey.md[1:] - error.survey.md[0:-1])
             )
         ), axis=-1), axis=-1)
-        * -sin(error.survey.inc_rad[1:])
+        * -error.geometry.sin_inc[1:]
     )
+    dpde[error.starts] = 0
 
     e_DIA = dpde * mag
 
@@ -758,30 +744,31 @@ def XCLH(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
 
 def XYM3L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
     coeff = np.ones(len(error.survey.md) - 1)
-    coeff = np.amax(np.stack((
-        coeff,
-        sqrt(
-            10 / (error.survey.md[1:] - error.survey.md[:-1])
-        )
-    ), axis=-1), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coeff = np.amax(np.stack((
+            coeff,
+            sqrt(
+                10 / (error.survey.md[1:] - error.survey.md[:-1])
+            )
+        ), axis=-1), axis=-1)
 
     dpde = np.zeros((len(error.survey_rad), 3))
     dpde[1:, 1] = np.absolute(
-        cos(error.survey.inc_rad[1:])
-        * cos(error.survey.azi_true_rad[1:])
+        error.geometry.cos_inc[1:]
+        * error.geometry.cos_azi[1:]
         * coeff
     )
-    dpde[0, 1] = dpde[1, 1]
+    dpde[error.starts, 1] = dpde[error.starts + 1, 1]
 
     with np.errstate(divide='ignore', invalid='ignore'):
         dpde[1:, 2] = np.nan_to_num(
             (
                 -np.absolute(
-                    cos(error.survey.inc_rad[1:])
+                    error.geometry.cos_inc[1:]
                 )
                 * (
-                    sin(error.survey.azi_true_rad[1:])
-                    / sin(error.survey.inc_rad[1:])
+                    error.geometry.sin_azi[1:]
+                    / error.geometry.sin_inc[1:]
                 )
                 * coeff
             ),
@@ -789,7 +776,7 @@ def XYM3L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
             neginf=0
         )
 
-    dpde[0, 2] = dpde[1, 2]
+    dpde[error.starts, 2] = dpde[error.starts + 1, 2]
 
     e_DIA = dpde * mag
 
@@ -809,22 +796,27 @@ def XYM3L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
             ) / 2
             * mag
         )
-        e_NEV_sing[1, 0] = (
-            coeff[1]
+        # the second station of each well bore that has a third, since
+        # md[i + 1] would be in the next well bore of a batch
+        i, j = error.starts + 1, error.ends
+        i = i[i < j]
+        e_NEV_sing[i, 0] = (
+            coeff[i]
             * (
-                error.survey.md[2] + error.survey.md[1]
-                - 2 * error.survey.md[0]
+                error.survey.md[i + 1] + error.survey.md[i]
+                - 2 * error.survey.md[i - 1]
             ) / 2
             * mag
         )
-        e_NEV_sing[-1, 0] = (
-            coeff[-1]
+        e_NEV_sing[j, 0] = (
+            coeff[j - 1]
             * (
-                error.survey.md[-1]
-                - error.survey.md[-2]
+                error.survey.md[j]
+                - error.survey.md[j - 1]
             ) / 2
             * mag
         )
+        e_NEV_sing[error.starts] = 0
 
         e_NEV[sing] = e_NEV_sing[sing]
 
@@ -837,6 +829,7 @@ def XYM3L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
             ) / 2
             * mag
         )
+        e_NEV_star_sing[error.starts] = 0
 
         e_NEV_star[sing] = e_NEV_star_sing[sing]
 
@@ -848,20 +841,22 @@ def XYM3L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
 def XYM4L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
     propagation = 'random'
     coeff = np.ones(len(error.survey.md))
-    coeff[1:] = np.amax(np.stack((
-        coeff[1:],
-        sqrt(
-            10 / (error.survey.md[1:] - error.survey.md[:-1])
-        )
-    ), axis=-1), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coeff[1:] = np.amax(np.stack((
+            coeff[1:],
+            sqrt(
+                10 / (error.survey.md[1:] - error.survey.md[:-1])
+            )
+        ), axis=-1), axis=-1)
+    coeff[error.starts] = 1
 
     dpde = np.zeros((len(error.survey_rad), 3))
     with np.errstate(divide='ignore', invalid='ignore'):
         dpde[:, 2] = np.nan_to_num(
             np.absolute(
-                cos(error.survey.inc_rad)
-                * cos(error.survey.azi_true_rad)
-                / sin(error.survey.inc_rad)
+                error.geometry.cos_inc
+                * error.geometry.cos_azi
+                / error.geometry.sin_inc
                 * coeff
             ),
             posinf=0,
@@ -870,10 +865,10 @@ def XYM4L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
 
     dpde[:, 1] = (
         np.absolute(
-            cos(error.survey.inc_rad)
+            error.geometry.cos_inc
         )
         * (
-            sin(error.survey.azi_true_rad)
+            error.geometry.sin_azi
         )
         * coeff
     )
@@ -896,22 +891,26 @@ def XYM4L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
             ) / 2
             * mag
         )
-        e_NEV_sing[1, 1] = (
-            coeff[1]
+        i, j = error.starts + 1, error.ends
+        e_NEV_star_i = i[i <= j]
+        i = i[i < j]
+        e_NEV_sing[i, 1] = (
+            coeff[i]
             * (
-                error.survey.md[2] + error.survey.md[1]
-                - 2 * error.survey.md[0]
+                error.survey.md[i + 1] + error.survey.md[i]
+                - 2 * error.survey.md[i - 1]
             ) / 2
             * mag
         )
-        e_NEV_sing[-1, 1] = (
-            coeff[-1]
+        e_NEV_sing[j, 1] = (
+            coeff[j]
             * (
-                error.survey.md[-1]
-                - error.survey.md[-2]
+                error.survey.md[j]
+                - error.survey.md[j - 1]
             ) / 2
             * mag
         )
+        e_NEV_sing[error.starts] = 0
 
         e_NEV[sing] = e_NEV_sing[sing]
 
@@ -924,16 +923,52 @@ def XYM4L(code, error, mag=0.0167, propagation='random', NEV=True, **kwargs):
             ) / 2
             * mag
         )
-        e_NEV_star_sing[1, 1] = (
+        e_NEV_star_sing[e_NEV_star_i, 1] = (
             (
-                error.survey.md[1]
-                - error.survey.md[0]
+                error.survey.md[e_NEV_star_i]
+                - error.survey.md[e_NEV_star_i - 1]
             )
             * mag
         )
+        e_NEV_star_sing[error.starts] = 0
 
         e_NEV_star[sing] = e_NEV_star_sing[sing]
 
         return error._generate_error(
             code, e_DIA, propagation, NEV, e_NEV, e_NEV_star
         )
+
+
+# This dictionary will need to be updated if/when additional error functions
+# are added to the model.
+ERROR_FUNCTIONS = {
+    'ABXY_TI1': ABXY_TI1,
+    'ABXY_TI2': ABXY_TI2,
+    'ABZ': ABZ,
+    'AMIL': AMIL,
+    'ASXY_TI1': ASXY_TI1,
+    'ASXY_TI2': ASXY_TI2,
+    'ASXY_TI3': ASXY_TI3,
+    'ASZ': ASZ,
+    'DBH': DBH,
+    'AZ': AZ,
+    'DREF': DREF,
+    'DSF': DSF,
+    'DST': DST,
+    'MBXY_TI1': MBXY_TI1,
+    'MBXY_TI2': MBXY_TI2,
+    'MBZ': MBZ,
+    'MSXY_TI1': MSXY_TI1,
+    'MSXY_TI2': MSXY_TI2,
+    'MSXY_TI3': MSXY_TI3,
+    'MSZ': MSZ,
+    'SAG': SAG,
+    'XYM1': XYM1,
+    'XYM2': XYM2,
+    'XYM3': XYM3,
+    'XYM4': XYM4,
+    'SAGE': SAGE,
+    'XCL': XCL,  # requires an exception
+    'XYM3L': XYM3L,  # looks like there's a mistake in the ISCWSA model
+    'XYM4L': XYM4L,
+}
@@ -0,0 +1,276 @@
+import os
+from datetime import datetime
+
+import numpy as np
+
+"""
+welleng/magnetic
+----------------
+An offline, vectorized evaluator of the World Magnetic Model (WMM) for
+calculating the magnetic field at the surface location of a well without
+calling out to a web service.
+
+The model coefficients are the public domain WMM coefficient files published
+by NOAA NCEI and the British Geological Survey, bundled in welleng/data.
+"""
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+WMM_MODELS = {
+    2010.0: 'WMM_2010.COF',
+    2015.0: 'WMM_2015v2.COF',
+    2020.0: 'WMM_2020.COF',
+    2025.0: 'WMM_2025.COF',
+}
+
+# WGS84 ellipsoid and geomagnetic reference radius, in km
+A = 6378.137
+F = 1 / 298.257223563
+E2 = F * (2 - F)
+RE = 6371.2
+
+_coefficients = {}
+
+
+def load_wmm_coefficients(epoch):
+    """
+    Read a WMM coefficient file, caching the result so that the file is only
+    read once per session.
+
+    Parameters
+    ----------
+        epoch: float
+            The epoch of the model, a key of WMM_MODELS.
+
+    Returns
+    -------
+        coeffs: dict
+            The main field Gauss coefficients (g, h) in nT and their secular
+            variation (g_dot, h_dot) in nT/year as (n_max + 1, n_max + 1)
+            arrays indexed [n, m].
+    """
+    if epoch in _coefficients:
+        return _coefficients[epoch]
+
+    filename = os.path.join(DATA_DIR, WMM_MODELS[epoch])
+    with open(filename, 'r') as f:
+        lines = f.read().splitlines()
+
+    rows = []
+    for line in lines[1:]:
+        if line.startswith('9999'):
+            break
+        rows.append([float(v) for v in line.split()])
+    rows = np.array(rows)
+
+    n_max = int(rows[:, 0].max())
+    n, m = rows[:, :2].astype(int).T
+    coeffs = dict(epoch=epoch, n_max=n_max)
+    for i, key in enumerate(['g', 'h', 'g_dot', 'h_dot'], start=2):
+        arr = np.zeros((n_max + 1, n_max + 1))
+        arr[n, m] = rows[:, i]
+        coeffs[key] = arr
+
+    _coefficients[epoch] = coeffs
+
+    return coeffs
+
+
+def decimal_year(date):
+    """
+    Convert a date, or a list or array of dates, to decimal years.
+
+    Parameters
+    ----------
+        date: str, datetime or float or list or array of these
+            Either a YYYY-mm-dd string, a datetime object or a decimal year.
+            If None then today's date is used.
+
+    Returns
+    -------
+        year: (n) array of floats
+    """
+    if date is None:
+        date = datetime.today()
+    dates = np.array(date, dtype=object).reshape(-1)
+
+    years = []
+    for d in dates:
+        if isinstance(d, str):
+            d = datetime.strptime(d, '%Y-%m-%d')
+        if isinstance(d, datetime):
+            start = datetime(d.year, 1, 1)
+            days = (datetime(d.year + 1, 1, 1) - start).days
+            d = d.year + (d - start).total_seconds() / 86400 / days
+        years.append(float(d))
+
+    return np.array(years)
+
+
+def _get_epoch(year):
+    """
+    Returns the epoch of the model to use for each year, being the latest
+    model released on or before the year. Dates earlier than the first model
+    use the first model.
+    """
+    epochs = np.array(sorted(WMM_MODELS))
+    idx = np.clip(np.searchsorted(epochs, year, side='right') - 1, 0, None)
+
+    return epochs[idx]
+
+
+def _legendre(x, n_max):
+    """
+    Schmidt semi-normalized associated Legendre functions and their
+    derivatives with respect to latitude.
+
+    Parameters
+    ----------
+        x: (k) array of floats
+            The sine of the geocentric latitude.
+        n_max: int
+            The maximum degree of the model.
+
+    Returns
+    -------
+        P, dP: (n_max + 1, n_max + 1, k) arrays of floats indexed [n, m]
+    """
+    z = np.sqrt((1 - x) * (1 + x))
+    P = np.zeros((n_max + 1, n_max + 1, len(x)))
+    dP = np.zeros_like(P)
+    P[0, 0] = 1.
+
+    # Gauss normalized recursion
+    for n in range(1, n_max + 1):
+        for m in range(n + 1):
+            if n == m:
+                P[n, m] = z * P[n - 1, m - 1]
+                dP[n, m] = z * dP[n - 1, m - 1] + x * P[n - 1, m - 1]
+            elif n == 1 or m > n - 2:
+                P[n, m] = x * P[n - 1, m]
+                dP[n, m] = x * dP[n - 1, m] - z * P[n - 1, m]
+            else:
+                k = (
+                    ((n - 1) ** 2 - m ** 2)
+                    / ((2 * n - 1) * (2 * n - 3))
+                )
+                P[n, m] = x * P[n - 1, m] - k * P[n - 2, m]
+                dP[n, m] = (
+                    x * dP[n - 1, m] - z * P[n - 1, m] - k * dP[n - 2, m]
+                )
+
+    # convert to Schmidt semi-normalized
+    schmidt = np.zeros((n_max + 1, n_max + 1))
+    schmidt[0, 0] = 1.
+    for n in range(1, n_max + 1):
+        schmidt[n, 0] = schmidt[n - 1, 0] * (2 * n - 1) / n
+        for m in range(1, n + 1):
+            schmidt[n, m] = schmidt[n, m - 1] * np.sqrt(
+                (n - m + 1) * (2 if m == 1 else 1) / (n + m)
+            )
+    schmidt = schmidt.reshape(n_max + 1, n_max + 1, 1)
+
+    # sign change since the derivative is with respect to latitude
+    return (P * schmidt, -dP * schmidt)
+
+
+def _get_field_components(coeffs, lat, lon, alt, year):
+    """
+    Evaluate the model at geodetic latitude and longitude (radians) and
+    altitude above the ellipsoid (km), returning the north, east and down
+    components of the magnetic field in nT.
+    """
+    # geodetic to geocentric spherical coordinates
+    sin_lat = np.sin(lat)
+    rc = A / np.sqrt(1 - E2 * sin_lat ** 2)
+    p = (rc + alt) * np.cos(lat)
+    z = (rc * (1 - E2) + alt) * sin_lat
+    r = np.sqrt(p ** 2 + z ** 2)
+    lat_gc = np.arcsin(z / r)
+
+    dt = year - coeffs['epoch']
+    n_max = coeffs['n_max']
+    P, dP = _legendre(np.sin(lat_gc), n_max)
+
+    X, Y, Z = (np.zeros_like(lat) for _ in range(3))
+    for n in range(1, n_max + 1):
+        ratio = (RE / r) ** (n + 2)
+        for m in range(n + 1):
+            g = coeffs['g'][n, m] + dt * coeffs['g_dot'][n, m]
+            h = coeffs['h'][n, m] + dt * coeffs['h_dot'][n, m]
+            cos_m, sin_m = np.cos(m * lon), np.sin(m * lon)
+            X -= ratio * (g * cos_m + h * sin_m) * dP[n, m]
+            Y += ratio * (g * sin_m - h * cos_m) * m * P[n, m]
+            Z -= ratio * (g * cos_m + h * sin_m) * (n + 1) * P[n, m]
+
+    # avoid the singularity at the geographic poles
+    cos_lat_gc = np.cos(lat_gc)
+    Y = np.where(
+        np.absolute(cos_lat_gc) > 1e-10, Y / np.where(
+            cos_lat_gc == 0, 1., cos_lat_gc
+        ), 0.
+    )
+
+    # rotate from geocentric to geodetic
+    psi = lat_gc - lat
+    north = X * np.cos(psi) - Z * np.sin(psi)
+    down = X * np.sin(psi) + Z * np.cos(psi)
+
+    return (north, Y, down)
+
+
+def get_magnetic_field(latitude, longitude, altitude=0., date=None):
+    """
+    Calculate the magnetic field with the World Magnetic Model, vectorized
+    over arrays of locations and dates.
+
+    Parameters
+    ----------
+        latitude: float or (n) array of floats
+            The geodetic latitude in degrees.
+        longitude: float or (n) array of floats
+            The longitude in degrees.
+        altitude: float or (n) array of floats (default: 0.)
+            The height above the ellipsoid in km (the same convention as
+            the BGS web service's altitude).
+        date: str, datetime, float or (n) list or array of these
+            (default: None)
+            YYYY-mm-dd strings, datetime objects or decimal years. If None
+            then today's date is used. Dates before the first bundled model
+            use the first model and dates beyond the validity of the latest
+            model are extrapolated with its secular variation.
+
+    Returns
+    -------
+        b_total: (n) array of floats
+            The total magnetic field intensity in nT.
+        inclination: (n) array of floats
+            The angle of the magnetic field below the horizontal in degrees,
+            positive downwards.
+        declination: (n) array of floats
+            The angle from true north to magnetic north in degrees,
+            positive east.
+    """
+    year = decimal_year(date)
+    lat, lon, alt, year = np.broadcast_arrays(
+        np.radians(np.array(latitude, dtype=float)).reshape(-1),
+        np.radians(np.array(longitude, dtype=float)).reshape(-1),
+        np.array(altitude, dtype=float).reshape(-1),
+        year
+    )
+
+    epochs = _get_epoch(year)
+    north, east, down = (np.zeros(len(lat)) for _ in range(3))
+    for epoch in np.unique(epochs):
+        mask = epochs == epoch
+        north[mask], east[mask], down[mask] = _get_field_components(
+            load_wmm_coefficients(epoch),
+            lat[mask], lon[mask], alt[mask], year[mask]
+        )
+
+    horizontal = np.sqrt(north ** 2 + east ** 2)
+    b_total = np.sqrt(horizontal ** 2 + down ** 2)
+    inclination = np.degrees(np.arctan2(down, horizontal))
+    declination = np.degrees(np.arctan2(east, north))
+
+    return (b_total, inclination, declination)
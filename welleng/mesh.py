@@ -63,7 +63,18 @@ class WellMesh:
         self._align_verts()
 
         self._get_faces()
-        self._make_trimesh()
+        self._mesh = None
+        self._section_faces = None
+
+    @property
+    def mesh(self):
+        '''
+        The trimesh.Trimesh object of the well bore, which is only
+        constructed (and validated) when it's first used.
+        '''
+        if self._mesh is None:
+            self._make_trimesh()
+        return self._mesh
 
     # Helper functions #
     def _get_faces(self):
@@ -71,64 +82,9 @@ class WellMesh:
         Construct a mesh of triangular faces (n,3) on the well bore
         uncertainty edge for the given well bore.
         '''
-        step = self.n_verts
-        faces = []
-        total_verts = len(self.vertices.reshape(-1, 3))
-        rows = int(total_verts / self.n_verts)
-
-        # make first end
-        B = np.arange(1, step - 1, 1)
-        C = np.arange(2, step, 1)
-        A = np.zeros_like(B)
-        temp = np.array([A, B, C]).T
-        faces.extend(temp.tolist())
-
-        # make cylinder
-        temp = ([np.array([
-            step, 0, step - 1, 2 * step - 1, step, step - 1
-        ])])
-        # TODO: this can probably be vectorized to speed it up
-        for row in range(0, rows - 1):
-            verts = row * self.n_verts
-
-            A_start = verts
-            B_start = verts + step
-            C_start = verts + step + 1
-            D_start = verts + 1
-
-            A_stop = verts + step - 1
-            B_stop = verts + step + step - 1
-            C_stop = verts + step + step
-            D_stop = verts + step
-
-            A = np.arange(A_start, A_stop)
-            B = np.arange(B_start, B_stop)
-            C = np.arange(C_start, C_stop)
-            D = np.arange(D_start, D_stop)
-
-            temp.extend(np.array([C, D, A, B, C, A]).T)
-
-            last = np.array([
-                B_start,
-                A_start,
-                D_stop - 1,
-                C_stop - 1,
-                B_start,
-                D_stop - 1
-            ])
-
-            temp.extend([last])
-
-        faces.extend(np.stack(temp, axis=0).reshape(-1, 3).tolist())
-
-        # make final end
-        B = np.arange(total_verts - step + 1, (total_verts - 1), 1)
-        C = np.arange(total_verts - step + 2, (total_verts), 1)
-        A = np.full_like(B, total_verts - step)
-        temp = np.array([A, B, C]).T
-        faces.extend(temp.tolist())
-
-        self.faces = faces
+        rows = int(len(self.vertices.reshape(-1, 3)) / self.n_verts)
+
+        self.faces = get_faces(rows, self.n_verts).tolist()
 
     def _get_vertices(
         self,
@@ -194,7 +150,9 @@ class WellMesh:
             z = np.zeros_like(f)
             vertices = np.stack((f, g, z), axis=-1)
 
-        vertices = HLA_to_NEV(self.s.survey_rad, vertices, cov=False)
+        vertices = HLA_to_NEV(
+            self.s.survey_rad, vertices, cov=False, trans=self.s.transform
+        )
 
         self.vertices = (
             vertices
@@ -278,7 +236,89 @@ class WellMesh:
         )
 
         # self.mesh = fix_mesh(mesh)
-        self.mesh = mesh
+        self._mesh = mesh
+
+    def get_section(self, i):
+        '''
+        Construct a trimesh.Trimesh object of the section of the well bore
+        between survey stations i and i + 1 from the vertices of the well
+        bore mesh, rather than meshing a slice of the survey.
+        '''
+        if self._section_faces is None:
+            self._get_section_faces()
+
+        return trimesh.Trimesh(
+            vertices=self.vertices[i:i + 2].reshape(-1, 3),
+            faces=self._section_faces[i],
+            process=False,
+            validate=False,
+        )
+
+    def _get_section_faces(self):
+        '''
+        The faces of each section (two consecutive ellipses) of the well
+        bore mesh, wound so that their normals point away from the center of
+        the section, which is what validating each section mesh would do.
+        '''
+        faces = get_faces(2, self.n_verts)
+        vertices = np.stack(
+            (self.vertices[:-1], self.vertices[1:]), axis=1
+        ).reshape(len(self.vertices) - 1, -1, 3)
+
+        triangles = vertices[:, faces]
+        normals = np.cross(
+            triangles[:, :, 1] - triangles[:, :, 0],
+            triangles[:, :, 2] - triangles[:, :, 0]
+        )
+        outwards = np.einsum(
+            'ijk,ijk->ij',
+            normals,
+            triangles.mean(axis=2) - vertices.mean(axis=1, keepdims=True)
+        ) >= 0
+
+        self._section_faces = np.where(
+            outwards[..., None], faces, faces[:, [0, 2, 1]]
+        )
+
+
+def get_faces(rows, n_verts):
+    """
+    Construct the triangular faces of a well bore mesh, closed at both
+    ends, from rows of n_verts vertices around the uncertainty edge.
+
+    Parameters
+    ----------
+        rows: int
+            The number of rows (survey stations) of vertices.
+        n_verts: int
+            The number of vertices in each row.
+
+    Returns
+    -------
+        faces: (k,3) array of ints
+    """
+    step = n_verts
+    total_verts = rows * n_verts
+
+    # make first end
+    B = np.arange(1, step - 1)
+    first = np.array([np.zeros_like(B), B, B + 1]).T
+
+    # make cylinder
+    A = np.arange(step - 1)
+    row = np.vstack((
+        np.array([A + step + 1, A + 1, A, A + step, A + step + 1, A]).T,
+        [[step, 0, step - 1, 2 * step - 1, step, step - 1]]
+    )).reshape(-1, 3)
+    cylinder = (
+        row + np.arange(rows - 1).reshape(-1, 1, 1) * n_verts
+    ).reshape(-1, 3)
+
+    # make final end
+    B = np.arange(total_verts - step + 1, total_verts - 1)
+    final = np.array([np.full_like(B, total_verts - step), B, B + 1]).T
+
+    return np.vstack((first, cylinder, final))
 
 
 def make_trimesh_scene(data):
@@ -410,7 +450,7 @@ def sliced_mesh(
             i -= step
 
         # slice a well section and create section survey
-        s = slice_survey(survey, i, j)
+        s = slice_survey(survey, i, j, view=True)
 
         # generate a mesh for the section slice
         m = WellMesh(
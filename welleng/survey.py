@@ -1,22 +1,33 @@
+import hashlib
 import numpy as np
 import math
-from magnetic_field_calculator import MagneticFieldCalculator
+from copy import copy
 from datetime import datetime
+from types import SimpleNamespace
 
 from .utils import (
+    Geometry,
     MinCurve,
     get_nev,
-    get_vec,
     get_angles,
+    interpolate_arc,
     HLA_to_NEV,
     NEV_to_HLA,
     get_xyz
 )
 
 from welleng.error import ErrorModel, ERROR_MODELS
+from welleng.magnetic import get_magnetic_field
 from welleng.exchange.wbp import TurnPoint
 
 AZI_REF = ["true", "magnetic", "grid"]
+MAG_SOURCES = ["wmm", "bgs"]
+
+# the header attributes that the positions and covariances depend on
+FINGERPRINT_HEADER = [
+    "G", "b_total", "dip", "declination", "convergence", "azi_reference",
+    "vertical_inc_limit", "depth_unit"
+]
 
 
 class SurveyHeader:
@@ -36,7 +47,8 @@ class SurveyHeader:
         vertical_inc_limit=0.0001,
         deg=True,
         depth_unit='meters',
-        surface_unit='meters'
+        surface_unit='meters',
+        mag_source="wmm"
     ):
         """
         A class for storing header information about a well.
@@ -64,16 +76,16 @@ class SurveyHeader:
             b_total: float (default: None)
                 The gravitation field strength in nT. If left default, then
                 the value is calculated from the longitude, latitude, altitude
-                and survey_data properties using the magnetic_field_calculator.
+                and survey_data properties using the mag_source model.
             dip: float (default: None)
                 The dip (inclination) of the magnetic field relative to the
                 earth's horizontal. If left default, then the value is
-                calculated using the magnetic_field_calculator. The unit (deg
+                calculated using the mag_source model. The unit (deg
                 of rad) is determined by the deg property.
             declination: float (default: None)
                 The angle between true north and magnetic north at the well
                 location. If left default, then the value is calculated
-                using the magnetic_field_calculator.
+                using the mag_source model.
             convergence: float (default: 0)
                 The angle of convergence between the projection meridian and
                 the line from true north through the location of the well.
@@ -95,12 +107,20 @@ class SurveyHeader:
             surface_unit: string (default: "feet")
                 The unit of distance for the survey data, either "meters" or
                 "feet".
+            mag_source: string (default: "wmm")
+                The source of any magnetic field values not provided, either
+                "wmm" to calculate them locally with the bundled World
+                Magnetic Model (see welleng.magnetic) or "bgs" to request
+                them from the BGS web service with the
+                magnetic_field_calculator package. The field is not
+                evaluated when b_total, dip and declination are all provided.
         """
         if latitude is not None:
             assert 90 >= latitude >= -90, "latitude out of bounds"
         if longitude is not None:
             assert 180 >= longitude >= -180, "longitude out of bounds"
         assert azi_reference in AZI_REF
+        assert mag_source in MAG_SOURCES, "unrecognized mag_source"
 
         self._validate_date(survey_date)
         self.name = name
@@ -118,13 +138,55 @@ class SurveyHeader:
         self.surface_unit = get_unit(surface_unit)
         self.G = G
         self.azi_reference = azi_reference
+        self.mag_source = mag_source
 
         self._get_mag_data(deg)
 
     def _get_mag_data(self, deg):
         """
-        Initiates b_total if provided, else caclulates a value.
+        Initiates b_total, dip and declination if provided, else calculates
+        the missing values from the mag_source.
         """
+        if None in (self.b_total, self.dip, self.declination):
+            if self.mag_source == "bgs":
+                b_total, dip, declination = self._get_bgs_mag_data()
+            else:
+                b_total, dip, declination = (
+                    float(v[0]) for v in get_magnetic_field(
+                        self.latitude, self.longitude, self.altitude,
+                        self.survey_date
+                    )
+                )
+            self._set_mag_data(b_total, -dip, declination, deg)
+
+        if deg:
+            self.dip = math.radians(self.dip)
+            self.declination = math.radians(self.declination)
+            self.convergence = math.radians(self.convergence)
+            self.vertical_inc_limit = math.radians(
+                self.vertical_inc_limit
+            )
+
+    def _set_mag_data(self, b_total, dip, declination, deg):
+        """
+        Assigns the calculated magnetic field values (b_total in nT, dip and
+        declination in degrees) to any that were not provided.
+        """
+        if self.b_total is None:
+            self.b_total = b_total
+        if self.dip is None:
+            self.dip = dip if deg else math.radians(dip)
+        if self.declination is None:
+            self.declination = (
+                declination if deg else math.radians(declination)
+            )
+
+    def _get_bgs_mag_data(self):
+        """
+        Requests the magnetic field values from the BGS web service.
+        """
+        from magnetic_field_calculator import MagneticFieldCalculator
+
         calculator = MagneticFieldCalculator()
         try:
             result = calculator.calculate(
@@ -138,29 +200,14 @@ class SurveyHeader:
                 latitude=self.latitude,
                 longitude=self.longitude,
                 altitude=self.altitude,
-                date=self._get_date(date=None)
+                date=datetime.today().strftime('%Y-%m-%d')
             )
 
-        if self.b_total is None:
-            self.b_total = result['field-value']['total-intensity']['value']
-            if not deg:
-                self.b_total = math.radians(self.b_total)
-        if self.dip is None:
-            self.dip = -result['field-value']['inclination']['value']
-            if not deg:
-                self.dip = math.radians(self.dip)
-        if self.declination is None:
-            self.declination = result['field-value']['declination']['value']
-            if not deg:
-                self.declination = math.radians(self.declination)
-
-        if deg:
-            self.dip = math.radians(self.dip)
-            self.declination = math.radians(self.declination)
-            self.convergence = math.radians(self.convergence)
-            self.vertical_inc_limit = math.radians(
-                self.vertical_inc_limit
-            )
+        return (
+            result['field-value']['total-intensity']['value'],
+            result['field-value']['inclination']['value'],
+            result['field-value']['declination']['value']
+        )
 
     def _get_date(self, date):
         if date is None:
@@ -176,7 +223,205 @@ class SurveyHeader:
             raise ValueError("incorrect data format, should be YYYY-MM-DD")
 
 
+def make_survey_headers(
+    latitude, longitude, altitude=None, survey_date=None, names=None,
+    **kwargs
+):
+    """
+    Make a list of SurveyHeader objects for many well locations, calculating
+    the magnetic field for all of them in a single vectorized call to the
+    World Magnetic Model.
+
+    Parameters
+    ----------
+        latitude: (n) list or array of floats
+            The latitudes of the surface locations of the wells.
+        longitude: (n) list or array of floats
+            The longitudes of the surface locations of the wells.
+        altitude: float or (n) list or array of floats (default: None)
+            The altitudes of the surface locations. If left default (None)
+            then they will be assigned to 0.
+        survey_date: YYYY-mm-dd or (n) list of YYYY-mm-dd (default: None)
+            The dates on which the survey data were recorded. If left
+            default then the current date is assigned.
+        names: (n) list of strings (default: None)
+            The assigned names of the well bores.
+        kwargs:
+            Any other SurveyHeader parameters, applied to all the headers.
+
+    Returns
+    -------
+        headers: (n) list of welleng.survey.SurveyHeader objects
+    """
+    latitude = np.array(latitude, dtype=float).reshape(-1)
+    longitude = np.array(longitude, dtype=float).reshape(-1)
+    assert len(latitude) == len(longitude), "latitude and longitude mismatch"
+    n = len(latitude)
+    altitude = np.broadcast_to(
+        0. if altitude is None else np.array(altitude, dtype=float), n
+    )
+    if survey_date is None or isinstance(survey_date, str):
+        survey_date = [survey_date] * n
+    survey_date = [
+        datetime.today().strftime('%Y-%m-%d') if d is None else d
+        for d in survey_date
+    ]
+    names = [None] * n if names is None else names
+    assert len(survey_date) == len(names) == n, "input lengths mismatch"
+
+    b_total, inclination, declination = get_magnetic_field(
+        latitude, longitude, altitude, survey_date
+    )
+    dip = -inclination
+    if not kwargs.get('deg', True):
+        dip, declination = np.radians(dip), np.radians(declination)
+
+    return [
+        SurveyHeader(
+            name=names[i],
+            latitude=latitude[i],
+            longitude=longitude[i],
+            altitude=altitude[i],
+            survey_date=survey_date[i],
+            b_total=float(b_total[i]),
+            dip=float(dip[i]),
+            declination=float(declination[i]),
+            **kwargs
+        )
+        for i in range(n)
+    ]
+
+
+def _update_hash(h, key, value):
+    """
+    Add a named value, None, a string or anything that converts to an array
+    of floats, to a hashlib hash.
+    """
+    h.update(key.encode())
+    if value is None or isinstance(value, str):
+        h.update(repr(value).encode())
+    else:
+        arr = np.ascontiguousarray(value, dtype=float)
+        h.update(repr(arr.shape).encode())
+        h.update(arr.tobytes())
+
+
+class _Input:
+    """
+    Descriptor for a welleng.survey.Survey input attribute. Assigning a new
+    value clears the cache of derived attributes.
+    """
+    def __init__(self, convert=None):
+        self.convert = convert
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._inputs[self.name]
+
+    def __set__(self, obj, value):
+        if self.convert is not None:
+            value = self.convert(value)
+        obj._inputs[self.name] = value
+        obj._cache.clear()
+
+
+class _Derived:
+    """
+    Descriptor for a welleng.survey.Survey attribute that is derived from the
+    inputs. The value is calculated by the named method on first access and
+    cached until an input changes.
+
+    If the attribute can also be provided by the user (e.g. positions or
+    covariances), then assigning a value treats it as a new input, else the
+    assigned value is cached in place of the calculated value.
+    """
+    def __init__(self, method, provided=False):
+        self.method = method
+        self.provided = provided
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.name not in obj._cache:
+            getattr(obj, self.method)()
+        return obj._cache[self.name]
+
+    def __set__(self, obj, value):
+        if self.provided:
+            obj._inputs[self.name] = value
+            obj._cache.clear()
+        else:
+            obj._cache[self.name] = value
+
+
 class Survey:
+    # inputs
+    header = _Input()
+    unit = _Input()
+    deg = _Input()
+    md = _Input(np.array)
+    inc = _Input()
+    azi = _Input()
+    start_xyz = _Input()
+    start_nev = _Input()
+    start_cov_nev = _Input()
+    error_model = _Input()
+
+    # derived attributes, grouped by the method that calculates them
+    inc_rad = _Derived('_process_azi_ref')
+    inc_deg = _Derived('_process_azi_ref')
+    azi_grid_rad = _Derived('_process_azi_ref')
+    azi_grid_deg = _Derived('_process_azi_ref')
+    azi_true_rad = _Derived('_process_azi_ref')
+    azi_true_deg = _Derived('_process_azi_ref')
+    azi_mag_rad = _Derived('_process_azi_ref')
+    azi_mag_deg = _Derived('_process_azi_ref')
+
+    survey_deg = _Derived('_get_survey_deg')
+    survey_rad = _Derived('_get_survey_rad')
+    transform = _Derived('_get_transform')
+    geometry = _Derived('_get_geometry')
+
+    radius = _Derived('_get_radius', provided=True)
+
+    dogleg = _Derived('_min_curve')
+    rf = _Derived('_min_curve')
+    delta_md = _Derived('_min_curve')
+    dls = _Derived('_min_curve')
+    pos = _Derived('_min_curve')
+
+    x = _Derived('_get_xyz', provided=True)
+    y = _Derived('_get_xyz', provided=True)
+    z = _Derived('_get_xyz', provided=True)
+
+    n = _Derived('_get_nev', provided=True)
+    e = _Derived('_get_nev', provided=True)
+    tvd = _Derived('_get_nev', provided=True)
+
+    vec_xyz = _Derived('_get_vec', provided=True)
+    vec_nev = _Derived('_get_vec', provided=True)
+
+    curve_radius = _Derived('_get_toolface_and_rates')
+    toolface = _Derived('_get_toolface_and_rates')
+    turn_rate = _Derived('_get_toolface_and_rates')
+    build_rate = _Derived('_get_toolface_and_rates')
+    normals = _Derived('_get_toolface_and_rates')
+
+    err = _Derived('_get_errors')
+    cov_hla = _Derived('_get_errors', provided=True)
+    cov_nev = _Derived('_get_errors', provided=True)
+
+    # derived attributes whose value at the last survey station depends on
+    # the next survey station
+    _TAIL = ('curve_radius', 'toolface', 'turn_rate', 'build_rate')
+
     def __init__(
         self,
         md,
@@ -274,65 +519,64 @@ class Survey:
         Returns
         -------
         A welleng.survey.Survey object.
+
+        Notes
+        -----
+        Derived attributes (angles, minimum curvature data, positions,
+        vectors, toolface and rates, and the error model covariances) are
+        calculated the first time they are accessed and then cached.
+        Assigning a new value to an input attribute (e.g. md, inc, azi,
+        header or error_model) clears the cache, so that the derived
+        attributes are recalculated from the new inputs when next accessed.
+        Modifying an input array in place is not detected.
         """
+        self._inputs = {}
+        self._cache = {}
+        # the buffers of the arrays that are extended by append, keyed by
+        # the id of the _inputs or _cache dict and the name of the array
+        self._buffers = {}
+
         if header is None:
-            self.header = SurveyHeader()
+            header = SurveyHeader()
         else:
             assert isinstance(header, SurveyHeader)
-            self.header = header
-        assert unit == self.header.depth_unit, (
+        assert unit == header.depth_unit, (
             "inconsistent units with header"
         )
-        self.unit = unit
-        self.deg = deg
-        self.start_xyz = start_xyz
-        self.start_nev = start_nev
-        self.md = np.array(md)
-        self.start_cov_nev = start_cov_nev
-
-        self._process_azi_ref(inc, azi, deg)
-
-        self._get_radius(radius)
-
-        self.survey_deg = np.array(
-            [self.md, self.inc_deg, self.azi_grid_deg]
-        ).T
-        self.survey_rad = np.array(
-            [self.md, self.inc_rad, self.azi_grid_rad]
-        ).T
-
-        self.n = n
-        self.e = e
-        self.tvd = tvd
-        self.x = x
-        self.y = y
-        self.z = z
-        if vec is not None:
-            if nev:
-                self.vec_nev = vec
-                self.vec_xyz = get_xyz(vec)
-            else:
-                self.vec_xyz = vec
-                self.vec_nev = get_nev(vec)
-        else:
-            self.vec_nev, self.vec_xyz = vec, vec
-
-        self._min_curve(vec)
-        self._get_toolface_and_rates()
-
         # initialize errors
         # TODO: read this from a yaml file in errors
         error_models = ERROR_MODELS
         if error_model is not None:
             assert error_model in error_models, "Unrecognized error model"
-        self.error_model = error_model
 
-        self.cov_hla = cov_hla
-        self.cov_nev = cov_nev
+        vec_nev, vec_xyz = (vec, None) if nev else (None, vec)
 
-        self._get_errors()
+        self._inputs.update(
+            header=header,
+            unit=unit,
+            deg=deg,
+            md=np.array(md),
+            inc=inc,
+            azi=azi,
+            start_xyz=start_xyz,
+            start_nev=start_nev,
+            start_cov_nev=start_cov_nev,
+            error_model=error_model,
+            radius=radius,
+            n=n,
+            e=e,
+            tvd=tvd,
+            x=x,
+            y=y,
+            z=z,
+            vec_nev=vec_nev,
+            vec_xyz=vec_xyz,
+            cov_nev=cov_nev,
+            cov_hla=cov_hla,
+        )
 
-    def _process_azi_ref(self, inc, azi, deg):
+    def _process_azi_ref(self):
+        inc, azi, deg = self.inc, self.azi, self.deg
         if self.header.azi_reference == 'grid':
             self._make_angles(inc, azi, deg)
             self.azi_true_deg = (
@@ -399,23 +643,49 @@ class Survey:
             ]))
         )
 
-    def _get_radius(self, radius=None):
+    def _get_survey_deg(self):
+        self.survey_deg = np.array(
+            [self.md, self.inc_deg, self.azi_grid_deg]
+        ).T
+
+    def _get_survey_rad(self):
+        self.survey_rad = np.array(
+            [self.md, self.inc_rad, self.azi_grid_rad]
+        ).T
+
+    def _get_transform(self):
+        """
+        Get the transforms between the NEV and HLA coordinate systems at
+        each survey station.
+        """
+        self.transform = self.geometry.get_transform()
+
+    def _get_geometry(self):
+        """
+        Get the trigonometric functions of the survey angles (with grid
+        azimuths), which are shared by the derived attributes.
+        """
+        self.geometry = Geometry(self.inc_rad, self.azi_grid_rad, self.md)
+
+    def _get_radius(self):
+        radius = self._inputs['radius']
         if radius is None:
-            self.radius = np.full_like(self.md.astype(float), 0.3048)
+            radius = np.full_like(self.md.astype(float), 0.3048)
         elif np.array([radius]).shape[-1] == 1:
-            self.radius = np.full_like(self.md.astype(float), radius)
+            radius = np.full_like(self.md.astype(float), radius)
         else:
             assert len(radius) == len(self.md), "Check radius"
-            self.radius = np.array(radius)
+            radius = np.array(radius)
+        self._cache['radius'] = radius
 
-    def _min_curve(self, vec):
+    def _min_curve(self):
         """
-        Get the (x,y,z), (n,e,v), doglegs, rfs, delta_mds, dlss and
-        vectors for the well bore if they were not provided, using the
-        minimum curvature method.
+        Get the doglegs, rfs, delta_mds, dlss and positions for the well
+        bore using the minimum curvature method.
         """
         mc = MinCurve(
-            self.md, self.inc_rad, self.azi_grid_rad, self.start_xyz, self.unit
+            self.md, self.inc_rad, self.azi_grid_rad, self.start_xyz,
+            self.unit, geometry=self.geometry
         )
         self.dogleg = mc.dogleg
         self.rf = mc.rf
@@ -423,27 +693,49 @@ class Survey:
         self.dls = mc.dls
         self.pos = mc.poss
 
-        if self.x is None:
-            # self.x, self.y, self.z = (mc.poss + self.start_xyz).T
-            self.x, self.y, self.z = (mc.poss).T
-        if self.n is None:
-            self._get_nev()
-        if vec is None:
-            self.vec_xyz = get_vec(self.inc_rad, self.azi_grid_rad, deg=False)
-            self.vec_nev = get_vec(
-                self.inc_rad, self.azi_grid_rad, deg=False, nev=True
-            )
+    def _get_xyz(self):
+        """
+        Get the (x,y,z) coordinates if they were not provided, using the
+        minimum curvature method.
+        """
+        x, y, z = (self._inputs[k] for k in ('x', 'y', 'z'))
+        if x is None:
+            # x, y, z = (self.pos + self.start_xyz).T
+            x, y, z = self.pos.T
+        self._cache.update(x=x, y=y, z=z)
 
     def _get_nev(self):
-        self.n, self.e, self.tvd = get_nev(
-            np.array([
-                self.x,
-                self.y,
-                self.z
-            ]).T,
-            start_xyz=self.start_xyz,
-            start_nev=self.start_nev
-        ).T
+        """
+        Get the (n,e,v) coordinates if they were not provided, converting
+        them from the (x,y,z) coordinates.
+        """
+        n, e, tvd = (self._inputs[k] for k in ('n', 'e', 'tvd'))
+        if n is None:
+            n, e, tvd = get_nev(
+                np.array([
+                    self.x,
+                    self.y,
+                    self.z
+                ]).T,
+                start_xyz=self.start_xyz,
+                start_nev=self.start_nev
+            ).T
+        self._cache.update(n=n, e=e, tvd=tvd)
+
+    def _get_vec(self):
+        """
+        Get the (x,y,z) and (n,e,v) unit vectors from the inc and azi if
+        they were not provided.
+        """
+        vec_nev, vec_xyz = self._inputs['vec_nev'], self._inputs['vec_xyz']
+        if vec_nev is not None:
+            vec_xyz = get_xyz(vec_nev)
+        elif vec_xyz is not None:
+            vec_nev = get_nev(vec_xyz)
+        else:
+            vec_xyz = self.geometry.get_vec()
+            vec_nev = self.geometry.get_vec(nev=True)
+        self._cache.update(vec_nev=vec_nev, vec_xyz=vec_xyz)
 
     def _make_angles(self, inc, azi, deg=True):
         """
@@ -465,37 +757,279 @@ class Survey:
         assert error_model in ERROR_MODELS, "Undefined error model"
 
         self.error_model = error_model
-        self._get_errors()
 
         return self.err
 
+    def get_fingerprint(self):
+        """
+        Returns a hash of the survey data, start position, radii, error
+        model and the header's magnetic field and reference data, i.e. of
+        everything that the positions and covariances of the well bore are
+        calculated from. The hash is recalculated on each call, but as
+        for the cached attributes, input arrays must be re-assigned rather
+        than modified in place, else the derived attributes (and results
+        cached under the new fingerprint) are stale.
+
+        Returns
+        -------
+            fingerprint: str
+                The hex digest of the hash.
+        """
+        h = hashlib.sha1()
+        for key, value in sorted(self._inputs.items()):
+            if key != 'header':
+                _update_hash(h, key, value)
+        for key in FINGERPRINT_HEADER:
+            _update_hash(h, key, getattr(self.header, key))
+
+        return h.hexdigest()
+
+    def append(self, md, inc, azi):
+        """
+        Append one or more survey stations to the end of the well bore, e.g.
+        when receiving MWD surveys while drilling.
+
+        Only the derived attributes that have already been calculated are
+        extended, using the new survey stations and the last few stations of
+        the survey, so that the cost of an append does not grow with the
+        length of the well bore. Positions are extended from the last survey
+        station with the minimum curvature method and the covariances are
+        propagated from running sums of the error terms of each error source.
+
+        Parameters
+        ----------
+            md: float or (,m) list or array of floats
+                The measured depths of the new survey stations, which must be
+                deeper than the last survey station.
+            inc: float or (,m) list or array of floats
+                The inclinations of the new survey stations.
+            azi: float or (,m) list or array of floats
+                The azimuths of the new survey stations, in the same
+                azi_reference and angle unit as the survey.
+
+        Notes
+        -----
+        The new survey stations are assigned the radius of the last survey
+        station. The err attribute (the ErrorModel of the whole survey) is
+        not extended and is recalculated if it is accessed after an append.
+
+        The arrays are extended in place in buffers that double in size
+        when they're full, so streaming n survey stations is O(n) overall.
+        Arrays that were accessed before an append alias the survey: they
+        share memory with the extended arrays, so the values at the
+        previous last station that depend on the next station (the
+        covariances, toolface and rates) are overwritten in them too. Copy
+        any arrays whose values must be kept from before an append.
+        """
+        md, inc, azi = (
+            np.array(v, dtype=float).reshape(-1) for v in (md, inc, azi)
+        )
+        assert len(md) == len(inc) == len(azi), "md, inc and azi mismatch"
+        assert np.all(np.diff(md, prepend=self.md[-1]) > 0), (
+            "md must increase"
+        )
+        assert (
+            self._inputs['cov_nev'] is None
+            and self._inputs['cov_hla'] is None
+        ), "Can't append to a survey with provided covariances"
+
+        n = len(self.md)
+        start = max(0, n - 3)
+        k = n - start
+
+        md_window = np.concatenate((self.md[start:], md))
+        inc_window = np.concatenate(
+            (np.array(self.inc[start:], dtype=float), inc)
+        )
+        azi_window = np.concatenate(
+            (np.array(self.azi[start:], dtype=float), azi)
+        )
+
+        radius = self._inputs['radius']
+        radius_window = radius
+        if radius is not None and np.array([radius]).shape[-1] > 1:
+            radius_window = np.concatenate(
+                (radius[start:], np.full(len(md), radius[-1]))
+            )
+
+        # a survey of the new stations and the last stations of the survey,
+        # which are required to calculate the tail and error attributes
+        window = Survey(
+            md=md_window,
+            inc=inc_window,
+            azi=azi_window,
+            header=self.header,
+            radius=radius_window,
+            error_model=self.error_model,
+            deg=self.deg,
+            unit=self.unit,
+        )
+
+        # extend the positions from the last survey station
+        mc = MinCurve(
+            window.md[k - 1:], window.inc_rad[k - 1:],
+            window.azi_grid_rad[k - 1:], unit=self.unit
+        )
+        xyz = mc.poss[1:] + [self.x[-1], self.y[-1], self.z[-1]]
+        nev = get_nev(
+            mc.poss[1:], start_nev=[self.n[-1], self.e[-1], self.tvd[-1]]
+        )
+        for name, arr in zip(
+            ('x', 'y', 'z', 'n', 'e', 'tvd'), (*xyz.T, *nev.T)
+        ):
+            setattr(
+                window, name,
+                np.concatenate((getattr(self, name)[start:], arr))
+            )
+
+        # the geometry is recalculated if it's needed again
+        self._cache.pop('geometry', None)
+
+        if self._cache.get('cov_nev') is not None:
+            cov_nev, cov_hla = self._append_errors(window, k)
+            self._extend(self._cache, 'cov_nev', cov_nev, n - 1)
+            self._extend(self._cache, 'cov_hla', cov_hla, n - 1)
+            self._cache.pop('err', None)
+
+        for name in list(self._cache):
+            old = self._cache[name]
+            if name.startswith('_') or name in (
+                'err', 'cov_nev', 'cov_hla'
+            ) or old is None:
+                continue
+            new = getattr(window, name)
+            if name == 'normals':
+                self._extend(self._cache, name, new[k - 1:])
+            elif name in Survey._TAIL:
+                self._extend(self._cache, name, new[k - 1:], len(old) - 1)
+            elif name == 'pos':
+                self._extend(
+                    self._cache, name, new[k:] - new[k - 1] + old[-1]
+                )
+            else:
+                self._extend(self._cache, name, new[k:])
+
+        for name in ('x', 'y', 'z', 'n', 'e', 'tvd', 'vec_nev', 'vec_xyz'):
+            if self._inputs[name] is not None:
+                self._extend(self._inputs, name, getattr(window, name)[k:])
+        if radius is not None and np.array([radius]).shape[-1] > 1:
+            self._extend(self._inputs, 'radius', radius_window[k:])
+        for name, arr in (('md', md), ('inc', inc), ('azi', azi)):
+            self._extend(self._inputs, name, arr)
+
+    def _extend(self, store, name, new, n=None):
+        """
+        Append rows to an array in the _inputs or _cache dict, keeping the
+        first n rows (default all). The array is a view of a buffer whose
+        capacity is doubled when it's full, so that appending is amortized
+        O(len(new)) rather than copying the whole array.
+        """
+        old = store[name]
+        n = len(old) if n is None else n
+        size = n + len(new)
+        dtype = np.result_type(np.asarray(old[:1]), new)
+        key = (id(store), name)
+        buffer, view = self._buffers.get(key, (None, None))
+        if view is not old or len(buffer) < size or buffer.dtype != dtype:
+            old = np.asarray(old)
+            buffer = np.empty(
+                (max(size, 2 * len(old)),) + old.shape[1:], dtype=dtype
+            )
+            buffer[:n] = old[:n]
+        buffer[n:size] = new
+        view = buffer[:size]
+        self._buffers[key] = (buffer, view)
+        store[name] = view
+
+    def _append_errors(self, window, k):
+        """
+        Calculate the covariance matrices of the window survey from index
+        k - 1 (the last station of the survey, since its error terms can
+        depend on the station that follows it), adding the error terms of
+        each error source of the window to the running sums of the survey.
+        """
+        sums = self._cache.get('_error_sums')
+        if sums is None:
+            sums = {}
+            for code, error in self.err.errors.errors.items():
+                e_NEV = error.e_NEV[:-1]
+                if error.propagation == 'systematic':
+                    sums[code] = np.sum(e_NEV, axis=0)
+                else:
+                    sums[code] = np.einsum('ij,ik->jk', e_NEV, e_NEV)
+
+        cov_nev = np.zeros((len(window.md) - k + 1, 3, 3))
+        window_errors = ErrorModel(window, error_model=self.error_model)
+        for code, error in window_errors.errors.errors.items():
+            # the terms of the stations preceding each station
+            e_NEV = np.vstack((np.zeros((1, 3)), error.e_NEV[k - 1:-1]))
+            e_NEV_star = error.e_NEV_star[k - 1:]
+            if error.propagation == 'systematic':
+                sigma = e_NEV_star + sums[code] + np.cumsum(e_NEV, axis=0)
+                cov_nev += np.einsum('ij,ik->ijk', sigma, sigma)
+                sums[code] = sums[code] + np.sum(e_NEV, axis=0)
+            else:
+                cov = np.cumsum(np.einsum('ij,ik->ijk', e_NEV, e_NEV), axis=0)
+                cov_nev += (
+                    np.einsum('ij,ik->ijk', e_NEV_star, e_NEV_star)
+                    + sums[code] + cov
+                )
+                sums[code] = sums[code] + cov[-1]
+        self._cache['_error_sums'] = sums
+
+        if self.start_cov_nev is not None:
+            cov_nev += self.start_cov_nev
+            cov_hla = NEV_to_HLA(
+                None, cov_nev.T, trans=window.transform[k - 1:]
+            ).T
+        else:
+            cov_hla = NEV_to_HLA(
+                np.stack(
+                    (window.md, window.inc_rad, window.azi_true_rad), axis=-1
+                )[k - 1:],
+                cov_nev.T
+            ).T
+
+        return (cov_nev, cov_hla)
+
     def _get_errors(self):
         """
         Initiate a welleng.error.ErrorModel object and calculate the
         covariance matrices with the specified error model.
         """
+        err = None
+        cov_nev, cov_hla = self._inputs['cov_nev'], self._inputs['cov_hla']
         if self.error_model:
             # if self.error_model == "iscwsa_mwd_rev4":
-            self.err = ErrorModel(
+            err = ErrorModel(
                 self,
-                error_model=self.error_model
+                error_model=self.error_model,
+                lean=True
             )
-            self.cov_hla = self.err.errors.cov_HLAs.T
-            self.cov_nev = self.err.errors.cov_NEVs.T
+            cov_hla = err.errors.cov_HLAs.T
+            cov_nev = err.errors.cov_NEVs.T
         else:
-            if self.cov_nev is not None and self.cov_hla is None:
-                self.cov_hla = NEV_to_HLA(self.survey_rad, self.cov_nev.T).T
-            elif self.cov_nev is None and self.cov_hla is not None:
-                self.cov_nev = HLA_to_NEV(self.survey_rad, self.cov_hla.T).T
+            if cov_nev is not None and cov_hla is None:
+                cov_hla = NEV_to_HLA(
+                    self.survey_rad, cov_nev.T, trans=self.transform
+                ).T
+            elif cov_nev is None and cov_hla is not None:
+                cov_nev = HLA_to_NEV(
+                    self.survey_rad, cov_hla.T, trans=self.transform
+                ).T
             else:
                 pass
 
         if (
             self.start_cov_nev is not None
-            and self.cov_nev is not None
+            and cov_nev is not None
         ):
-            self.cov_nev += self.start_cov_nev
-            self.cov_hla = NEV_to_HLA(self.survey_rad, self.cov_nev.T).T
+            cov_nev = cov_nev + self.start_cov_nev
+            cov_hla = NEV_to_HLA(
+                self.survey_rad, cov_nev.T, trans=self.transform
+            ).T
+
+        self._cache.update(err=err, cov_nev=cov_nev, cov_hla=cov_hla)
 
     def _curvature_to_rate(self, curvature):
         with np.errstate(divide='ignore', invalid='ignore'):
@@ -514,8 +1048,7 @@ class Survey:
         Reference SPE-84246.
         theta is inc, phi is azi
         """
-        # split the survey
-        s = SplitSurvey(self)
+        g = self.geometry
 
         if self.unit == 'meters':
             x = 30
@@ -524,11 +1057,13 @@ class Survey:
 
         # this is lazy I know, but I'm using this mostly for flags
         with np.errstate(divide='ignore', invalid='ignore'):
+            sin_delta_azi = np.sin(g.delta_azi)
+            cos_delta_azi = np.cos(g.delta_azi)
             t1 = np.arctan2(
-                np.sin(s.inc2) * np.sin(s.delta_azi),
+                g.sin_inc[1:] * sin_delta_azi,
                 (
-                    np.sin(s.inc2) * np.cos(s.inc1) * np.cos(s.delta_azi)
-                    - np.sin(s.inc1) * np.cos(s.inc2)
+                    g.sin_inc[1:] * g.cos_inc[:-1] * cos_delta_azi
+                    - g.sin_inc[:-1] * g.cos_inc[1:]
                 )
             )
             t1 = np.nan_to_num(
@@ -537,10 +1072,10 @@ class Survey:
                 nan=np.nan
             )
             t2 = np.arctan2(
-                np.sin(s.inc1) * np.sin(s.delta_azi),
+                g.sin_inc[:-1] * sin_delta_azi,
                 (
-                    np.sin(s.inc2) * np.cos(s.inc1)
-                    - np.sin(s.inc1) * np.cos(s.inc2) * np.cos(s.delta_azi)
+                    g.sin_inc[1:] * g.cos_inc[:-1]
+                    - g.sin_inc[:-1] * g.cos_inc[1:] * cos_delta_azi
                 )
             )
             t2 = np.nan_to_num(
@@ -560,7 +1095,7 @@ class Survey:
             # self.toolface = np.concatenate((np.array([0.]), t1))
 
             curvature_turn = curvature_dls * (
-                np.sin(self.toolface) / np.sin(self.inc_rad)
+                np.sin(self.toolface) / g.sin_inc
             )
             self.turn_rate = self._curvature_to_rate(curvature_turn)
 
@@ -568,24 +1103,174 @@ class Survey:
             self.build_rate = self._curvature_to_rate(curvature_build)
 
         # calculate plan normals
-        n12 = np.cross(s.vec1_nev, s.vec2_nev)
+        n12 = np.cross(g.vec1_nev, g.vec2_nev)
         with np.errstate(divide='ignore', invalid='ignore'):
             self.normals = n12 / np.linalg.norm(n12, axis=1).reshape(-1, 1)
 
 
 def interpolate_md(survey, md):
     """
-    Interpolates a survey at a given measured depth.
+    Interpolates a survey at a given measured depth or at each of a list
+    or array of measured depths.
+
+    Parameters
+    ----------
+        survey: welleng.survey.Survey object
+        md: float or (,n) list or array of floats
+            The measured depth(s) at which to interpolate the survey.
+
+    Returns
+    -------
+        survey: welleng.survey.Survey object
+            If md is a float, a two station survey of the previous survey
+            station and the interpolated station (see interpolate_survey).
+            Otherwise a survey with a station at each of the provided
+            measured depths.
+    """
+    idx, x = _get_md_index(survey, md)
+
+    if np.ndim(md) == 0:
+        return interpolate_survey(survey, x=x[0], index=idx[0])
+
+    return _interpolate_to_survey(survey, idx, x)
+
+
+def _get_md_index(survey, md):
+    """
+    Returns the index of the survey station preceding each md and the
+    distance from that station.
     """
-    # get the closest survey stations
-    idx = np.searchsorted(survey.md, md, side="left") - 1
+    md = np.array(md, dtype=float).reshape(-1)
+    idx = np.clip(
+        np.searchsorted(survey.md, md, side="left") - 1,
+        0, len(survey.md) - 2
+    )
 
-    assert idx < len(survey.md), "The md is beyond the survey"
+    assert np.all(md <= survey.md[-1]), "The md is beyond the survey"
 
     x = md - survey.md[idx]
-    assert x >= 0
+    assert np.all(x >= 0), "The md is above the survey"
+
+    return (idx, x)
 
-    return interpolate_survey(survey, x=x, index=idx)
+
+def _interpolate_to_survey(survey, index, x):
+    """
+    Generates a welleng.survey.Survey object with a station interpolated at
+    each length x from the indexed survey stations of the survey, using the
+    interpolate_stations kernel. Covariances and radii are interpolated
+    linearly between survey stations unless the survey has an error model,
+    in which case the error model is applied to the new survey stations.
+    """
+    md, inc, azi, nev, _ = interpolate_stations(
+        **get_station_arrays(survey), index=index, x=x
+    )
+    n, e, tvd = nev.T
+    x_new, y_new, z_new = get_xyz(
+        nev, start_xyz=survey.start_xyz, start_nev=survey.start_nev
+    ).T
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mult = np.nan_to_num(x / survey.delta_md[index + 1])
+
+    def interpolate_linear(arr):
+        arr = np.array(arr)
+        mult_arr = mult.reshape((-1,) + (1,) * (arr.ndim - 1))
+        return arr[index] + mult_arr * (arr[index + 1] - arr[index])
+
+    cov_nev = None
+    if survey.error_model is None and survey.cov_nev is not None:
+        cov_nev = interpolate_linear(survey.cov_nev)
+
+    header = copy(survey.header)
+    header.azi_reference = 'grid'
+
+    return Survey(
+        md=md,
+        inc=inc,
+        azi=azi,
+        n=n,
+        e=e,
+        tvd=tvd,
+        x=x_new,
+        y=y_new,
+        z=z_new,
+        header=header,
+        radius=interpolate_linear(survey.radius),
+        cov_nev=cov_nev,
+        error_model=survey.error_model,
+        start_xyz=[x_new[0], y_new[0], z_new[0]],
+        start_nev=[n[0], e[0], tvd[0]],
+        deg=False,
+        unit=survey.unit,
+    )
+
+
+def interpolate_stations(
+    md, inc, azi, nev, vec_nev, dogleg, delta_md, index, x
+):
+    """
+    Interpolates points distance x from the indexed survey stations using
+    minimum curvature, operating directly on survey station arrays so that
+    no welleng.survey.Survey objects are constructed.
+
+    Parameters
+    ----------
+        md: (n) array of floats
+            The measured depths of the survey stations.
+        inc: (n) array of floats
+            The inclinations of the survey stations in radians.
+        azi: (n) array of floats
+            The grid azimuths of the survey stations in radians.
+        nev: (n,3) array of floats
+            The (n,e,v) positions of the survey stations.
+        vec_nev: (n,3) array of floats
+            The (n,e,v) unit vectors of the survey stations.
+        dogleg: (n) array of floats
+            The dogleg between each survey station and the previous one, as
+            per welleng.survey.Survey.dogleg.
+        delta_md: (n) array of floats
+            The change in md between each survey station and the previous
+            one, as per welleng.survey.Survey.delta_md.
+        index: int or (m) array of ints
+            The indexes of the survey stations from which to interpolate.
+        x: float or (m) array of floats
+            Length along the well path from the indexed survey stations to
+            perform the interpolations at. Must be less than the length to
+            the next survey station.
+
+    Returns
+    -------
+        md: (m) array of floats
+        inc: (m) array of floats
+            Interpolated inclinations in radians.
+        azi: (m) array of floats
+            Interpolated grid azimuths in radians.
+        nev: (m,3) array of floats
+        vec_nev: (m,3) array of floats
+    """
+    index, x = np.broadcast_arrays(
+        np.array(index, dtype=int).reshape(-1),
+        np.array(x, dtype=float).reshape(-1)
+    )
+    assert np.all(index < len(md) - 1), "Index is out of range"
+
+    nev, vec_nev = interpolate_arc(
+        pos1=np.array(nev)[index],
+        vec1=np.array(vec_nev)[index],
+        vec2=np.array(vec_nev)[index + 1],
+        dogleg=np.array(dogleg)[index + 1],
+        delta_md=np.array(delta_md)[index + 1],
+        x=x
+    )
+
+    # keep the station angles for tangent sections
+    inc_new, azi_new = get_angles(vec_nev, nev=True).T
+    tangent = np.array(dogleg)[index + 1] == 0
+    inc_new = np.where(tangent, np.array(inc)[index], inc_new)
+    azi_new = np.where(tangent, np.array(azi)[index], azi_new)
+
+    return (np.array(md)[index] + x, inc_new, azi_new, nev, vec_nev)
 
 
 def interpolate_survey(survey, x=0, index=0):
@@ -617,36 +1302,17 @@ def interpolate_survey(survey, x=0, index=0):
 
     assert index < len(survey.md) - 1, "Index is out of range"
 
-    # check if it's just a tangent section
-    if survey.dogleg[index + 1] == 0:
-        azi = survey.azi_grid_rad[index]
-        inc = survey.inc_rad[index]
-
-    else:
-        # get the vector
-        t1 = survey.vec_xyz[index]
-        t2 = survey.vec_xyz[index + 1]
-
-        total_dogleg = survey.dogleg[index + 1]
-
-        dogleg = x * (total_dogleg / survey.delta_md[index + 1])
-
-        t = (
-            (math.sin(total_dogleg - dogleg) / math.sin(total_dogleg)) * t1
-            + (math.sin(dogleg) / math.sin(total_dogleg)) * t2
-        )
-
-        t /= np.linalg.norm(t)
+    _, inc, azi, _, _ = interpolate_stations(
+        **get_station_arrays(survey), index=index, x=x
+    )
 
-        inc, azi = get_angles(t)[0]
-    
-    sh = survey.header
+    sh = copy(survey.header)
     sh.azi_reference = 'grid'
 
     s = Survey(
         md=np.array([survey.md[index], survey.md[index] + x]),
-        inc=np.array([survey.inc_rad[index], inc]),
-        azi=np.array([survey.azi_grid_rad[index], azi]),
+        inc=np.array([survey.inc_rad[index], inc[0]]),
+        azi=np.array([survey.azi_grid_rad[index], azi[0]]),
         start_xyz=np.array([survey.x, survey.y, survey.z]).T[index],
         start_nev=np.array([survey.n, survey.e, survey.tvd]).T[index],
         header=sh,
@@ -657,72 +1323,187 @@ def interpolate_survey(survey, x=0, index=0):
     return s
 
 
+def get_station_arrays(survey):
+    """
+    Returns a dictionary of the survey station arrays of a
+    welleng.survey.Survey object used by interpolate_stations.
+    """
+    return dict(
+        md=survey.md,
+        inc=survey.inc_rad,
+        azi=survey.azi_grid_rad,
+        nev=np.array([survey.n, survey.e, survey.tvd]).T,
+        vec_nev=survey.vec_nev,
+        dogleg=survey.dogleg,
+        delta_md=survey.delta_md,
+    )
+
+
 def interpolate_tvd(survey, tvd):
+    """
+    Interpolates a survey at a given true vertical depth or at each of a
+    list or array of true vertical depths, assuming that the tvd increases
+    along the well path.
+
+    Parameters
+    ----------
+        survey: welleng.survey.Survey object
+        tvd: float or (,n) list or array of floats
+            The tvd(s) at which to interpolate the survey.
+
+    Returns
+    -------
+        survey: welleng.survey.Survey object
+            If tvd is a float, a two station survey of the previous survey
+            station and the interpolated station (see interpolate_survey).
+            Otherwise a survey with a station at each of the provided tvds.
+    """
+    idx, x = _get_tvd_index(survey, tvd)
+
+    if np.ndim(tvd) == 0:
+        return interpolate_survey(survey, x=x[0], index=idx[0])
+
+    return _interpolate_to_survey(survey, idx, x)
+
+
+def _get_tvd_index(survey, tvd):
+    """
+    Returns the index of the survey station preceding each tvd and the
+    distance along the well path from that station to the tvd.
+    """
+    tvd = np.array(tvd, dtype=float).reshape(-1)
+    survey_tvd = np.array(survey.tvd)
     # find closest point assuming tvd is sorted list
-    idx = np.searchsorted(survey.tvd, tvd, side="right") - 1
-    pos1, pos2 = np.array([survey.n, survey.e, survey.tvd]).T[idx:idx + 2]
-    vec1, vec2 = survey.vec_nev[idx:idx + 2]
+    idx = np.clip(
+        np.searchsorted(survey_tvd, tvd, side="right") - 1,
+        0, len(survey.md) - 2
+    )
+    pos1 = np.array([survey.n, survey.e, survey.tvd]).T[idx]
+    vec1, vec2 = survey.vec_nev[idx], survey.vec_nev[idx + 1]
     dogleg = survey.dogleg[idx + 1]
     delta_md = survey.delta_md[idx + 1]
 
-    if np.isnan(dogleg):
-        return interpolate_survey(survey, x=0, index=idx)
-
-    if dogleg == 0:
-        x = (
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_hold = (
             (
-                tvd - survey.tvd[idx]
+                tvd - survey_tvd[idx]
             )
-            / (survey.tvd[idx + 1] - survey.tvd[idx])
+            / (survey_tvd[idx + 1] - survey_tvd[idx])
         ) * (survey.md[idx + 1] - survey.md[idx])
-    else:
-        m = np.array([0., 0., 1.])
-        a = np.dot(m, vec1) * np.sin(dogleg)
-        b = np.dot(m, vec1) * np.cos(dogleg) - np.dot(m, vec2)
-        # p = get_unit_vec(np.array([0., 0., tvd]) - pos1)
-        p = np.array([0., 0., tvd]) - pos1
+
+        a = vec1[:, 2] * np.sin(dogleg)
+        b = vec1[:, 2] * np.cos(dogleg) - vec2[:, 2]
+        p = tvd - pos1[:, 2]
         c = (
-            np.dot(m, p)
+            p
             * dogleg
             * np.sin(dogleg)
             / delta_md
         ) + b
 
-        d1 = 2 * np.arctan2(
-            (
-                a + (a ** 2 + b ** 2 - c ** 2) ** 0.5
-            ),
-            (
-                b + c
-            )
-        )
-        d2 = 2 * np.arctan2(
-            (
-                a - (a ** 2 + b ** 2 - c ** 2) ** 0.5
-            ),
-            (
-                b + c
-            )
-        )
+        # solve the tan half angle quadratic in a numerically stable form
+        q = a + np.copysign((a ** 2 + b ** 2 - c ** 2) ** 0.5, a)
+        d1 = 2 * np.arctan(q / (b + c))
+        d2 = 2 * np.arctan((c - b) / q)
 
-        assert d1 >= 0 or d2 >= 0
-        if d1 < 0:
-            d = d2
-        elif d2 < 0:
-            d = d1
-        else:
-            d = min(d1, d2)
+    # the circle crosses the tvd twice, so take the solution on the arc
+    curve = ~np.isnan(dogleg) & (dogleg != 0)
+    gap1 = np.maximum(0, np.maximum(-d1, d1 - dogleg))
+    gap2 = np.maximum(0, np.maximum(-d2, d2 - dogleg))
+    d = np.where((gap2 < gap1) | np.isnan(gap1), d2, d1)
+    assert np.all(~np.isnan(d) | ~curve), "The tvd is not on the survey"
 
-        x = d / dogleg * delta_md
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_curve = d / dogleg * delta_md
 
-    interpolated_survey = interpolate_survey(survey, x=x, index=idx)
+    x = np.where(
+        np.isnan(dogleg), 0., np.where(dogleg == 0, x_hold, x_curve)
+    )
+
+    return (idx, x)
 
-    return interpolated_survey
 
+class SurveyView:
+    # attributes with a value per survey station
+    _STATIONS = (
+        'md', 'inc_rad', 'inc_deg', 'azi_grid_rad', 'azi_grid_deg',
+        'azi_true_rad', 'azi_true_deg', 'azi_mag_rad', 'azi_mag_deg',
+        'survey_deg', 'survey_rad', 'transform', 'radius', 'pos', 'x', 'y',
+        'z', 'n', 'e', 'tvd', 'vec_xyz', 'vec_nev', 'curve_radius',
+        'toolface', 'turn_rate', 'build_rate', 'cov_hla', 'cov_nev'
+    )
+    # attributes describing the interval from the previous survey station,
+    # which take the (first station) value at the start of the view
+    _INTERVALS = dict(dogleg=0., delta_md=0., dls=0., rf=1.)
 
+    def __init__(self, survey, start, stop=None):
+        """
+        A read only view of a slice of a welleng.survey.Survey object, with
+        the same attributes as a Survey but backed by views into the arrays
+        of the parent survey, so that nothing is copied or recalculated.
+
+        Parameters
+        ----------
+            survey: welleng.survey.Survey object
+                The parent survey. Any derived attributes of the parent that
+                have not been calculated are calculated the first time they
+                are accessed through the view.
+            start: int
+                The start index of the slice.
+            stop: int (default: None)
+                The stop index of the slice, else start + 2.
+
+        Notes
+        -----
+        The covariances are those of the parent survey, so the view has no
+        error model. Interval attributes (dogleg, delta_md, dls and rf) are
+        reset at the first station of the view, as for a new Survey, which
+        requires a copy of these arrays when start > 0. The geometry is
+        calculated from the angles of the view on each access.
+        """
+        if stop is None:
+            stop = start + 2
+        start, stop, _ = slice(start, stop).indices(len(survey.md))
+        assert stop - start > 1, "Slice must have at least two stations"
+
+        self.survey = survey
+        self.start = start
+        self.stop = stop
+        self.header = survey.header
+        self.unit = survey.unit
+        self.deg = survey.deg
+        self.error_model = None
+        self.err = None
+        self.start_cov_nev = None
+
+    def __getattr__(self, name):
+        if name in SurveyView._STATIONS:
+            arr = getattr(self.survey, name)
+            return None if arr is None else arr[self.start:self.stop]
+        if name in SurveyView._INTERVALS:
+            arr = getattr(self.survey, name)[self.start:self.stop]
+            if self.start > 0:
+                arr = arr.copy()
+                arr[0] = SurveyView._INTERVALS[name]
+            return arr
+        if name in ('inc', 'azi'):
+            return np.asarray(
+                getattr(self.survey, name)
+            )[self.start:self.stop]
+        if name == 'normals':
+            return self.survey.normals[self.start:self.stop - 1]
+        if name == 'start_xyz':
+            return [self.x[0], self.y[0], self.z[0]]
+        if name == 'start_nev':
+            return [self.n[0], self.e[0], self.tvd[0]]
+        if name == 'geometry':
+            return Geometry(self.inc_rad, self.azi_grid_rad, self.md)
+        raise AttributeError(
+            f"'SurveyView' object has no attribute '{name}'"
+        )
 
 
-def slice_survey(survey, start, stop=None):
+def slice_survey(survey, start, stop=None, view=False):
     """
     Take a slice from a welleng.survey.Survey object.
 
@@ -734,12 +1515,19 @@ def slice_survey(survey, start, stop=None):
         stop: int (default: None)
             The stop index of the desired slice, else the remainder of
             the well bore TD is the default.
+        view: bool (default: False)
+            If True, a welleng.survey.SurveyView of the slice is returned,
+            which shares the arrays of the parent survey rather than
+            recalculating them.
 
     Returns
     -------
-        s: welleng.survey.Survey object
+        s: welleng.survey.Survey or welleng.survey.SurveyView object
             A survey object of the desired slice is returned.
     """
+    if view:
+        return SurveyView(survey, start, stop)
+
     if stop is None:
         stop = start + 2
     md, inc, azi = survey.survey_rad[start:stop].T
@@ -766,6 +1554,261 @@ def slice_survey(survey, start, stop=None):
     return s
 
 
+class SurveyBatch:
+    def __init__(
+        self,
+        md,
+        inc,
+        azi,
+        lengths,
+        headers=None,
+        start_xyz=[0., 0., 0.],
+        start_nev=[0., 0., 0.],
+        radius=None,
+        error_model=None,
+        deg=True,
+        unit="meters"
+    ):
+        """
+        A container for the survey data of many well bores, stored as
+        concatenated arrays with the number of survey stations of each well
+        bore, so that the minimum curvature data, positions and vectors of
+        all the well bores are calculated in single vectorized passes.
+
+        Parameters
+        ----------
+            md: (,n) list or array of floats
+                The concatenated measured depths of the well bores.
+            inc: (,n) list or array of floats
+                The concatenated inclinations of the well bores.
+            azi: (,n) list or array of floats
+                The concatenated azimuths of the well bores, in the
+                azi_reference of the header of each well bore.
+            lengths: (,m) list or array of ints
+                The number of survey stations of each of the m well bores.
+            headers: (,m) list of SurveyHeader objects (default: None)
+                The SurveyHeader of each well bore. If left default then a
+                SurveyHeader with the default properties is assigned to all
+                the well bores.
+            start_xyz: (,3) or (m,3) list or array of floats
+                (default: [0,0,0])
+                The start position of each well bore in (x,y,z) coordinates.
+            start_nev: (,3) or (m,3) list or array of floats
+                (default: [0,0,0])
+                The start position of each well bore in (n,e,v) coordinates.
+            radius: float or (,n) list or array of floats (default: None)
+                The radii of the well bores (see Survey).
+            error_model: str (default: None)
+                The error model assigned to the Survey of each well bore. If
+                provided then the covariance matrices of all the well bores
+                are calculated with a single evaluation of the error model
+                (the same as evaluating it for each well bore in turn).
+            deg: boolean (default: True)
+                Indicates whether the provided angles are in degrees
+                (True), else radians (False).
+            unit: str (default: 'meters')
+                Indicates whether the provided lengths and distances are
+                in 'meters' or 'feet'.
+
+        Returns
+        -------
+        A welleng.survey.SurveyBatch object.
+        """
+        self.lengths = np.array(lengths, dtype=int).reshape(-1)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)))
+        n_wells = len(self.lengths)
+
+        self.md = np.array(md, dtype=float)
+        self.inc = np.array(inc, dtype=float)
+        self.azi = np.array(azi, dtype=float)
+        assert len(self.md) == len(self.inc) == len(self.azi), (
+            "md, inc and azi mismatch"
+        )
+        assert len(self.md) == self.offsets[-1], (
+            "lengths inconsistent with survey data"
+        )
+        assert np.all(self.lengths > 1), (
+            "Each well bore must have at least two survey stations"
+        )
+
+        if headers is None:
+            headers = [SurveyHeader()] * n_wells
+        assert len(headers) == n_wells, "headers inconsistent with lengths"
+        for header in headers:
+            assert unit == header.depth_unit, (
+                "inconsistent units with header"
+            )
+        if error_model is not None:
+            assert error_model in ERROR_MODELS, "Unrecognized error model"
+
+        self.headers = headers
+        self.error_model = error_model
+        self.deg = deg
+        self.unit = unit
+        self.radius = radius
+        self.start_xyz, self.start_nev = (
+            np.broadcast_to(
+                np.array(start, dtype=float).reshape(-1, 3), (n_wells, 3)
+            )
+            for start in (start_xyz, start_nev)
+        )
+
+        self._get_angles()
+        self._min_curve()
+        self._get_nev()
+        self._get_vec()
+        self._get_errors()
+
+    def _get_angles(self):
+        """
+        Get the inclinations and grid azimuths in radians, applying the
+        declination and convergence of the header of each well bore.
+        """
+        correction = np.zeros(len(self.headers))
+        for i, header in enumerate(self.headers):
+            if header.azi_reference != 'grid':
+                correction[i] -= header.convergence
+            if header.azi_reference == 'magnetic':
+                correction[i] += header.declination
+
+        # the header values of each station, for the error model
+        self.header = SimpleNamespace(**{
+            name: np.repeat(
+                [getattr(header, name) for header in self.headers],
+                self.lengths
+            )
+            for name in (
+                'G', 'b_total', 'dip', 'declination', 'convergence',
+                'vertical_inc_limit'
+            )
+        })
+
+        if self.deg:
+            self.inc_rad = np.radians(self.inc)
+            self.azi_grid_rad = np.radians(self.azi)
+        else:
+            self.inc_rad = self.inc
+            self.azi_grid_rad = self.azi
+        self.azi_grid_rad = (
+            self.azi_grid_rad + np.repeat(correction, self.lengths)
+        )
+        self.azi_true_rad = self.azi_grid_rad + self.header.convergence
+        self.azi_mag_rad = self.azi_true_rad - self.header.declination
+
+    def _min_curve(self):
+        """
+        Get the doglegs, rfs, delta_mds, dlss and positions of all the well
+        bores with a single minimum curvature calculation.
+        """
+        self.geometry = Geometry(self.inc_rad, self.azi_grid_rad, self.md)
+        mc = MinCurve(
+            self.md, self.inc_rad, self.azi_grid_rad,
+            start_xyz=self.start_xyz, unit=self.unit, lengths=self.lengths,
+            geometry=self.geometry
+        )
+        self.dogleg = mc.dogleg
+        self.rf = mc.rf
+        self.delta_md = mc.delta_md
+        self.dls = mc.dls
+        self.pos = mc.poss
+        self.x, self.y, self.z = self.pos.T
+
+    def _get_nev(self):
+        """
+        Get the (n,e,v) coordinates of all the well bores from their (x,y,z)
+        coordinates.
+        """
+        self.n, self.e, self.tvd = get_nev(
+            self.pos,
+            start_xyz=np.repeat(self.start_xyz, self.lengths, axis=0),
+            start_nev=np.repeat(self.start_nev, self.lengths, axis=0)
+        ).reshape(-1, 3).T
+
+    def _get_vec(self):
+        """
+        Get the (x,y,z) and (n,e,v) unit vectors of all the well bores.
+        """
+        self.vec_xyz = self.geometry.get_vec()
+        self.vec_nev = self.geometry.get_vec(nev=True)
+
+    def _get_errors(self):
+        """
+        Get the covariance matrices of all the well bores with a single
+        evaluation of the error model, propagating the errors of each well
+        bore from its first station.
+        """
+        self.err, self.cov_nev, self.cov_hla = None, None, None
+        if self.error_model is None:
+            return
+
+        self.err = ErrorModel(
+            self,
+            error_model=self.error_model,
+            lean=True,
+            lengths=self.lengths
+        )
+        self.cov_nev = self.err.errors.cov_NEVs.T
+        self.cov_hla = self.err.errors.cov_HLAs.T
+
+    def get_survey(self, index):
+        """
+        Get a welleng.survey.Survey object of a well bore in the batch.
+
+        The inputs and the positions, vectors, minimum curvature data and
+        covariance matrices of the Survey are views into the arrays of the
+        batch, so nothing is copied or recalculated.
+
+        Parameters
+        ----------
+            index: int
+                The index of the well bore in the batch.
+
+        Returns
+        -------
+            survey: welleng.survey.Survey object
+        """
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        radius = self.radius
+        if radius is not None and np.array([radius]).shape[-1] > 1:
+            radius = radius[start:stop]
+
+        survey = Survey(
+            md=self.md[start:stop],
+            inc=self.inc[start:stop],
+            azi=self.azi[start:stop],
+            n=self.n[start:stop],
+            e=self.e[start:stop],
+            tvd=self.tvd[start:stop],
+            x=self.x[start:stop],
+            y=self.y[start:stop],
+            z=self.z[start:stop],
+            vec=self.vec_nev[start:stop],
+            header=self.headers[index],
+            radius=radius,
+            error_model=self.error_model,
+            start_xyz=self.start_xyz[index],
+            start_nev=self.start_nev[index],
+            deg=self.deg,
+            unit=self.unit,
+        )
+        for name in ('dogleg', 'rf', 'delta_md', 'dls', 'pos'):
+            setattr(survey, name, getattr(self, name)[start:stop])
+        if self.cov_nev is not None:
+            survey._cache.update(
+                cov_nev=self.cov_nev[start:stop],
+                cov_hla=self.cov_hla[start:stop]
+            )
+
+        return survey
+
+    def get_surveys(self):
+        """
+        Get a list of the welleng.survey.Survey objects of all the well bores
+        in the batch.
+        """
+        return [self.get_survey(i) for i in range(len(self.lengths))]
+
+
 def make_cov(a, b, c, diag=False):
     """
     Make a covariance matrix from the 1-sigma errors.
@@ -818,37 +1861,12 @@ def make_long_cov(arr):
     return cov
 
 
-class SplitSurvey:
-    def __init__(
-        self,
-        survey,
-    ):
-        self.md1, self.inc1, self.azi1 = survey.survey_rad[:-1].T
-        self.md2, self.inc2, self.azi2 = survey.survey_rad[1:].T
-        self.delta_azi = self.azi2 - self.azi1
-        self.delta_inc = self.inc2 - self.inc1
-
-        self.vec1_xyz = survey.vec_xyz[:-1]
-        self.vec1_nev = get_nev(self.vec1_xyz)
-        self.vec2_xyz = survey.vec_xyz[1:]
-        self.vec2_nev = get_nev(self.vec2_xyz)
-        self.dogleg = survey.dogleg[1:]
-
-        # for i, a in enumerate(self.delta_azi):
-        #     if a < -np.pi:
-        #         self.delta_azi[i] = np.pi + a
-        #     elif a > np.pi:
-        #         self.delta_azi[i] = np.pi - a
-        #     else:
-        #         continue
-
-
 def get_circle_radius(survey, **targets):
     # TODO: add target data to sections
-    ss = SplitSurvey(survey)
+    g = survey.geometry
 
-    y1, x1, z1 = np.cross(ss.vec1_nev, survey.normals).T
-    y2, x2, z2 = np.cross(ss.vec2_nev, survey.normals).T
+    y1, x1, z1 = np.cross(g.vec1_nev, survey.normals).T
+    y2, x2, z2 = np.cross(g.vec2_nev, survey.normals).T
 
     b1 = np.array([y1, x1, z1]).T
     b2 = np.array([y2, x2, z2]).T
@@ -906,7 +1924,6 @@ def get_sections(survey, rtol=1e-1, atol=1e-1, **targets):
     METHOD = "920"  # the COMPASS method for minimum curvature
 
     # TODO: add target data to sections
-    # ss = SplitSurvey(survey)
 
     continuous = np.all(
         np.isclose(
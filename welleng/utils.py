@@ -1,6 +1,136 @@
 import numpy as np
 
 
+class Geometry:
+    def __init__(self, inc, azi, md=None):
+        """
+        The trigonometric functions of the inclinations and azimuths of a
+        well bore survey and the differences between consecutive survey
+        stations, calculated once and shared by the minimum curvature,
+        vector, transform, toolface and error model calculations.
+
+        Params:
+            inc: list or 1d array of floats
+                Well path inclination (relative to z/tvd axis where 0
+                indicates down), in radians.
+            azi: list or 1d array of floats
+                Well path azimuth (relative to y/North axis), in radians.
+            md: list or 1d array of floats (default: None)
+                Measured depth along well path from a datum.
+        """
+        self.inc = np.array(inc, dtype=float).reshape(-1)
+        self.azi = np.array(azi, dtype=float).reshape(-1)
+        self.md = None if md is None else np.array(md, dtype=float)
+
+        self.sin_inc = np.sin(self.inc)
+        self.cos_inc = np.cos(self.inc)
+        self.sin_azi = np.sin(self.azi)
+        self.cos_azi = np.cos(self.azi)
+
+        # the differences between each survey station and the next
+        self.delta_inc = self.inc[1:] - self.inc[:-1]
+        self.delta_azi = self.azi[1:] - self.azi[:-1]
+        self.delta_md = (
+            None if self.md is None else self.md[1:] - self.md[:-1]
+        )
+
+        self._dogleg = None
+        self._rf = None
+        self._vec_nev = None
+
+    @property
+    def dogleg(self):
+        """
+        The (n) doglegs between each survey station and the previous one,
+        in radians, with a zero dogleg at the first station.
+        """
+        if self._dogleg is None:
+            self._dogleg = np.zeros(len(self.inc))
+            self._dogleg[1:] = np.arccos(
+                np.cos(self.delta_inc)
+                - (self.sin_inc[:-1] * self.sin_inc[1:])
+                * (1 - np.cos(self.delta_azi))
+            )
+
+        return self._dogleg
+
+    @property
+    def rf(self):
+        """
+        The (n) minimum curvature ratio factors, being 1 where the dogleg
+        is 0.
+        """
+        if self._rf is None:
+            self._rf = np.ones(len(self.inc))
+            idx = np.where(self.dogleg != 0)
+            self._rf[idx] = (
+                2 / self.dogleg[idx] * np.tan(self.dogleg[idx] / 2)
+            )
+
+        return self._rf
+
+    def get_vec(self, nev=False, r=1):
+        """
+        Returns the (n,3) array of unit vectors, scaled by r, in (x,y,z)
+        coordinates or (n,e,v) coordinates if nev is True.
+        """
+        y = r * self.sin_inc * self.cos_azi
+        x = r * self.sin_inc * self.sin_azi
+        z = r * self.cos_inc
+
+        if nev:
+            vec = np.array([y, x, z]).T
+        else:
+            vec = np.array([x, y, z]).T
+
+        return vec / np.linalg.norm(vec, axis=-1).reshape(-1, 1)
+
+    @property
+    def vec_nev(self):
+        """
+        The (n,3) unit vectors in (n,e,v) coordinates.
+        """
+        if self._vec_nev is None:
+            self._vec_nev = self.get_vec(nev=True)
+
+        return self._vec_nev
+
+    @property
+    def vec1_nev(self):
+        """
+        The (n-1,3) unit vectors in (n,e,v) coordinates at the first station
+        of each pair of consecutive survey stations.
+        """
+        return self.vec_nev[:-1]
+
+    @property
+    def vec2_nev(self):
+        """
+        The (n-1,3) unit vectors in (n,e,v) coordinates at the second
+        station of each pair of consecutive survey stations.
+        """
+        return self.vec_nev[1:]
+
+    def get_transform(self):
+        """
+        Returns the (n,3,3) transforms between the NEV and HLA coordinate
+        systems.
+        """
+        return np.array([
+            [
+                self.cos_inc * self.cos_azi,
+                -self.sin_azi,
+                self.sin_inc * self.cos_azi
+            ],
+            [
+                self.cos_inc * self.sin_azi,
+                self.cos_azi,
+                self.sin_inc * self.sin_azi
+            ],
+            [-self.sin_inc, np.zeros_like(self.inc), self.cos_inc]
+        ]).T
+
+
 class MinCurve:
     def __init__(
         self,
@@ -8,10 +138,13 @@ class MinCurve:
         inc,
         azi,
         start_xyz=[0., 0., 0.],
-        unit="meters"
+        unit="meters",
+        lengths=None,
+        geometry=None
     ):
         """
-        Generate geometric data from a well bore survey.
+        Generate geometric data from a well bore survey, or from the
+        concatenated surveys of several well bores.
 
         Params:
             md: list or 1d array of floats
@@ -22,9 +155,20 @@ class MinCurve:
             azi: list or 1d array of floats
                 Well path azimuth (relative to y/North axis),
                 in radians.
+            start_xyz: (,3) or (m,3) list or array of floats
+                The start position of the well bore, or of each of the m
+                well bores if lengths is provided.
             unit: str
                 Either "meters" or "feet" to determine the unit of the dogleg
                 severity.
+            lengths: (,m) list or array of ints (default: None)
+                The number of survey stations of each well bore if the
+                survey data of m well bores are concatenated, in which case
+                the first station of each well bore is treated as the start
+                of a new well bore.
+            geometry: welleng.utils.Geometry object (default: None)
+                The precalculated Geometry of the survey. If None then it's
+                calculated from the md, inc and azi.
 
         """
         assert unit == "meters" or unit == "feet", (
@@ -40,44 +184,41 @@ class MinCurve:
         self.start_xyz = start_xyz
         self.unit = unit
 
-        # make two slices with a difference or 1 index to enable array
-        # calculations
-        md_1 = md[:-1]
-        md_2 = md[1:]
-
-        inc_1 = inc[:-1]
-        inc_2 = inc[1:]
-
-        azi_1 = azi[:-1]
-        azi_2 = azi[1:]
-
-        # calculate the dogleg
-        temp = np.arccos(
-            np.cos(inc_2 - inc_1)
-            - (np.sin(inc_1) * np.sin(inc_2))
-            * (1 - np.cos(azi_2 - azi_1))
-        )
+        if geometry is None:
+            geometry = Geometry(inc, azi, md)
+        g = geometry
 
-        self.dogleg = np.zeros(survey_length)
-        self.dogleg[1:] = temp
+        # the index of the first station of each well bore
+        if lengths is None:
+            starts = np.array([0])
+        else:
+            starts = np.cumsum(lengths) - lengths
+            assert sum(lengths) == survey_length, (
+                "lengths inconsistent with survey data"
+            )
 
-        # calculate rf and assume rf is 1 where dogleg is 0
-        self.rf = np.ones(survey_length)
-        idx = np.where(self.dogleg != 0)
-        self.rf[idx] = 2 / self.dogleg[idx] * np.tan(self.dogleg[idx] / 2)
+        # the dogleg and rf, where rf is 1 where the dogleg is 0
+        self.dogleg = g.dogleg
+        self.rf = g.rf
+        if lengths is not None:
+            # no dogleg between the well bores
+            self.dogleg = self.dogleg.copy()
+            self.dogleg[starts] = 0
+            self.rf = self.rf.copy()
+            self.rf[starts] = 1
 
         # calculate the change in md between survey stations
-        temp = np.array(md_2) - np.array(md_1)
         self.delta_md = np.zeros(survey_length)
-        self.delta_md[1:] = temp
+        self.delta_md[1:] = g.delta_md
+        self.delta_md[starts] = 0
 
         # calculate change in y direction (north)
         temp = (
             self.delta_md[1:]
             / 2
             * (
-                np.sin(inc_1) * np.cos(azi_1)
-                + np.sin(inc_2) * np.cos(azi_2)
+                g.sin_inc[:-1] * g.cos_azi[:-1]
+                + g.sin_inc[1:] * g.cos_azi[1:]
             )
             * self.rf[1:]
         )
@@ -89,8 +230,8 @@ class MinCurve:
             self.delta_md[1:]
             / 2
             * (
-                np.sin(inc_1) * np.sin(azi_1)
-                + np.sin(inc_2) * np.sin(azi_2)
+                g.sin_inc[:-1] * g.sin_azi[:-1]
+                + g.sin_inc[1:] * g.sin_azi[1:]
             )
             * self.rf[1:]
         )
@@ -101,7 +242,7 @@ class MinCurve:
         temp = (
             self.delta_md[1:]
             / 2
-            * (np.cos(inc_1) + np.cos(inc_2))
+            * (g.cos_inc[:-1] + g.cos_inc[1:])
             * self.rf[1:]
         )
         self.delta_z = np.zeros(survey_length)
@@ -114,17 +255,27 @@ class MinCurve:
         mask = np.where(temp != np.nan)
         self.dls[1:][mask] = temp[mask]
 
+        self.dls[starts] = 0
+
         if unit == "meters":
             self.dls *= 30
         else:
             self.dls *= 100
 
         # cumulate the coordinates and add surface coordinates
-        self.poss = np.vstack(
-            np.cumsum(
-                np.array([self.delta_x, self.delta_y, self.delta_z]).T, axis=0
-            ) + self.start_xyz
+        self.poss = np.cumsum(
+            np.array([self.delta_x, self.delta_y, self.delta_z]).T, axis=0
         )
+        if lengths is not None:
+            # restart the cumulative sum at the start of each well bore
+            self.poss -= np.repeat(self.poss[starts], lengths, axis=0)
+            self.poss += np.repeat(
+                np.broadcast_to(
+                    np.array(start_xyz).reshape(-1, 3), (len(lengths), 3)
+                ), lengths, axis=0
+            )
+        else:
+            self.poss += self.start_xyz
 
 
 def get_vec(inc, azi, nev=False, r=1, deg=True):
@@ -147,16 +298,8 @@ def get_vec(inc, azi, nev=False, r=1, deg=True):
     else:
         inc_rad = inc
         azi_rad = azi
-    y = r * np.sin(inc_rad) * np.cos(azi_rad)
-    x = r * np.sin(inc_rad) * np.sin(azi_rad)
-    z = r * np.cos(inc_rad)
 
-    if nev:
-        vec = np.array([y, x, z]).T
-    else:
-        vec = np.array([x, y, z]).T
-
-    return vec / np.linalg.norm(vec, axis=-1).reshape(-1, 1)
+    return Geometry(inc_rad, azi_rad).get_vec(nev=nev, r=r)
 
 
 def get_nev(pos, start_xyz=[0.,0., 0.], start_nev=[0., 0., 0.]):
@@ -219,6 +362,262 @@ def get_angles(vec, nev=False):
     return np.stack((inc, azi), axis=1)
 
 
+def _get_arc_geometry(vec1, vec2, dogleg, delta_md):
+    """
+    Returns the radius, the in-plane unit normal (pointing towards the
+    center of curvature) and a mask of curved arcs for an array of minimum
+    curvature arcs.
+    """
+    dogleg = np.array(dogleg, dtype=float).reshape(-1)
+    delta_md = np.array(delta_md, dtype=float).reshape(-1)
+    curved = dogleg > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radius = np.where(curved, delta_md / dogleg, 0.)
+        normal = (
+            vec2 - np.cos(dogleg).reshape(-1, 1) * vec1
+        ) / np.sin(dogleg).reshape(-1, 1)
+    normal = np.where(curved.reshape(-1, 1), normal, 0.)
+
+    return (radius, normal, curved)
+
+
+def interpolate_arc(pos1, vec1, vec2, dogleg, delta_md, x):
+    """
+    Interpolate positions and unit vectors along an array of minimum
+    curvature arcs.
+
+    Params:
+        pos1: (n,3) array of floats
+            The position at the start of each arc.
+        vec1: (n,3) array of floats
+            The unit vector at the start of each arc.
+        vec2: (n,3) array of floats
+            The unit vector at the end of each arc.
+        dogleg: (n) array of floats
+            The dogleg of each arc in radians.
+        delta_md: (n) array of floats
+            The length of each arc.
+        x: (n) array of floats
+            The length along each arc from pos1 at which to interpolate.
+
+    Returns:
+        pos: (n,3) array of floats
+            The interpolated positions.
+        vec: (n,3) array of floats
+            The interpolated unit vectors.
+
+    The positions and vectors can be either (x,y,z) or (n,e,v), but need to
+    be consistent.
+    """
+    pos1, vec1, vec2 = (
+        np.array(a, dtype=float).reshape(-1, 3) for a in (pos1, vec1, vec2)
+    )
+    x = np.array(x, dtype=float).reshape(-1)
+    radius, normal, curved = _get_arc_geometry(vec1, vec2, dogleg, delta_md)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        theta = np.where(curved, x / radius, 0.).reshape(-1, 1)
+    radius = radius.reshape(-1, 1)
+    curved = curved.reshape(-1, 1)
+
+    pos = pos1 + np.where(
+        curved,
+        radius * np.sin(theta) * vec1
+        + radius * (1 - np.cos(theta)) * normal,
+        x.reshape(-1, 1) * vec1
+    )
+    vec = np.where(
+        curved,
+        np.cos(theta) * vec1 + np.sin(theta) * normal,
+        vec1
+    )
+
+    return (pos, vec / np.linalg.norm(vec, axis=-1).reshape(-1, 1))
+
+
+def get_closest_arc_points(pos1, vec1, vec2, dogleg, delta_md, points):
+    """
+    Determine the closest point on each of an array of minimum curvature
+    arcs to an array of points. The solution is closed form: on a circular
+    arc the stationary points of the distance satisfy
+    tan(theta) = -d1 / (d2 + radius), where d1 and d2 are the components of
+    the vector from the point to the start of the arc along the start vector
+    and the arc normal respectively.
+
+    Params:
+        pos1, vec1, vec2, dogleg, delta_md:
+            The arc data as described in interpolate_arc.
+        points: (n,3) array of floats
+            The positions from which to find the closest point on each arc.
+
+    Returns:
+        x: (n) array of floats
+            The length along each arc from pos1 to the closest point.
+        pos: (n,3) array of floats
+            The closest positions on each arc.
+        vec: (n,3) array of floats
+            The unit vectors at the closest positions.
+    """
+    pos1, vec1, vec2, points = (
+        np.array(a, dtype=float).reshape(-1, 3)
+        for a in (pos1, vec1, vec2, points)
+    )
+    dogleg = np.array(dogleg, dtype=float).reshape(-1)
+    delta_md = np.array(delta_md, dtype=float).reshape(-1)
+    radius, normal, curved = _get_arc_geometry(vec1, vec2, dogleg, delta_md)
+
+    d = pos1 - points
+    d1 = np.sum(d * vec1, axis=-1)
+    d2 = np.sum(d * normal, axis=-1)
+
+    # straight (tangent) sections are a simple projection
+    x_straight = np.clip(-d1, 0, delta_md)
+
+    # the two stationary points on the circle clipped to the arc plus the
+    # arc end points are the only candidates for the minimum
+    theta_0 = np.arctan2(-d1, d2 + radius) % (2 * np.pi)
+    candidates = np.stack((
+        np.zeros_like(dogleg),
+        dogleg,
+        np.clip(theta_0, 0, dogleg),
+        np.clip((theta_0 + np.pi) % (2 * np.pi), 0, dogleg)
+    ), axis=-1)
+
+    # squared distance relative to the squared distance to pos1, halved
+    r = radius.reshape(-1, 1)
+    f = (
+        r * np.sin(candidates) * d1.reshape(-1, 1)
+        + r * (1 - np.cos(candidates)) * (d2 + radius).reshape(-1, 1)
+    )
+    theta = candidates[np.arange(len(candidates)), np.argmin(f, axis=-1)]
+
+    x = np.where(curved, theta * radius, x_straight)
+    pos, vec = interpolate_arc(pos1, vec1, vec2, dogleg, delta_md, x)
+
+    return (x, pos, vec)
+
+
+def get_arc_plane_intersections(
+    pos1, vec1, vec2, dogleg, delta_md, points, normals
+):
+    """
+    Determine where each of an array of minimum curvature arcs crosses a
+    plane, given by a point on it and its unit normal. The solution is
+    closed form: on a circular arc the signed distance from the plane is
+    d + radius * (a * sin(theta) + b * (1 - cos(theta))), where d, a and b
+    are the components of the vector from the point to the start of the
+    arc, the start vector and the arc normal along the plane normal.
+
+    The arcs are expected to cross their plane once (e.g. arcs whose end
+    points are either side of it); the crossing closest to the arc is
+    returned otherwise.
+
+    Params:
+        pos1, vec1, vec2, dogleg, delta_md:
+            The arc data as described in interpolate_arc.
+        points: (n,3) array of floats
+            A point on each plane.
+        normals: (n,3) array of floats
+            The unit normal of each plane.
+
+    Returns:
+        x: (n) array of floats
+            The length along each arc from pos1 to the crossing.
+        pos: (n,3) array of floats
+            The positions of the crossings.
+        vec: (n,3) array of floats
+            The unit vectors at the crossings.
+    """
+    pos1, vec1, vec2, points, normals = (
+        np.array(a, dtype=float).reshape(-1, 3)
+        for a in (pos1, vec1, vec2, points, normals)
+    )
+    dogleg = np.array(dogleg, dtype=float).reshape(-1)
+    delta_md = np.array(delta_md, dtype=float).reshape(-1)
+    radius, normal, curved = _get_arc_geometry(vec1, vec2, dogleg, delta_md)
+
+    d = np.sum((pos1 - points) * normals, axis=-1)
+    a = np.sum(vec1 * normals, axis=-1)
+    b = np.sum(normal * normals, axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_straight = np.clip(np.nan_to_num(-d / a), 0, delta_md)
+
+        # a * sin(theta) - b * cos(theta) = -(d / radius + b) has the two
+        # solutions phi + arcsin(s) and phi + pi - arcsin(s)
+        rho = np.sqrt(a ** 2 + b ** 2)
+        s = np.arcsin(np.clip(np.nan_to_num(-(d / radius + b) / rho), -1, 1))
+    phi = np.arctan2(b, a)
+    candidates = np.stack((phi + s, phi + np.pi - s), axis=-1)
+
+    # wrap to (-pi, pi] and keep the solution closest to the arc
+    candidates = (candidates + np.pi) % (2 * np.pi) - np.pi
+    outside = (
+        np.maximum(-candidates, 0)
+        + np.maximum(candidates - dogleg.reshape(-1, 1), 0)
+    )
+    theta = np.clip(
+        candidates[np.arange(len(candidates)), np.argmin(outside, axis=-1)],
+        0, dogleg
+    )
+
+    x = np.where(curved, theta * radius, x_straight)
+    pos, vec = interpolate_arc(pos1, vec1, vec2, dogleg, delta_md, x)
+
+    return (x, pos, vec)
+
+
+def get_segment_distances(p1, q1, p2, q2):
+    """
+    Determine the shortest distance between each pair of line segments
+    p1-q1 and p2-q2.
+
+    Params:
+        p1, q1: (n,3) arrays of floats
+            The start and end points of the first segments.
+        p2, q2: (n,3) arrays of floats
+            The start and end points of the second segments.
+
+    Returns:
+        distance: (n) array of floats
+    """
+    p1, q1, p2, q2 = (
+        np.array(a, dtype=float).reshape(-1, 3) for a in (p1, q1, p2, q2)
+    )
+    d1 = q1 - p1
+    d2 = q2 - p2
+    r = p1 - p2
+    a = np.sum(d1 * d1, axis=-1)
+    e = np.sum(d2 * d2, axis=-1)
+    f = np.sum(d2 * r, axis=-1)
+    c = np.sum(d1 * r, axis=-1)
+    b = np.sum(d1 * d2, axis=-1)
+    denom = a * e - b * b
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # the closest points of the infinite lines, clamped to the first
+        # segment (any point if the segments are parallel or degenerate)
+        s = np.where(
+            denom > 1e-12 * a * e, np.clip((b * f - c * e) / denom, 0, 1), 0.
+        )
+        t = np.where(e > 0, (b * s + f) / e, 0.)
+
+        # clamp to the second segment and recompute the first
+        s = np.where(
+            (t < 0) | (e <= 0),
+            np.where(a > 0, np.clip(-c / a, 0, 1), 0.),
+            np.where(
+                t > 1, np.where(a > 0, np.clip((b - c) / a, 0, 1), 0.), s
+            )
+        )
+    t = np.clip(t, 0, 1)
+
+    return np.linalg.norm(
+        (p1 + d1 * s.reshape(-1, 1)) - (p2 + d2 * t.reshape(-1, 1)), axis=-1
+    )
+
+
 def get_transform(
     survey
     ):
@@ -234,18 +633,10 @@ def get_transform(
         transform: (n,3,3) array of floats
     """
     survey = survey.reshape(-1,3)
-    inc = np.array(survey[:,1])
-    azi = np.array(survey[:,2])
-    
-    trans = np.array([
-        [np.cos(inc) * np.cos(azi), -np.sin(azi), np.sin(inc) * np.cos(azi)],
-        [np.cos(inc) * np.sin(azi), np.cos(azi), np.sin(inc) * np.sin(azi)],
-        [-np.sin(inc), np.zeros_like(inc), np.cos(inc)]
-    ]).T
-
-    return trans
-
-def NEV_to_HLA(survey, NEV, cov=True):
+
+    return Geometry(survey[:, 1], survey[:, 2]).get_transform()
+
+def NEV_to_HLA(survey, NEV, cov=True, trans=None, out=None):
     """
     Transform from NEV to HLA coordinate system.
 
@@ -257,45 +648,86 @@ def NEV_to_HLA(survey, NEV, cov=True):
         cov: boolean
             If cov is True then a (3,3,d) array of covariance matrices
             is expecte, else a (d,3) array of coordinates.
+        trans: (n,3,3) array of floats (default: None)
+            The transforms of the survey stations from get_transform (e.g.
+            the cached welleng.survey.Survey.transform). If None then they
+            are calculated from the survey.
+        out: array of floats (default: None)
+            A C-contiguous array with the shape of the result that the
+            result is written to.
 
     Returns:
         Either a transformed (n,3) array of HLA coordinates or an
         (3,3,n) array of HLA covariance matrices. 
     """
-    
-    trans = get_transform(survey)
+    if trans is None:
+        trans = get_transform(survey)
 
     if cov:
-        HLAs = [
-            np.dot(np.dot(t, NEV.T[i]), t.T) for i, t in enumerate(trans)
-        ]
-        
-        HLAs = np.vstack(HLAs).reshape(-1,3,3).T
-        
+        HLAs = np.matmul(
+            np.matmul(trans, np.transpose(NEV, (2, 0, 1))),
+            np.transpose(trans, (0, 2, 1)),
+            out=None if out is None else np.transpose(out, (2, 0, 1))
+        )
+
+        return np.transpose(HLAs, (1, 2, 0))
+
     else:
-        NEV = NEV.reshape(-1,3)
-        HLAs = [
-            np.dot(NEV[i], t.T) for i, t in enumerate(trans)
-        ]
-        
-    return HLAs
+        shape = np.shape(NEV) if np.ndim(NEV) > 1 else (1, 3)
+        HLAs = np.matmul(
+            np.reshape(NEV, (len(trans), -1, 3)),
+            np.transpose(trans, (0, 2, 1)),
+            out=None if out is None else out.reshape(len(trans), -1, 3)
+        )
 
-def HLA_to_NEV(survey, HLA, cov=True):
-    trans = get_transform(survey)
+        return HLAs.reshape(shape) if out is None else out
+
+def HLA_to_NEV(survey, HLA, cov=True, trans=None, out=None):
+    """
+    Transform from HLA to NEV coordinate system.
+
+    Params:
+        survey: (n,3) array of floats
+        The [md, inc, azi] survey listing array.
+        HLA: (n,...,3) or (3,3,n) array of floats
+            The HLA coordinates or covariance matrices.
+        cov: boolean
+            If cov is True then a (3,3,n) array of covariance matrices
+            is expected, else an (n,...,3) array of coordinates.
+        trans: (n,3,3) array of floats (default: None)
+            The transforms of the survey stations from get_transform. If
+            None then they are calculated from the survey.
+        out: array of floats (default: None)
+            A C-contiguous array with the shape of HLA that the result is
+            written to.
+
+    Returns:
+        Either a transformed array of NEV coordinates or an (3,3,n) array
+        of NEV covariance matrices, with the shape of HLA.
+    """
+    if trans is None:
+        trans = get_transform(survey)
 
     if cov:
-        NEVs = [
-            np.dot(np.dot(t.T, HLA.T[i]), t) for i, t in enumerate(trans)
-        ]
-    
-        NEVs = np.vstack(NEVs).reshape(-1,3,3).T
-    
+        NEVs = np.matmul(
+            np.matmul(
+                np.transpose(trans, (0, 2, 1)),
+                np.transpose(HLA, (2, 0, 1))
+            ),
+            trans,
+            out=None if out is None else np.transpose(out, (2, 0, 1))
+        )
+
+        return np.transpose(NEVs, (1, 2, 0))
+
     else:
-        NEVs = [
-            np.dot(hla, t) for hla, t in zip(HLA, trans)
-        ]
-        
-    return np.vstack(NEVs).reshape(HLA.shape)
+        NEVs = np.matmul(
+            np.reshape(HLA, (len(trans), -1, 3)),
+            trans,
+            out=None if out is None else out.reshape(len(trans), -1, 3)
+        )
+
+        return NEVs.reshape(np.shape(HLA)) if out is None else out
 
 
 def get_sigmas(cov, long=False):